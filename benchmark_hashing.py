@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from utils import hashing
+
+# Tailles des fichiers de test (Mo) : petit document, PDF scanné, gros PDF scanné
+FILE_SIZES_MB = (1, 64, 256)
+
+# Meilleur temps sur plusieurs passes (le premier passage remplit le cache disque)
+REPEAT = 3
+
+
+def legacy_hash_file(filepath: str) -> str:
+    """Ancienne implémentation (blocs de 4 Kio lus par une lambda)"""
+    hash_sha256 = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            hash_sha256.update(chunk)
+    return hash_sha256.hexdigest()
+
+
+def readinto_hash_file(filepath: str, algorithm: str = hashing.DEFAULT_ALGORITHM) -> str:
+    """Lecture par readinto dans le tampon réutilisé (sans mmap ni file_digest)"""
+    hasher = hashing.new_hasher(algorithm)
+    with open(filepath, 'rb') as f:
+        hashing.update_from_file(hasher, f)
+    return hasher.hexdigest()
+
+
+def candidates() -> List[Tuple[str, Callable[[str], str]]]:
+    """Implémentations comparées"""
+    entries = [
+        ('sha256 4 Kio (ancien)', legacy_hash_file),
+        ('sha256 readinto 1 Mio', readinto_hash_file),
+        ('sha256 hash_file', hashing.hash_file),
+        ('blake2b hash_file', lambda path: hashing.hash_file(path, 'blake2b')),
+    ]
+    if hashing.XXHASH_AVAILABLE:
+        entries.append(('xxh3_128 hash_file', lambda path: hashing.hash_file(path, 'xxh3_128')))
+    return entries
+
+
+def measure(func: Callable[[str], str], filepath: str) -> Tuple[float, str]:
+    """Meilleur temps (secondes) et hash obtenu"""
+    best, digest = float('inf'), None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        digest = func(filepath)
+        best = min(best, time.perf_counter() - start)
+    return best, digest
+
+
+def main() -> int:
+    failures = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size_mb in FILE_SIZES_MB:
+            filepath = os.path.join(temp_dir, f"{size_mb}.bin")
+            with open(filepath, 'wb') as f:
+                for _ in range(size_mb):
+                    f.write(os.urandom(1024 * 1024))
+
+            print(f"\n📄 Fichier de {size_mb} Mo")
+            reference, baseline = None, None
+            for name, func in candidates():
+                elapsed, digest = measure(func, filepath)
+                throughput = size_mb / elapsed
+                baseline = baseline or throughput
+                print(f"   {name:<24} {throughput:8.0f} Mo/s  x{throughput / baseline:.2f}")
+
+                # Les variantes SHA-256 doivent produire le même hash que l'ancienne implémentation
+                if name.startswith('sha256'):
+                    reference = reference or digest
+                    if digest != reference:
+                        failures.append(f"{name} ({size_mb} Mo): hash différent")
+
+    if failures:
+        print(f"\n❌ {len(failures)} résultat(s) incorrect(s):")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+
+    print("\n✅ Hash SHA-256 identiques à l'ancienne implémentation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from utils.rasterize import pixmap_to_image
+
+try:
+    import resource
+except ImportError:
+    # Windows : pic mesuré sur les allocations Python seulement
+    resource = None
+
+# Zooms mesurés (1.0 = 72 dpi, 3.0 = zoom maximal du viewer)
+ZOOMS = (1.0, 2.0, 3.0)
+
+# Pages du document de test
+PAGE_COUNT = 5
+
+
+def build_document(path: str):
+    """Créer un PDF de test : pages A4 avec texte et image pleine page (document scanné)"""
+    doc = fitz.open()
+    scan = io.BytesIO()
+    Image.effect_noise((1240, 1754), 60).convert("RGB").save(scan, format="JPEG", quality=85)
+    for page_num in range(PAGE_COUNT):
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=scan.getvalue())
+        page.insert_text((72, 72), f"Page {page_num + 1}", fontsize=36)
+    doc.save(path)
+    doc.close()
+
+
+def via_ppm(pix) -> Image.Image:
+    """Ancien chemin du viewer : encodage PPM puis décodage"""
+    return Image.open(io.BytesIO(pix.tobytes("ppm")))
+
+
+def via_png(pix) -> Image.Image:
+    """Ancien chemin de la prévisualisation : encodage PNG puis décodage"""
+    return Image.open(io.BytesIO(pix.tobytes()))
+
+
+# Conversions comparées
+CANDIDATES: Dict[str, Callable] = {
+    'PPM (ancien viewer)': via_ppm,
+    'PNG (ancienne prévisualisation)': via_png,
+    'frombuffer': pixmap_to_image,
+}
+
+
+def peak_rss() -> Optional[int]:
+    """Pic de mémoire résidente du processus en octets (None si non mesurable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(path: str, name: str, zoom: float) -> Tuple[float, int, bytes]:
+    """
+    Rendre toutes les pages et convertir chaque pixmap en image PIL (dans un processus neuf)
+
+    Returns:
+        Tuple (temps moyen de conversion par page en ms, hausse du pic mémoire en octets,
+        pixels de la dernière page)
+    """
+    convert = CANDIDATES[name]
+    matrix = fitz.Matrix(zoom, zoom)
+    elapsed = 0.0
+    image = None
+
+    with fitz.open(path) as doc:
+        baseline = peak_rss()
+        tracemalloc.start()
+        for page in doc:
+            image = None
+            pix = page.get_pixmap(matrix=matrix)
+            start = time.perf_counter()
+            image = convert(pix)
+            image.load()
+            elapsed += time.perf_counter() - start
+            del pix
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        peak = peak_rss()
+        growth = peak - baseline if peak is not None else traced_peak
+        return elapsed * 1000 / len(doc), growth, image.tobytes()
+
+
+def main() -> int:
+    failures = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "scan.pdf")
+        build_document(path)
+
+        for zoom in ZOOMS:
+            print(f"\n🔍 Zoom {int(zoom * 100)}%")
+            reference = None
+            for name in CANDIDATES:
+                # Un processus par mesure : le pic mémoire d'un essai ne masque pas le suivant
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    per_page, growth, pixels = executor.submit(measure, path, name, zoom).result()
+                print(f"   {name:<32} {per_page:7.1f} ms/page   pic +{growth / 1024 / 1024:6.1f} Mo")
+
+                # Chaque conversion doit produire exactement les mêmes pixels
+                reference = reference or pixels
+                if pixels != reference:
+                    failures.append(f"{name} (zoom {int(zoom * 100)}%): pixels différents")
+
+    memory = "mémoire résidente" if resource is not None else "allocations Python (tracemalloc)"
+    print(f"\nTemps de conversion seul (hors rendu PyMuPDF), pic = hausse de la {memory} pendant le rendu")
+    if failures:
+        print(f"\n❌ {len(failures)} résultat(s) incorrect(s):")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+
+    print("\n✅ Images identiques pour toutes les conversions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 import sqlite3
 import os
-import hashlib
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Set, Callable, Iterator, NamedTuple
 import bcrypt
+from migrations import MigrationRunner
+from utils.blob_store import BlobStore
+from utils.hashing import hash_file
 try:
     from cryptography.fernet import Fernet
     CRYPTO_AVAILABLE = True
@@ -11,6 +16,170 @@ except ImportError:
     print("⚠️ cryptography non installé - chiffrement désactivé")
     CRYPTO_AVAILABLE = False
 
+
+class Record(sqlite3.Row):
+    """Ligne légère (accès par nom comme un dictionnaire, sans copie des valeurs)"""
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Valeur d'une colonne, ou default si la colonne n'existe pas ou vaut NULL"""
+        try:
+            value = self[key]
+        except IndexError:
+            return default
+        return default if value is None else value
+
+
+class Page(NamedTuple):
+    """Page de résultats d'une pagination par clé"""
+    rows: List[Record]
+    # Clé de la dernière ligne à repasser en after_key, None s'il n'y a plus de résultats
+    next_key: Optional[tuple]
+
+
+class SchemaInfo:
+    """Capacités du schéma (tables, colonnes, index, FTS5), lues une fois puis gardées en cache"""
+    
+    def __init__(self, columns: Optional[Dict[str, Set[str]]] = None,
+                 indexes: Optional[Set[str]] = None,
+                 virtual_tables: Optional[Set[str]] = None):
+        self.columns = columns or {}
+        self.indexes = indexes or set()
+        self.virtual_tables = virtual_tables or set()
+    
+    @classmethod
+    def load(cls, cursor: sqlite3.Cursor) -> 'SchemaInfo':
+        """Lire le schéma courant de la base"""
+        cursor.execute("SELECT type, name, sql FROM sqlite_master WHERE type IN ('table', 'index')")
+        entries = cursor.fetchall()
+        
+        columns, indexes, virtual_tables = {}, set(), set()
+        for kind, name, sql in entries:
+            if kind == 'index':
+                indexes.add(name)
+                continue
+            if sql and sql.upper().startswith('CREATE VIRTUAL TABLE'):
+                virtual_tables.add(name)
+            cursor.execute(f'PRAGMA table_info("{name}")')
+            columns[name] = {column[1] for column in cursor.fetchall()}
+        return cls(columns, indexes, virtual_tables)
+    
+    def has_table(self, table: str) -> bool:
+        return table in self.columns
+    
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self.columns.get(table, ())
+    
+    def has_index(self, index: str) -> bool:
+        return index in self.indexes
+    
+    @property
+    def fts(self) -> bool:
+        """Index plein texte des noms disponible (FTS5)"""
+        return 'files_fts' in self.virtual_tables
+    
+    @property
+    def fts_trigram(self) -> bool:
+        """Index trigramme (recherche de sous-chaînes) disponible"""
+        return 'files_fts_trigram' in self.virtual_tables
+    
+    @property
+    def content_index(self) -> bool:
+        """Index du contenu des documents disponible"""
+        return 'content_fts' in self.virtual_tables and 'document_content' in self.columns
+
+
+class ConnectionPool:
+    """Pool de connexions SQLite : une connexion de lecture par thread, un seul écrivain à la fois"""
+    
+    def __init__(self, db_path: str, busy_timeout: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.write_lock = threading.RLock()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+    
+    def _open(self) -> sqlite3.Connection:
+        """Ouvrir une connexion configurée (WAL, busy_timeout)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout / 1000,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if self.db_path != ':memory:':
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """Récupérer la connexion du thread courant (ouverte à la demande)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._lock:
+                # Une base en mémoire n'existe que dans sa connexion : la partager
+                if self.db_path == ':memory:' and self._connections:
+                    conn = self._connections[0]
+                else:
+                    conn = self._open()
+                    self._connections.append(conn)
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+        return conn
+    
+    def cursor(self) -> sqlite3.Cursor:
+        """Récupérer le curseur du thread courant"""
+        self.connection()
+        return self._local.cursor
+    
+    @contextmanager
+    def transaction(self):
+        """Transaction d'écriture sérialisée entre threads (imbrication autorisée)"""
+        with self.write_lock:
+            conn = self.connection()
+            depth = getattr(self._local, 'tx_depth', 0)
+            if depth == 0 and not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            self._local.tx_depth = depth + 1
+            try:
+                yield self._local.cursor
+            except BaseException:
+                self._local.tx_depth = depth
+                if depth == 0:
+                    conn.rollback()
+                raise
+            else:
+                self._local.tx_depth = depth
+                if depth == 0:
+                    conn.commit()
+    
+    def release(self):
+        """Fermer la connexion du thread courant (fin d'un thread de travail)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        self._local.cursor = None
+        with self._lock:
+            if self.db_path == ':memory:':
+                return
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+    
+    def close_all(self):
+        """Fermer toutes les connexions du pool"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+
 class Database:
     """Gestion de la base de données SQLite avec sécurité renforcée et système de panels"""
     
@@ -24,8 +193,9 @@ class Database:
     
     def __init__(self, db_path: str = "portal.db"):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pool = None
+        # Schéma en cache : relu uniquement après une migration ou une création de tables
+        self.schema = SchemaInfo()
         
         if CRYPTO_AVAILABLE:
             self.encryption_key = self._get_or_create_encryption_key()
@@ -36,7 +206,6 @@ class Database:
             
         self.connect()
         self.migrate_database()
-        self.create_tables()
         self.create_default_admin()
     
     def _get_or_create_encryption_key(self) -> bytes:
@@ -73,134 +242,396 @@ class Database:
     def connect(self):
         """Établir la connexion à la base de données"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-            self.cursor = self.conn.cursor()
+            self.pool = ConnectionPool(self.db_path)
+            self.pool.connection()
             print(f"✅ Connexion à la base de données réussie: {self.db_path}")
         except sqlite3.Error as e:
             print(f"❌ Erreur de connexion à la base de données: {e}")
             raise
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connexion propre au thread appelant"""
+        return self.pool.connection()
+    
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Curseur propre au thread appelant"""
+        return self.pool.cursor()
+    
+    def transaction(self):
+        """Ouvrir une transaction d'écriture sérialisée (context manager renvoyant le curseur)"""
+        return self.pool.transaction()
+    
+    def release_connection(self):
+        """Libérer la connexion du thread courant"""
+        self.pool.release()
+    
+    def refresh_schema(self) -> SchemaInfo:
+        """Relire le schéma (à appeler après toute modification de structure)"""
+        self.schema = SchemaInfo.load(self.cursor)
+        return self.schema
+    
+    @property
+    def fts_available(self) -> bool:
+        return self.schema.fts
+    
+    @property
+    def fts_trigram_available(self) -> bool:
+        return self.schema.fts_trigram
+    
     def migrate_database(self):
-        """Migration automatique de la base de données avec support panels"""
-        try:
-            # Vérifier si la table folders existe
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='folders'")
-            folders_exist = self.cursor.fetchone()
+        """Appliquer les migrations de schéma en attente (aucune vérification si la base est à jour)"""
+        MigrationRunner(self).run()
+        self.refresh_schema()
+    
+    def _migrate_legacy_columns(self):
+        """Ajouter les colonnes absentes des bases créées par les anciennes versions"""
+        schema = self.schema
+        
+        if schema.has_table('folders') and not schema.has_column('folders', 'panel'):
+            print("🔄 Ajout de la colonne panel aux dossiers...")
+            self.cursor.execute("ALTER TABLE folders ADD COLUMN panel TEXT DEFAULT 'interface_emp'")
+        
+        if schema.has_table('files'):
+            # Tailles et hash calculés ensuite en arrière-plan (IntegrityChecker)
+            if not schema.has_column('files', 'file_size'):
+                print("🔄 Ajout de la colonne file_size...")
+                self.cursor.execute("ALTER TABLE files ADD COLUMN file_size INTEGER DEFAULT 0")
             
-            if folders_exist:
-                # Vérifier si la colonne panel existe
-                self.cursor.execute("PRAGMA table_info(folders)")
-                columns = [column[1] for column in self.cursor.fetchall()]
-                
-                if 'panel' not in columns:
-                    print("🔄 Ajout de la colonne panel aux dossiers...")
-                    self.cursor.execute("ALTER TABLE folders ADD COLUMN panel TEXT DEFAULT 'interface_emp'")
-                    self.conn.commit()
-            
-            # Vérifier la table files
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='files'")
-            if self.cursor.fetchone():
-                self.cursor.execute("PRAGMA table_info(files)")
-                columns = [column[1] for column in self.cursor.fetchall()]
-                
-                # Ajouter file_size si elle n'existe pas
-                if 'file_size' not in columns:
-                    print("🔄 Ajout de la colonne file_size...")
-                    self.cursor.execute("ALTER TABLE files ADD COLUMN file_size INTEGER DEFAULT 0")
-                    
-                    self.cursor.execute("SELECT id, filepath FROM files")
-                    files = self.cursor.fetchall()
-                    
-                    for file_id, filepath in files:
-                        try:
-                            if os.path.exists(filepath):
-                                size = os.path.getsize(filepath)
-                                self.cursor.execute("UPDATE files SET file_size = ? WHERE id = ?", (size, file_id))
-                        except Exception as e:
-                            print(f"⚠️ Erreur calcul taille pour {filepath}: {e}")
-                
-                # Ajouter file_hash si elle n'existe pas
-                if 'file_hash' not in columns:
-                    print("🔄 Ajout de la colonne file_hash...")
-                    self.cursor.execute("ALTER TABLE files ADD COLUMN file_hash TEXT DEFAULT ''")
-            
-            # Vérifier la table admins pour bcrypt
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='admins'")
-            if self.cursor.fetchone():
-                self.cursor.execute("PRAGMA table_info(admins)")
-                admin_columns = [column[1] for column in self.cursor.fetchall()]
-                
-                if 'password' in admin_columns and 'password_hash' not in admin_columns:
-                    print("🔄 Migration des mots de passe vers bcrypt...")
-                    self.cursor.execute("ALTER TABLE admins ADD COLUMN password_hash TEXT")
-                    
-                    self.cursor.execute("SELECT id, password FROM admins WHERE password_hash IS NULL OR password_hash = ''")
-                    admins = self.cursor.fetchall()
-                    
-                    for admin_id, old_password in admins:
-                        if old_password:
-                            password_hash = bcrypt.hashpw(old_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                            self.cursor.execute("UPDATE admins SET password_hash = ? WHERE id = ?", (password_hash, admin_id))
+            if not schema.has_column('files', 'file_hash'):
+                print("🔄 Ajout de la colonne file_hash...")
+                self.cursor.execute("ALTER TABLE files ADD COLUMN file_hash TEXT DEFAULT ''")
             
-            self.conn.commit()
-            print("✅ Migration automatique terminée")
+            # Ajouter source_mtime si elle n'existe pas (resynchronisation incrémentale)
+            if not schema.has_column('files', 'source_mtime'):
+                print("🔄 Ajout de la colonne source_mtime...")
+                self.cursor.execute("ALTER TABLE files ADD COLUMN source_mtime REAL DEFAULT 0")
+        
+        # Vérifier la table admins pour bcrypt
+        if schema.has_column('admins', 'password') and not schema.has_column('admins', 'password_hash'):
+            print("🔄 Migration des mots de passe vers bcrypt...")
+            self.cursor.execute("ALTER TABLE admins ADD COLUMN password_hash TEXT")
             
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la migration: {e}")
-            self.conn.rollback()
+            self.cursor.execute("SELECT id, password FROM admins WHERE password_hash IS NULL OR password_hash = ''")
+            admins = self.cursor.fetchall()
+            
+            for admin_id, old_password in admins:
+                if old_password:
+                    password_hash = bcrypt.hashpw(old_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                    self.cursor.execute("UPDATE admins SET password_hash = ? WHERE id = ?", (password_hash, admin_id))
     
     def create_tables(self):
         """Créer les tables nécessaires avec support des panels"""
+        # Table admins avec hash bcrypt
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS admins (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT NOT NULL UNIQUE,
+                password TEXT,
+                password_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Table folders avec panel
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS folders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                parent_id INTEGER DEFAULT NULL,
+                panel TEXT DEFAULT 'interface_emp',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Table files avec métadonnées
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                folder_id INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                filepath TEXT NOT NULL,
+                file_size INTEGER DEFAULT 0,
+                file_hash TEXT DEFAULT '',
+                source_mtime REAL DEFAULT 0,
+                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Table de fermeture de la hiérarchie des dossiers
+        self._create_folder_closure_table()
+        
+        # Table des blobs (contenus uniques référencés par les fichiers)
+        self._create_blobs_table()
+    
+    def _create_indexes(self):
+        """Créer les index de recherche et les index composites"""
+        # Index pour optimiser la recherche
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_filename ON files(filename)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_uploaded_at ON files(uploaded_at)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files(file_size)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_hash ON files(file_hash)")
+        
+        # Index composites dans l'ordre des listes affichées (aucun tri temporaire) :
+        # fichiers d'un dossier par date (couvrant pour les comptes et tailles),
+        # sous-dossiers et dossiers d'un panel par nom
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_files_folder_uploaded ON files(folder_id, uploaded_at, id, file_size)"
+        )
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent_name ON folders(parent_id, name)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_panel_name ON folders(panel, name)")
+        
+        # Index remplacés par les index composites (préfixes redondants)
+        for index in ('idx_files_folder', 'idx_folders_parent', 'idx_folders_panel'):
+            self.cursor.execute(f"DROP INDEX IF EXISTS {index}")
+    
+    def _create_folder_closure_table(self):
+        """Créer la table de fermeture (ancêtre, descendant, profondeur) des dossiers"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS folder_closure (
+                ancestor_id INTEGER NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, descendant_id)
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_folder_closure_descendant ON folder_closure(descendant_id, depth)"
+        )
+    
+    def _backfill_folder_closure(self):
+        """Reconstruire la table de fermeture à partir de parent_id (requête récursive)"""
+        self.cursor.execute("DELETE FROM folder_closure")
+        self.cursor.execute("""
+            INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+            WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM folders
+                UNION ALL
+                SELECT tree.ancestor_id, f.id, tree.depth + 1
+                FROM tree
+                JOIN folders f ON f.parent_id = tree.descendant_id
+            )
+            SELECT ancestor_id, descendant_id, depth FROM tree
+        """)
+    
+    def _create_blobs_table(self):
+        """Créer la table des blobs (un contenu physique par hash et extension, compteur de références)"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                file_hash TEXT NOT NULL,
+                blob_path TEXT NOT NULL,
+                file_size INTEGER DEFAULT 0,
+                refcount INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (file_hash, blob_path)
+            )
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_blobs_size ON blobs(file_size)")
+    
+    def _backfill_blobs(self) -> List[str]:
+        """
+        Enregistrer les fichiers existants comme blobs et fusionner les doublons
+        
+        Returns:
+            Chemins des copies redondantes à supprimer après validation
+        """
+        # Premier fichier présent sur disque = copie conservée pour chaque (hash, extension)
+        self.cursor.execute(
+            "SELECT id, filepath, file_size, file_hash FROM files WHERE file_hash != '' ORDER BY id"
+        )
+        rows = self.cursor.fetchall()
+        kept = {}
+        for row in rows:
+            key = (row['file_hash'], BlobStore.extension(row['filepath']))
+            if key not in kept and os.path.exists(row['filepath']):
+                kept[key] = (row['filepath'], row['file_size'])
+        
+        redundant_paths = set()
+        refcounts = {}
+        for row in rows:
+            key = (row['file_hash'], BlobStore.extension(row['filepath']))
+            if key not in kept:
+                continue
+            blob_path = kept[key][0]
+            if row['filepath'] != blob_path:
+                self.cursor.execute("UPDATE files SET filepath = ? WHERE id = ?", (blob_path, row['id']))
+                redundant_paths.add(row['filepath'])
+            refcounts[key] = refcounts.get(key, 0) + 1
+        
+        self.cursor.executemany(
+            "INSERT INTO blobs (file_hash, blob_path, file_size, refcount) VALUES (?, ?, ?, ?)",
+            [(key[0], path, size, refcounts[key]) for key, (path, size) in kept.items()]
+        )
+        
+        if redundant_paths:
+            print(f"♻️ {len(redundant_paths)} copie(s) en double fusionnée(s)")
+        return sorted(redundant_paths - {path for path, _ in kept.values()})
+    
+    # Chemin complet ("A/B/C") et panel d'un dossier, pour l'index de recherche
+    FTS_PATH_SQL = (
+        "(SELECT group_concat(name, '/') FROM ("
+        "SELECT fo.name FROM folder_closure fc JOIN folders fo ON fo.id = fc.ancestor_id "
+        "WHERE fc.descendant_id = {folder} ORDER BY fc.depth DESC))"
+    )
+    FTS_PANEL_SQL = "(SELECT panel FROM folders WHERE id = {folder})"
+    
+    def _fts_tables(self) -> List[str]:
+        """Tables FTS5 actives (mots/préfixes, puis trigrammes si disponibles)"""
+        tables = ['files_fts']
+        if self.fts_trigram_available:
+            tables.append('files_fts_trigram')
+        return tables
+    
+    def _create_search_index(self):
+        """Créer les tables FTS5 (nom, chemin du dossier, panel) et leurs triggers de synchronisation"""
+        existing = self.schema.virtual_tables
+        
         try:
-            # Table admins avec hash bcrypt
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS admins (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT NOT NULL UNIQUE,
-                    password TEXT,
-                    password_hash TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table folders avec panel
             self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS folders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    parent_id INTEGER DEFAULT NULL,
-                    panel TEXT DEFAULT 'interface_emp',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
+                CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+                    filename, folder_path, panel UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
                 )
             """)
-            
-            # Table files avec métadonnées
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ FTS5 indisponible, recherche par LIKE: {e}")
+            return
+        
+        try:
             self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS files (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    folder_id INTEGER NOT NULL,
-                    filename TEXT NOT NULL,
-                    filepath TEXT NOT NULL,
-                    file_size INTEGER DEFAULT 0,
-                    file_hash TEXT DEFAULT '',
-                    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE CASCADE
+                CREATE VIRTUAL TABLE IF NOT EXISTS files_fts_trigram USING fts5(
+                    filename, folder_path, panel UNINDEXED,
+                    tokenize = 'trigram'
                 )
             """)
-            
-            # Index pour optimiser la recherche
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_filename ON files(filename)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_uploaded_at ON files(uploaded_at)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files(file_size)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_panel ON folders(panel)")
-            
-            self.conn.commit()
-            print("✅ Tables créées avec succès")
+        except sqlite3.OperationalError:
+            # Tokenizer trigram absent (SQLite < 3.34)
+            pass
+        
+        # Tables créées : le cache du schéma indique maintenant les index disponibles
+        self.refresh_schema()
+        
+        new_path = self.FTS_PATH_SQL.format(folder="NEW.folder_id")
+        new_panel = self.FTS_PANEL_SQL.format(folder="NEW.folder_id")
+        subtree_path = self.FTS_PATH_SQL.format(folder="f.folder_id")
+        subtree_panel = self.FTS_PANEL_SQL.format(folder="f.folder_id")
+        subtree_files = (
+            "SELECT f.id FROM files f JOIN folder_closure c ON f.folder_id = c.descendant_id "
+            "WHERE c.ancestor_id = NEW.id"
+        )
+        
+        insert_body, delete_body, folder_body, panel_body = [], [], [], []
+        for table in self._fts_tables():
+            insert_body.append(
+                f"INSERT INTO {table} (rowid, filename, folder_path, panel) "
+                f"VALUES (NEW.id, NEW.filename, {new_path}, {new_panel});"
+            )
+            delete_body.append(f"DELETE FROM {table} WHERE rowid = OLD.id;")
+            folder_body.append(f"DELETE FROM {table} WHERE rowid IN ({subtree_files});")
+            folder_body.append(
+                f"INSERT INTO {table} (rowid, filename, folder_path, panel) "
+                f"SELECT f.id, f.filename, {subtree_path}, {subtree_panel} FROM files f "
+                f"WHERE f.id IN ({subtree_files});"
+            )
+            panel_body.append(
+                f"UPDATE {table} SET panel = NEW.panel WHERE rowid IN (SELECT id FROM files WHERE folder_id = NEW.id);"
+            )
+        
+        triggers = {
+            'files_fts_ai': ("AFTER INSERT ON files", insert_body),
+            'files_fts_ad': ("AFTER DELETE ON files", delete_body),
+            'files_fts_au': ("AFTER UPDATE OF filename, folder_id ON files", delete_body + insert_body),
+            # Renommage ou déplacement : chemins de tout le sous-arbre à recalculer
+            'folders_fts_au': ("AFTER UPDATE OF name, parent_id ON folders "
+                               "WHEN OLD.name IS NOT NEW.name OR OLD.parent_id IS NOT NEW.parent_id", folder_body),
+            'folders_fts_panel_au': ("AFTER UPDATE OF panel ON folders WHEN OLD.panel IS NOT NEW.panel", panel_body),
+        }
+        
+        rebuild = 'files_fts' not in existing or (
+            self.fts_trigram_available and 'files_fts_trigram' not in existing
+        )
+        if rebuild:
+            # Nouvelle table d'index (ou tokenizer ajouté) : triggers à recréer
+            for name in triggers:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        
+        for name, (event, body) in triggers.items():
+            self.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {' '.join(body)} END")
+        
+        if rebuild:
+            print("🔄 Construction de l'index de recherche (FTS5)...")
+            self._backfill_search_index()
+    
+    def _backfill_search_index(self):
+        """Remplir l'index de recherche à partir de la table files"""
+        path = self.FTS_PATH_SQL.format(folder="f.folder_id")
+        panel = self.FTS_PANEL_SQL.format(folder="f.folder_id")
+        for table in self._fts_tables():
+            self.cursor.execute(f"DELETE FROM {table}")
+            self.cursor.execute(
+                f"INSERT INTO {table} (rowid, filename, folder_path, panel) "
+                f"SELECT f.id, f.filename, {path}, {panel} FROM files f"
+            )
+    
+    def _create_content_index(self):
+        """Créer l'index du contenu des documents (un texte par file_hash)"""
+        if not self.fts_available:
+            return
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_content (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_hash TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
+                content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+    
+    def _create_integrity_table(self):
+        """Créer la table de progression de la vérification d'intégrité (dernier id traité)"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS integrity_progress (
+                job TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL
+            )
+        """)
+    
+    def _add_content_attempts(self):
+        """Compter les tentatives d'extraction (nouvel essai des documents en erreur)"""
+        schema = self.schema
+        if schema.has_table('document_content') and not schema.has_column('document_content', 'attempts'):
+            self.cursor.execute("ALTER TABLE document_content ADD COLUMN attempts INTEGER NOT NULL DEFAULT 1")
+    
+    def rebuild_search_index(self) -> bool:
+        """Reconstruire entièrement l'index de recherche"""
+        if not self.fts_available:
+            return False
+        try:
+            with self.transaction():
+                self._backfill_search_index()
+            return True
         except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la création des tables: {e}")
-            raise
+            print(f"❌ Erreur lors de la reconstruction de l'index de recherche: {e}")
+            return False
+    
+    def rebuild_folder_closure(self) -> bool:
+        """Reconstruire entièrement la hiérarchie des dossiers"""
+        try:
+            with self.transaction():
+                self._backfill_folder_closure()
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la reconstruction de la hiérarchie: {e}")
+            return False
     
     def create_default_admin(self):
         """Créer un compte admin par défaut avec bcrypt"""
@@ -246,16 +677,66 @@ class Database:
                 if parent:
                     panel = parent['panel']
             
-            self.cursor.execute(
-                "INSERT INTO folders (name, parent_id, panel) VALUES (?, ?, ?)",
-                (name, parent_id, panel)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self.transaction() as cursor:
+                return self._insert_folder(cursor, name, parent_id, panel)
         except sqlite3.Error as e:
             print(f"❌ Erreur lors de la création du dossier: {e}")
             raise
     
+    def _insert_folder(self, cursor: sqlite3.Cursor, name: str, parent_id: Optional[int], panel: str) -> int:
+        """Insérer un dossier et ses chemins de hiérarchie (dans une transaction ouverte)"""
+        cursor.execute(
+            "INSERT INTO folders (name, parent_id, panel) VALUES (?, ?, ?)",
+            (name, parent_id, panel)
+        )
+        folder_id = cursor.lastrowid
+        
+        # Chemins vers tous les ancêtres du parent + le dossier lui-même
+        cursor.execute("""
+            INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, ?, depth + 1 FROM folder_closure WHERE descendant_id = ?
+            UNION ALL
+            SELECT ?, ?, 0
+        """, (folder_id, parent_id, folder_id, folder_id))
+        return folder_id
+    
+    def create_folders_bulk(self, paths: List[str], parent_id: Optional[int] = None,
+                            panel: str = 'interface_emp',
+                            existing: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Créer une arborescence complète de dossiers en une seule transaction
+        
+        Args:
+            paths: Chemins relatifs des dossiers (ex: 'A', 'A/B'), chaque parent devant figurer dans la liste
+            parent_id: ID du dossier parent des chemins de premier niveau
+            panel: Panel cible (hérité du parent si parent_id est fourni)
+            existing: Dossiers déjà présents (chemin relatif -> ID) pouvant servir de parents
+            
+        Returns:
+            Dictionnaire chemin relatif -> ID du dossier (dossiers existants inclus)
+        """
+        if parent_id is not None:
+            parent = self.get_folder(parent_id)
+            if parent:
+                panel = parent['panel']
+        
+        folder_ids = dict(existing or {})
+        # Les parents doivent être créés avant leurs enfants
+        ordered_paths = sorted(paths, key=lambda p: len(os.path.normpath(p).split(os.sep)))
+        
+        try:
+            with self.transaction() as cursor:
+                for path in ordered_paths:
+                    parent_path = os.path.dirname(path)
+                    current_parent_id = folder_ids.get(parent_path, parent_id) if parent_path else parent_id
+                    folder_ids[path] = self._insert_folder(
+                        cursor, os.path.basename(path), current_parent_id, panel
+                    )
+            return folder_ids
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la création groupée des dossiers: {e}")
+            raise
+    
     def get_folder(self, folder_id: int) -> Optional[Dict[str, Any]]:
         """Récupérer un dossier par son ID"""
         try:
@@ -278,6 +759,32 @@ class Database:
             print(f"❌ Erreur lors de la récupération des dossiers: {e}")
             return []
     
+    def get_all_folders_page(self, panel: Optional[str] = None, limit: int = 500,
+                             after_key: Optional[tuple] = None) -> Page:
+        """Dossiers d'un panel triés par (nom, id), une page à la fois (pagination par clé)"""
+        try:
+            conditions = []
+            params = []
+            if panel:
+                conditions.append("panel = ?")
+                params.append(panel)
+            if after_key is not None:
+                conditions.append("(name, id) > (?, ?)")
+                params.extend(after_key)
+            
+            query = "SELECT * FROM folders"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY name ASC, id ASC"
+            return self._fetch_page(query, params, limit, ('name', 'id'))
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des dossiers: {e}")
+            return Page([], None)
+    
+    def iter_all_folders(self, panel: Optional[str] = None, batch_size: int = 500) -> Iterator[Record]:
+        """Parcourir tous les dossiers d'un panel page par page"""
+        return self._iter_pages(lambda key: self.get_all_folders_page(panel, batch_size, key))
+    
     def get_subfolders(self, parent_id: Optional[int] = None, panel: Optional[str] = None) -> List[Dict[str, Any]]:
         """Récupérer les sous-dossiers d'un dossier parent dans un panel"""
         try:
@@ -304,81 +811,372 @@ class Database:
     def update_folder(self, folder_id: int, name: str) -> bool:
         """Renommer un dossier"""
         try:
-            self.cursor.execute(
-                "UPDATE folders SET name = ? WHERE id = ?",
-                (name, folder_id)
-            )
-            self.conn.commit()
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "UPDATE folders SET name = ? WHERE id = ?",
+                    (name, folder_id)
+                )
             return True
         except sqlite3.Error as e:
             print(f"❌ Erreur lors de la mise à jour du dossier: {e}")
             return False
     
-    def delete_folder(self, folder_id: int) -> bool:
-        """Supprimer un dossier et ses fichiers"""
+    def move_folder(self, folder_id: int, new_parent_id: Optional[int]) -> bool:
+        """Déplacer un dossier (et son sous-arbre) sous un nouveau parent"""
         try:
-            self.cursor.execute("SELECT filepath FROM files WHERE folder_id = ?", (folder_id,))
-            files = self.cursor.fetchall()
+            if new_parent_id is not None:
+                # Interdire le déplacement dans son propre sous-arbre
+                self.cursor.execute(
+                    "SELECT 1 FROM folder_closure WHERE ancestor_id = ? AND descendant_id = ?",
+                    (folder_id, new_parent_id)
+                )
+                if self.cursor.fetchone():
+                    print("⚠️ Impossible de déplacer un dossier dans son propre sous-arbre")
+                    return False
             
-            for file in files:
-                try:
-                    if os.path.exists(file['filepath']):
-                        os.remove(file['filepath'])
-                except Exception as e:
-                    print(f"⚠️ Impossible de supprimer le fichier {file['filepath']}: {e}")
+            parent = self.get_folder(new_parent_id) if new_parent_id is not None else None
             
-            self.cursor.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-            self.conn.commit()
+            with self.transaction() as cursor:
+                # Détacher le sous-arbre de ses anciens ancêtres
+                cursor.execute("""
+                    DELETE FROM folder_closure
+                    WHERE descendant_id IN (SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?)
+                      AND ancestor_id NOT IN (SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?)
+                """, (folder_id, folder_id))
+                
+                # Rattacher le sous-arbre aux ancêtres du nouveau parent
+                cursor.execute("""
+                    INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+                    SELECT p.ancestor_id, s.descendant_id, p.depth + s.depth + 1
+                    FROM folder_closure p, folder_closure s
+                    WHERE p.descendant_id = ? AND s.ancestor_id = ?
+                """, (new_parent_id, folder_id))
+                
+                cursor.execute(
+                    "UPDATE folders SET parent_id = ? WHERE id = ?",
+                    (new_parent_id, folder_id)
+                )
+                
+                # Le sous-arbre hérite du panel du nouveau parent
+                if parent:
+                    cursor.execute("""
+                        UPDATE folders SET panel = ?
+                        WHERE id IN (SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?)
+                    """, (parent['panel'], folder_id))
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du déplacement du dossier: {e}")
+            return False
+    
+    def delete_folder(self, folder_id: int) -> bool:
+        """Supprimer un dossier, ses sous-dossiers et leurs fichiers"""
+        try:
+            subtree = "SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?"
+            with self.transaction() as cursor:
+                cursor.execute(f"SELECT filepath, file_hash FROM files WHERE folder_id IN ({subtree})", (folder_id,))
+                orphan_paths = self._release_blobs(cursor, cursor.fetchall())
+                
+                cursor.execute(f"DELETE FROM files WHERE folder_id IN ({subtree})", (folder_id,))
+                cursor.execute(f"DELETE FROM folders WHERE id IN ({subtree})", (folder_id,))
+                cursor.execute(f"DELETE FROM folder_closure WHERE descendant_id IN ({subtree})", (folder_id,))
+            
+            for path in orphan_paths:
+                self._remove_physical_file(path)
             return True
         except sqlite3.Error as e:
             print(f"❌ Erreur lors de la suppression du dossier: {e}")
             return False
     
+    def get_subtree_paths(self, folder_id: int) -> Dict[str, int]:
+        """
+        Indexer les dossiers d'un sous-arbre par chemin relatif
+        
+        Returns:
+            Dictionnaire chemin relatif -> ID ('.' pour le dossier lui-même)
+        """
+        try:
+            self.cursor.execute("""
+                SELECT f.id, f.name, f.parent_id FROM folder_closure c
+                INNER JOIN folders f ON f.id = c.descendant_id
+                WHERE c.ancestor_id = ?
+                ORDER BY c.depth
+            """, (folder_id,))
+            
+            relative = {}
+            paths = {}
+            for row in self.cursor.fetchall():
+                if row['id'] == folder_id:
+                    relative[row['id']] = '.'
+                else:
+                    parent_path = relative.get(row['parent_id'], '.')
+                    relative[row['id']] = row['name'] if parent_path == '.' else os.path.join(parent_path, row['name'])
+                paths.setdefault(relative[row['id']], row['id'])
+            return paths
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération de l'arborescence: {e}")
+            return {}
+    
     def get_folder_path(self, folder_id: int) -> List[Dict[str, Any]]:
         """Récupérer le chemin complet d'un dossier (breadcrumb)"""
-        path = []
-        current_id = folder_id
-        
-        while current_id is not None:
-            folder = self.get_folder(current_id)
-            if folder:
-                path.insert(0, folder)
-                current_id = folder['parent_id']
-            else:
-                break
-        
-        return path
+        try:
+            self.cursor.execute("""
+                SELECT f.* FROM folder_closure c
+                INNER JOIN folders f ON f.id = c.ancestor_id
+                WHERE c.descendant_id = ?
+                ORDER BY c.depth DESC
+            """, (folder_id,))
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération du chemin: {e}")
+            return []
     
     # ==================== GESTION DES FICHIERS ====================
     
-    def add_file(self, folder_id: int, filename: str, filepath: str) -> int:
+    def add_file(self, folder_id: int, filename: str, filepath: str,
+                 file_size: Optional[int] = None, file_hash: Optional[str] = None) -> int:
         """Ajouter un fichier à la base de données avec métadonnées"""
         try:
-            file_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
-            file_hash = self._calculate_file_hash(filepath)
+            if file_size is None:
+                file_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+            if file_hash is None:
+                file_hash = self._calculate_file_hash(filepath)
             
-            self.cursor.execute(
-                "INSERT INTO files (folder_id, filename, filepath, file_size, file_hash) VALUES (?, ?, ?, ?, ?)",
-                (folder_id, filename, filepath, file_size, file_hash)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
+            row = (folder_id, filename, filepath, file_size, file_hash)
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO files (folder_id, filename, filepath, file_size, file_hash) VALUES (?, ?, ?, ?, ?)",
+                    row
+                )
+                file_id = cursor.lastrowid
+                self._add_blob_refs(cursor, [row])
+                return file_id
         except sqlite3.Error as e:
             print(f"❌ Erreur lors de l'ajout du fichier: {e}")
             raise
     
+    def add_files_bulk(self, files: List[tuple], batch_size: int = 500) -> int:
+        """
+        Ajouter de nombreux fichiers en une seule transaction (executemany par lots)
+        
+        Chaque lot est protégé par un savepoint : si un lot échoue, il est annulé
+        puis rejoué ligne par ligne pour n'écarter que les lignes fautives.
+        
+        Args:
+            files: Tuples (folder_id, filename, filepath), (folder_id, filename, filepath, file_size, file_hash)
+                ou (folder_id, filename, filepath, file_size, file_hash, source_mtime)
+            batch_size: Nombre de lignes par lot
+            
+        Returns:
+            Nombre de fichiers enregistrés
+        """
+        rows = []
+        for entry in files:
+            if len(entry) >= 5:
+                source_mtime = entry[5] if len(entry) >= 6 else 0
+                rows.append(tuple(entry[:5]) + (source_mtime,))
+            else:
+                folder_id, filename, filepath = entry[:3]
+                file_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+                rows.append((folder_id, filename, filepath, file_size, self._calculate_file_hash(filepath), 0))
+        
+        query = (
+            "INSERT INTO files (folder_id, filename, filepath, file_size, file_hash, source_mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        batch_size = max(1, batch_size)
+        inserted = 0
+        
+        try:
+            with self.transaction() as cursor:
+                for start in range(0, len(rows), batch_size):
+                    batch = rows[start:start + batch_size]
+                    cursor.execute("SAVEPOINT bulk_batch")
+                    try:
+                        cursor.executemany(query, batch)
+                        self._add_blob_refs(cursor, batch)
+                        cursor.execute("RELEASE SAVEPOINT bulk_batch")
+                        inserted += len(batch)
+                        continue
+                    except sqlite3.Error as e:
+                        print(f"⚠️ Lot {start // batch_size + 1} annulé ({e}), reprise ligne par ligne...")
+                        cursor.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+                        cursor.execute("RELEASE SAVEPOINT bulk_batch")
+                    
+                    for row in batch:
+                        cursor.execute("SAVEPOINT bulk_row")
+                        try:
+                            cursor.execute(query, row)
+                            self._add_blob_refs(cursor, [row])
+                            inserted += 1
+                        except sqlite3.Error as e:
+                            print(f"⚠️ Fichier ignoré {row[1]}: {e}")
+                            cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                        cursor.execute("RELEASE SAVEPOINT bulk_row")
+            return inserted
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'ajout groupé des fichiers: {e}")
+            return 0
+    
+    def update_files_bulk(self, rows: List[tuple]) -> int:
+        """
+        Mettre à jour le contenu de fichiers existants en une seule transaction
+        
+        Args:
+            rows: Tuples (file_id, filepath, file_size, file_hash, source_mtime)
+            
+        Returns:
+            Nombre de fichiers mis à jour
+        """
+        updated = 0
+        try:
+            with self.transaction() as cursor:
+                released = []
+                for file_id, filepath, file_size, file_hash, source_mtime in rows:
+                    cursor.execute("SELECT folder_id, filename, filepath, file_hash FROM files WHERE id = ?", (file_id,))
+                    old = cursor.fetchone()
+                    if not old:
+                        continue
+                    
+                    cursor.execute(
+                        "UPDATE files SET filepath = ?, file_size = ?, file_hash = ?, source_mtime = ? WHERE id = ?",
+                        (filepath, file_size, file_hash, source_mtime, file_id)
+                    )
+                    if (old['filepath'], old['file_hash']) != (filepath, file_hash):
+                        self._add_blob_refs(cursor, [(old['folder_id'], old['filename'], filepath, file_size, file_hash)])
+                        released.append(old)
+                    updated += 1
+                
+                orphan_paths = self._release_blobs(cursor, released)
+            
+            for path in orphan_paths:
+                self._remove_physical_file(path)
+            return updated
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la mise à jour des fichiers: {e}")
+            return 0
+    
+    def _add_blob_refs(self, cursor: sqlite3.Cursor, rows: List[tuple]):
+        """Incrémenter le compteur de références des blobs (lignes (folder_id, filename, filepath, file_size, file_hash))"""
+        refs = [(row[4], row[2], row[3]) for row in rows if row[4]]
+        if not refs:
+            return
+        cursor.executemany(
+            "INSERT OR IGNORE INTO blobs (file_hash, blob_path, file_size, refcount) VALUES (?, ?, ?, 0)",
+            refs
+        )
+        cursor.executemany(
+            "UPDATE blobs SET refcount = refcount + 1 WHERE file_hash = ? AND blob_path = ?",
+            [(file_hash, filepath) for file_hash, filepath, _ in refs]
+        )
+    
+    def _release_blobs(self, cursor: sqlite3.Cursor, files: List[sqlite3.Row]) -> List[str]:
+        """
+        Décrémenter les références des fichiers supprimés
+        
+        Args:
+            cursor: Curseur de la transaction en cours
+            files: Lignes (filepath, file_hash) des fichiers supprimés
+            
+        Returns:
+            Chemins physiques devenus inutilisés (à supprimer après validation)
+        """
+        released = {}
+        orphan_paths = []
+        for file in files:
+            if file['file_hash']:
+                key = (file['file_hash'], file['filepath'])
+                released[key] = released.get(key, 0) + 1
+            else:
+                orphan_paths.append(file['filepath'])
+        
+        for (file_hash, filepath), count in released.items():
+            cursor.execute(
+                "UPDATE blobs SET refcount = refcount - ? WHERE file_hash = ? AND blob_path = ?",
+                (count, file_hash, filepath)
+            )
+            if cursor.rowcount == 0:
+                # Fichier hors stockage dédupliqué : copie propre à cette ligne
+                orphan_paths.append(filepath)
+                continue
+            
+            # Blob sans référence : supprimé (seuls les blobs libérés sont examinés, pas toute la table)
+            cursor.execute(
+                "DELETE FROM blobs WHERE file_hash = ? AND blob_path = ? AND refcount <= 0",
+                (file_hash, filepath)
+            )
+            if cursor.rowcount:
+                orphan_paths.append(filepath)
+        return orphan_paths
+    
+    def _remove_physical_file(self, filepath: str):
+        """Supprimer un fichier du disque s'il existe"""
+        try:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        except Exception as e:
+            print(f"⚠️ Impossible de supprimer le fichier {filepath}: {e}")
+    
+    def get_blob_path(self, file_hash: str, extension: str) -> Optional[str]:
+        """Récupérer le chemin du blob correspondant à un hash et une extension ('.pdf')"""
+        try:
+            self.cursor.execute("SELECT blob_path FROM blobs WHERE file_hash = ?", (file_hash,))
+            return self._blob_with_extension(self.cursor.fetchall(), extension)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche du blob: {e}")
+            return None
+    
+    @staticmethod
+    def _blob_with_extension(rows: List[sqlite3.Row], extension: str) -> Optional[str]:
+        """Blob de même extension parmi les blobs d'un hash (un fichier est ouvert par son blob)"""
+        return next((row['blob_path'] for row in rows
+                     if BlobStore.extension(row['blob_path']) == extension), None)
+    
+    def has_blob_with_size(self, file_size: int) -> bool:
+        """Vérifier si un blob de cette taille existe (évite de hasher avant copie)"""
+        try:
+            self.cursor.execute("SELECT 1 FROM blobs WHERE file_size = ? LIMIT 1", (file_size,))
+            return self.cursor.fetchone() is not None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche du blob: {e}")
+            return False
+    
+    def get_blob_index(self) -> Tuple[Dict[str, str], Set[int]]:
+        """
+        Charger l'index des blobs pour un import groupé
+        
+        Returns:
+            Tuple ((hash, extension) -> chemin du blob, ensemble des tailles connues)
+        """
+        try:
+            self.cursor.execute("SELECT file_hash, blob_path, file_size FROM blobs")
+            rows = self.cursor.fetchall()
+            blobs = {(row['file_hash'], BlobStore.extension(row['blob_path'])): row['blob_path'] for row in rows}
+            return blobs, {row['file_size'] for row in rows}
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du chargement des blobs: {e}")
+            return {}, set()
+    
     def _calculate_file_hash(self, filepath: str) -> str:
         """Calculer le hash SHA256 d'un fichier"""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            return hash_file(filepath)
         except Exception as e:
             print(f"⚠️ Erreur calcul hash: {e}")
             return ""
     
+    def get_files_in_subtree(self, folder_id: int) -> List[Dict[str, Any]]:
+        """Récupérer tous les fichiers d'un dossier et de ses sous-dossiers"""
+        try:
+            self.cursor.execute("""
+                SELECT f.* FROM files f
+                INNER JOIN folder_closure c ON f.folder_id = c.descendant_id
+                WHERE c.ancestor_id = ?
+            """, (folder_id,))
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des fichiers: {e}")
+            return []
+    
     def get_files_in_folder(self, folder_id: int) -> List[Dict[str, Any]]:
         """Récupérer tous les fichiers d'un dossier"""
         try:
@@ -391,6 +1189,32 @@ class Database:
             print(f"❌ Erreur lors de la récupération des fichiers: {e}")
             return []
     
+    def get_files_in_folder_page(self, folder_id: int, limit: int = 200,
+                                 after_key: Optional[tuple] = None) -> Page:
+        """
+        Fichiers d'un dossier, du plus récent au plus ancien, une page à la fois
+        
+        Args:
+            folder_id: ID du dossier
+            limit: Nombre de fichiers de la page
+            after_key: Clé (uploaded_at, id) renvoyée par la page précédente
+        """
+        try:
+            query = "SELECT * FROM files WHERE folder_id = ?"
+            params = [folder_id]
+            if after_key is not None:
+                query += " AND (uploaded_at, id) < (?, ?)"
+                params.extend(after_key)
+            query += " ORDER BY uploaded_at DESC, id DESC"
+            return self._fetch_page(query, params, limit, ('uploaded_at', 'id'))
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des fichiers: {e}")
+            return Page([], None)
+    
+    def iter_files_in_folder(self, folder_id: int, batch_size: int = 500) -> Iterator[Record]:
+        """Parcourir les fichiers d'un dossier page par page"""
+        return self._iter_pages(lambda key: self.get_files_in_folder_page(folder_id, batch_size, key))
+    
     def get_file(self, file_id: int) -> Optional[Dict[str, Any]]:
         """Récupérer un fichier par son ID"""
         try:
@@ -404,22 +1228,42 @@ class Database:
     def delete_file(self, file_id: int) -> bool:
         """Supprimer un fichier"""
         try:
-            file = self.get_file(file_id)
-            if file:
-                try:
-                    if os.path.exists(file['filepath']):
-                        os.remove(file['filepath'])
-                except Exception as e:
-                    print(f"⚠️ Impossible de supprimer le fichier physique: {e}")
-                
-                self.cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
-                self.conn.commit()
-                return True
-            return False
+            with self.transaction() as cursor:
+                cursor.execute("SELECT filepath, file_hash FROM files WHERE id = ?", (file_id,))
+                file = cursor.fetchone()
+                if not file:
+                    return False
+                orphan_paths = self._release_blobs(cursor, [file])
+                cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            
+            for path in orphan_paths:
+                self._remove_physical_file(path)
+            return True
         except sqlite3.Error as e:
             print(f"❌ Erreur lors de la suppression du fichier: {e}")
             return False
     
+    def delete_files_bulk(self, file_ids: List[int]) -> int:
+        """Supprimer plusieurs fichiers en une seule transaction"""
+        deleted = 0
+        try:
+            with self.transaction() as cursor:
+                orphan_paths = []
+                for start in range(0, len(file_ids), 500):
+                    chunk = file_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(f"SELECT filepath, file_hash FROM files WHERE id IN ({placeholders})", chunk)
+                    orphan_paths.extend(self._release_blobs(cursor, cursor.fetchall()))
+                    cursor.execute(f"DELETE FROM files WHERE id IN ({placeholders})", chunk)
+                    deleted += cursor.rowcount
+            
+            for path in orphan_paths:
+                self._remove_physical_file(path)
+            return deleted
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la suppression des fichiers: {e}")
+            return 0
+    
     # ==================== RECHERCHE AVANCÉE ====================
     
     def search_files(self, 
@@ -430,77 +1274,462 @@ class Database:
                     folder_id: Optional[int] = None,
                     min_size: Optional[int] = None,
                     max_size: Optional[int] = None,
-                    panel: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Recherche avancée de fichiers avec filtre par panel"""
+                    panel: Optional[str] = None,
+                    match_mode: str = 'auto',
+                    search_paths: bool = False,
+                    use_fts: bool = True,
+                    limit: Optional[int] = None,
+                    offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Recherche avancée de fichiers avec filtre par panel
+        
+        Le nom est recherché dans l'index FTS5 quand il est disponible (résultats
+        classés par pertinence bm25), sinon par LIKE.
+        
+        Args:
+            match_mode: 'auto', 'prefix' (début de mot), 'token' (mot exact) ou 'trigram' (sous-chaîne)
+            search_paths: Chercher aussi dans le chemin des dossiers
+            use_fts: False pour forcer la recherche par LIKE
+            limit: Nombre maximal de résultats (page), None pour tout récupérer
+            offset: Nombre de résultats à sauter (pages précédentes)
+        """
         try:
-            conditions = []
-            params = []
+            fts_table, conditions, params = self._search_conditions(
+                filename, extension, date_from, date_to, folder_id,
+                min_size, max_size, panel, match_mode, search_paths, use_fts
+            )
             
-            if filename:
-                conditions.append("LOWER(filename) LIKE ?")
-                params.append(f"%{filename.lower()}%")
+            query = "SELECT files.* FROM files"
+            if fts_table:
+                query += f" INNER JOIN {fts_table} ON {fts_table}.rowid = files.id"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            if fts_table:
+                query += f" ORDER BY bm25({fts_table}), files.uploaded_at DESC"
+            else:
+                query += " ORDER BY files.uploaded_at DESC"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
             
-            if extension:
-                conditions.append("LOWER(filename) LIKE ?")
-                params.append(f"%.{extension.lower()}")
+            try:
+                self.cursor.execute(query, params)
+            except sqlite3.OperationalError as e:
+                # Recherche annulée (conn.interrupt) : surtout pas de repli sur un parcours LIKE
+                if not fts_table or self._is_interrupted(e):
+                    raise
+                # Requête FTS invalide : repli sur LIKE
+                print(f"⚠️ Recherche FTS5 impossible ({e}), repli sur LIKE")
+                return self.search_files(filename, extension, date_from, date_to, folder_id,
+                                         min_size, max_size, panel, use_fts=False,
+                                         limit=limit, offset=offset)
+            return [dict(row) for row in self.cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            if not self._is_interrupted(e):
+                print(f"❌ Erreur lors de la recherche: {e}")
+            return []
+    
+    def search_files_page(self, limit: int = 200, after_key: Optional[tuple] = None,
+                          **criteria) -> Page:
+        """
+        Recherche de fichiers paginée par clé (mêmes critères que search_files)
+        
+        Les résultats FTS5 sont classés par (score bm25, date d'ajout, id), les
+        autres par (date d'ajout, id) : chaque page reprend après la clé de la
+        précédente au lieu de parcourir puis sauter les lignes déjà lues.
+        
+        Args:
+            limit: Nombre de résultats de la page
+            after_key: Clé renvoyée par la page précédente (None pour la première page)
+            **criteria: Critères de search_files (filename, extension, panel...)
+        """
+        try:
+            fts_table, conditions, params = self._search_conditions(**criteria)
             
-            if date_from:
-                conditions.append("uploaded_at >= ?")
-                params.append(date_from.isoformat())
+            if fts_table:
+                inner = (f"SELECT files.*, bm25({fts_table}) AS score FROM files"
+                         f" INNER JOIN {fts_table} ON {fts_table}.rowid = files.id")
+                if conditions:
+                    inner += " WHERE " + " AND ".join(conditions)
+                query = f"SELECT * FROM ({inner})"
+                if after_key is not None:
+                    query += " WHERE score > ? OR (score = ? AND (uploaded_at, id) < (?, ?))"
+                    params.extend([after_key[0], after_key[0], after_key[1], after_key[2]])
+                query += " ORDER BY score, uploaded_at DESC, id DESC"
+                key_columns = ('score', 'uploaded_at', 'id')
+            else:
+                if after_key is not None:
+                    conditions.append("(files.uploaded_at, files.id) < (?, ?)")
+                    params.extend(after_key)
+                query = "SELECT files.* FROM files"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                query += " ORDER BY files.uploaded_at DESC, files.id DESC"
+                key_columns = ('uploaded_at', 'id')
             
-            if date_to:
-                conditions.append("uploaded_at <= ?")
-                params.append(date_to.isoformat())
+            try:
+                return self._fetch_page(query, params, limit, key_columns)
+            except sqlite3.OperationalError as e:
+                if not fts_table or self._is_interrupted(e):
+                    raise
+                print(f"⚠️ Recherche FTS5 impossible ({e}), repli sur LIKE")
+                return self.search_files_page(limit, after_key, **dict(criteria, use_fts=False))
+            
+        except sqlite3.Error as e:
+            if not self._is_interrupted(e):
+                print(f"❌ Erreur lors de la recherche: {e}")
+            return Page([], None)
+    
+    @staticmethod
+    def _is_interrupted(error: sqlite3.Error) -> bool:
+        """Requête annulée par conn.interrupt() (recherche remplacée par une plus récente)"""
+        return isinstance(error, sqlite3.OperationalError) and "interrupted" in str(error)
+    
+    def iter_search_files(self, batch_size: int = 500, **criteria) -> Iterator[Record]:
+        """Parcourir tous les résultats d'une recherche page par page (sans tout charger en mémoire)"""
+        return self._iter_pages(lambda key: self.search_files_page(batch_size, key, **criteria))
+    
+    def _search_conditions(self,
+                           filename: str = "",
+                           extension: str = "",
+                           date_from: Optional[datetime] = None,
+                           date_to: Optional[datetime] = None,
+                           folder_id: Optional[int] = None,
+                           min_size: Optional[int] = None,
+                           max_size: Optional[int] = None,
+                           panel: Optional[str] = None,
+                           match_mode: str = 'auto',
+                           search_paths: bool = False,
+                           use_fts: bool = True) -> Tuple[Optional[str], List[str], List[Any]]:
+        """
+        Construire les conditions SQL d'une recherche de fichiers
+        
+        Returns:
+            Tuple (table FTS5 à joindre ou None, conditions, paramètres)
+        """
+        conditions = []
+        params = []
+        fts_table = None
+        
+        if filename:
+            fts = self._build_fts_query(filename, match_mode, search_paths) if use_fts else None
+            if fts:
+                fts_table, fts_query = fts
+                conditions.append(f"{fts_table} MATCH ?")
+                params.append(fts_query)
+            else:
+                conditions.append("LOWER(files.filename) LIKE ?")
+                params.append(f"%{filename.lower()}%")
+        
+        if extension:
+            conditions.append("LOWER(files.filename) LIKE ?")
+            params.append(f"%.{extension.lower()}")
+        
+        if date_from:
+            conditions.append("files.uploaded_at >= ?")
+            params.append(date_from.isoformat())
+        
+        if date_to:
+            conditions.append("files.uploaded_at <= ?")
+            params.append(date_to.isoformat())
+        
+        if folder_id is not None:
+            conditions.append("files.folder_id IN (SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?)")
+            params.append(folder_id)
+        
+        # Filtre par panel
+        if panel:
+            conditions.append("files.folder_id IN (SELECT id FROM folders WHERE panel = ?)")
+            params.append(panel)
+        
+        # Capacités du schéma en cache (aucune introspection par recherche)
+        if self.schema.has_column('files', 'file_size'):
+            if min_size is not None:
+                conditions.append("files.file_size >= ?")
+                params.append(min_size)
+            
+            if max_size is not None:
+                conditions.append("files.file_size <= ?")
+                params.append(max_size)
+        
+        return fts_table, conditions, params
+    
+    def search_content(self, text: str, extension: str = "", panel: Optional[str] = None,
+                       limit: int = 200, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Rechercher dans le contenu des documents indexés
+        
+        Returns:
+            Fichiers correspondants avec un extrait ('snippet', termes entre « »), classés par pertinence
+        """
+        if not self.schema.content_index:
+            return []
+        
+        tokens = re.findall(r"\w+", text, re.UNICODE)
+        if not tokens:
+            return []
+        
+        try:
+            query = """
+                SELECT f.*, snippet(content_fts, 0, '«', '»', '…', 16) AS snippet
+                FROM content_fts
+                INNER JOIN document_content d ON d.id = content_fts.rowid
+                INNER JOIN files f ON f.file_hash = d.file_hash
+                WHERE content_fts MATCH ?
+            """
+            params = [" AND ".join(f'"{token}"*' for token in tokens)]
             
-            if folder_id is not None:
-                folder_ids = self._get_all_subfolder_ids(folder_id)
-                folder_ids.append(folder_id)
-                placeholders = ','.join(['?'] * len(folder_ids))
-                conditions.append(f"folder_id IN ({placeholders})")
-                params.extend(folder_ids)
+            if extension:
+                query += " AND LOWER(f.filename) LIKE ?"
+                params.append(f"%.{extension.lower()}")
             
-            # Filtre par panel
             if panel:
-                conditions.append("folder_id IN (SELECT id FROM folders WHERE panel = ?)")
+                query += " AND f.folder_id IN (SELECT id FROM folders WHERE panel = ?)"
                 params.append(panel)
             
-            try:
-                self.cursor.execute("PRAGMA table_info(files)")
-                columns = [column[1] for column in self.cursor.fetchall()]
-                
-                if 'file_size' in columns:
-                    if min_size is not None:
-                        conditions.append("file_size >= ?")
-                        params.append(min_size)
-                    
-                    if max_size is not None:
-                        conditions.append("file_size <= ?")
-                        params.append(max_size)
-            except:
-                pass
-            
-            query = "SELECT * FROM files"
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            query += " ORDER BY uploaded_at DESC"
+            query += " ORDER BY bm25(content_fts), f.uploaded_at DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
             
             self.cursor.execute(query, params)
             return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche dans le contenu: {e}")
+            return []
+    
+    # Extraction en erreur (fichier verrouillé, processus interrompu...) : nouvel essai
+    # après CONTENT_RETRY_MINUTES, au plus CONTENT_MAX_ATTEMPTS tentatives
+    CONTENT_MAX_ATTEMPTS = 3
+    CONTENT_RETRY_MINUTES = 60
+    
+    def get_pending_content(self, limit: int = 100) -> List[Tuple[str, str]]:
+        """Documents (file_hash, chemin) dont le contenu n'a pas encore été extrait (ou à réessayer)"""
+        if not self.schema.content_index:
+            return []
+        try:
+            self.cursor.execute("""
+                SELECT file_hash, MIN(filepath) AS filepath FROM files
+                WHERE file_hash != ''
+                  AND (LOWER(filename) LIKE '%.pdf' OR LOWER(filename) LIKE '%.docx' OR LOWER(filename) LIKE '%.xlsx')
+                  AND NOT EXISTS (
+                      SELECT 1 FROM document_content d
+                      WHERE d.file_hash = files.file_hash
+                        AND (d.status != 'error' OR d.attempts >= ? OR d.extracted_at > datetime('now', ?))
+                  )
+                GROUP BY file_hash
+                LIMIT ?
+            """, (self.CONTENT_MAX_ATTEMPTS, f"-{self.CONTENT_RETRY_MINUTES} minutes", limit))
+            return [(row['file_hash'], row['filepath']) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche des documents à indexer: {e}")
+            return []
+    
+    def save_document_contents(self, rows: List[Tuple[str, str, str]]) -> int:
+        """
+        Enregistrer le texte extrait de documents
+        
+        Args:
+            rows: Tuples (file_hash, statut, texte)
             
+        Returns:
+            Nombre de documents enregistrés
+        """
+        saved = 0
+        try:
+            with self.transaction() as cursor:
+                for file_hash, status, text in rows:
+                    cursor.execute("SELECT id, status FROM document_content WHERE file_hash = ?", (file_hash,))
+                    existing = cursor.fetchone()
+                    if existing is None:
+                        cursor.execute(
+                            "INSERT INTO document_content (file_hash, status) VALUES (?, ?)",
+                            (file_hash, status)
+                        )
+                        content_id = cursor.lastrowid
+                    elif existing[1] == 'error':
+                        # Nouvel essai d'une extraction en erreur (aucun texte indexé)
+                        content_id = existing[0]
+                        cursor.execute(
+                            """UPDATE document_content
+                               SET status = ?, attempts = attempts + 1, extracted_at = CURRENT_TIMESTAMP
+                               WHERE id = ?""",
+                            (status, content_id)
+                        )
+                    else:
+                        continue
+                    if text:
+                        cursor.execute(
+                            "INSERT INTO content_fts (rowid, content) VALUES (?, ?)",
+                            (content_id, text)
+                        )
+                    saved += 1
+            return saved
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'enregistrement du contenu: {e}")
+            return 0
+    
+    def purge_orphan_content(self) -> int:
+        """Supprimer le contenu indexé des documents qui ne sont plus référencés"""
+        if not self.schema.content_index:
+            return 0
+        orphans = "SELECT id FROM document_content d WHERE NOT EXISTS (SELECT 1 FROM files f WHERE f.file_hash = d.file_hash)"
+        try:
+            with self.transaction() as cursor:
+                cursor.execute(f"DELETE FROM content_fts WHERE rowid IN ({orphans})")
+                cursor.execute(f"DELETE FROM document_content WHERE id IN ({orphans})")
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du nettoyage de l'index de contenu: {e}")
+            return 0
+    
+    # Fichiers sans hash ou sans taille (bases antérieures au stockage dédupliqué)
+    INTEGRITY_PENDING_SQL = "(file_hash IS NULL OR file_hash = '' OR file_size IS NULL OR file_size = 0)"
+    
+    def get_integrity_cursor(self, job: str = 'files') -> int:
+        """Dernier id traité par la vérification d'intégrité (0 si elle n'a pas commencé)"""
+        try:
+            self.cursor.execute("SELECT last_id FROM integrity_progress WHERE job = ?", (job,))
+            row = self.cursor.fetchone()
+            return row['last_id'] if row else 0
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la lecture de la progression: {e}")
+            return 0
+    
+    def count_files_needing_integrity(self, after_id: int = 0) -> int:
+        """Nombre de fichiers restant à vérifier après un id"""
+        try:
+            self.cursor.execute(
+                f"SELECT COUNT(*) FROM files WHERE id > ? AND {self.INTEGRITY_PENDING_SQL}", (after_id,)
+            )
+            return self.cursor.fetchone()[0]
         except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la recherche: {e}")
+            print(f"❌ Erreur lors du comptage des fichiers à vérifier: {e}")
+            return 0
+    
+    def get_files_needing_integrity(self, after_id: int = 0, limit: int = 200) -> List[Dict[str, Any]]:
+        """Fichiers (id, filepath, file_size, file_hash) sans hash ou sans taille, par id croissant"""
+        try:
+            self.cursor.execute(f"""
+                SELECT id, filepath, file_size, file_hash FROM files
+                WHERE id > ? AND {self.INTEGRITY_PENDING_SQL}
+                ORDER BY id
+                LIMIT ?
+            """, (after_id, limit))
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche des fichiers à vérifier: {e}")
             return []
     
-    def _get_all_subfolder_ids(self, folder_id: int) -> List[int]:
-        """Récupérer récursivement tous les IDs des sous-dossiers"""
-        subfolder_ids = []
-        subfolders = self.get_subfolders(folder_id)
+    def save_integrity_results(self, rows: List[Tuple[int, Optional[int], Optional[str]]],
+                               last_id: int, job: str = 'files') -> int:
+        """
+        Enregistrer un lot de la vérification d'intégrité avec sa progression
         
-        for subfolder in subfolders:
-            subfolder_ids.append(subfolder['id'])
-            subfolder_ids.extend(self._get_all_subfolder_ids(subfolder['id']))
+        Les fichiers nouvellement hashés rejoignent le stockage dédupliqué : un
+        contenu déjà présent dans les blobs remplace la copie du fichier.
         
-        return subfolder_ids
+        Args:
+            rows: Tuples (file_id, file_size, file_hash), None pour une valeur non calculée
+            last_id: Dernier id du lot (reprise après interruption)
+            job: Nom de la tâche de vérification
+            
+        Returns:
+            Nombre de fichiers mis à jour
+        """
+        updated = 0
+        try:
+            with self.transaction() as cursor:
+                replaced_paths = set()
+                for file_id, file_size, file_hash in rows:
+                    cursor.execute("SELECT filename, filepath, file_size, file_hash FROM files WHERE id = ?", (file_id,))
+                    old = cursor.fetchone()
+                    if not old:
+                        continue
+                    
+                    if file_size and not old['file_size']:
+                        cursor.execute("UPDATE files SET file_size = ? WHERE id = ?", (file_size, file_id))
+                        updated += 1
+                    if not file_hash or old['file_hash']:
+                        continue
+                    
+                    cursor.execute("SELECT blob_path FROM blobs WHERE file_hash = ?", (file_hash,))
+                    blob_path = (self._blob_with_extension(cursor.fetchall(), BlobStore.extension(old['filename']))
+                                 or old['filepath'])
+                    cursor.execute(
+                        "UPDATE files SET filepath = ?, file_hash = ? WHERE id = ?",
+                        (blob_path, file_hash, file_id)
+                    )
+                    self._add_blob_refs(cursor, [(None, None, blob_path, file_size or old['file_size'], file_hash)])
+                    if blob_path != old['filepath']:
+                        replaced_paths.add(old['filepath'])
+                    updated += 1
+                
+                cursor.execute(
+                    "INSERT OR REPLACE INTO integrity_progress (job, last_id) VALUES (?, ?)", (job, last_id)
+                )
+                
+                # Copies encore utilisées par d'autres fichiers : conservées
+                if replaced_paths:
+                    placeholders = ",".join("?" * len(replaced_paths))
+                    cursor.execute(
+                        f"SELECT DISTINCT filepath FROM files WHERE filepath IN ({placeholders})",
+                        list(replaced_paths)
+                    )
+                    replaced_paths -= {row['filepath'] for row in cursor.fetchall()}
+            
+            for path in sorted(replaced_paths):
+                self._remove_physical_file(path)
+            return updated
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'enregistrement de la vérification d'intégrité: {e}")
+            return 0
+    
+    def _build_fts_query(self, text: str, match_mode: str = 'auto',
+                         search_paths: bool = False) -> Optional[tuple]:
+        """
+        Traduire une saisie utilisateur en requête FTS5
+        
+        Returns:
+            Tuple (table FTS5, expression MATCH), ou None si l'index ne peut pas servir
+        """
+        if not self.fts_available:
+            return None
+        
+        tokens = re.findall(r"\w+", text, re.UNICODE)
+        if not tokens:
+            return None
+        
+        if match_mode == 'auto':
+            # Sous-chaîne (comme LIKE) dès 3 caractères, sinon début de mot
+            if self.fts_trigram_available and all(len(token) >= 3 for token in tokens):
+                match_mode = 'trigram'
+            else:
+                match_mode = 'prefix'
+        
+        if match_mode == 'trigram':
+            if not self.fts_trigram_available or any(len(token) < 3 for token in tokens):
+                return None
+            table = 'files_fts_trigram'
+            terms = [f'"{token}"' for token in tokens]
+        else:
+            table = 'files_fts'
+            suffix = '*' if match_mode == 'prefix' else ''
+            terms = [f'"{token}"{suffix}' for token in tokens]
+        
+        columns = "{filename folder_path}" if search_paths else "filename"
+        return table, f"{columns} : ({' AND '.join(terms)})"
+    
+    def _get_all_subfolder_ids(self, folder_id: int) -> List[int]:
+        """Récupérer tous les IDs des sous-dossiers (tous niveaux)"""
+        try:
+            self.cursor.execute(
+                "SELECT descendant_id FROM folder_closure WHERE ancestor_id = ? AND depth > 0 ORDER BY depth",
+                (folder_id,)
+            )
+            return [row[0] for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des sous-dossiers: {e}")
+            return []
     
     def count_files_in_folder(self, folder_id: int, recursive: bool = False) -> int:
         """Compter les fichiers dans un dossier"""
@@ -510,17 +1739,96 @@ class Database:
                     "SELECT COUNT(*) as count FROM files WHERE folder_id = ?",
                     (folder_id,)
                 )
-                return self.cursor.fetchone()[0]
             else:
-                count = self.count_files_in_folder(folder_id, recursive=False)
-                subfolders = self.get_subfolders(folder_id)
-                for subfolder in subfolders:
-                    count += self.count_files_in_folder(subfolder['id'], recursive=True)
-                return count
+                self.cursor.execute("""
+                    SELECT COUNT(*) as count FROM folder_closure c
+                    INNER JOIN files f ON f.folder_id = c.descendant_id
+                    WHERE c.ancestor_id = ?
+                """, (folder_id,))
+            return self.cursor.fetchone()[0]
         except sqlite3.Error as e:
             print(f"❌ Erreur lors du comptage des fichiers: {e}")
             return 0
     
+    def get_folder_names(self, folder_ids: List[int]) -> Dict[int, str]:
+        """Récupérer les noms de plusieurs dossiers en une requête par lot de 500"""
+        names = {}
+        ids = list(set(folder_ids))
+        try:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                self.cursor.execute(f"SELECT id, name FROM folders WHERE id IN ({placeholders})", chunk)
+                names.update((row['id'], row['name']) for row in self.cursor.fetchall())
+            return names
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des dossiers: {e}")
+            return names
+    
+    def get_folder_stats(self, folder_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Statistiques récursives (nombre, taille totale, dernier ajout) pour une liste de dossiers"""
+        stats = {
+            folder_id: {'file_count': 0, 'total_size': 0, 'last_upload': None}
+            for folder_id in folder_ids
+        }
+        if not stats:
+            return stats
+        
+        try:
+            ids = list(stats)
+            # Découper pour rester sous la limite de variables SQLite
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join(['?'] * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT c.ancestor_id AS folder_id,
+                           COUNT(f.id) AS file_count,
+                           COALESCE(SUM(f.file_size), 0) AS total_size,
+                           MAX(f.uploaded_at) AS last_upload
+                    FROM folder_closure c
+                    INNER JOIN files f ON f.folder_id = c.descendant_id
+                    WHERE c.ancestor_id IN ({placeholders})
+                    GROUP BY c.ancestor_id
+                """, chunk)
+                for row in self.cursor.fetchall():
+                    stats[row['folder_id']] = {
+                        'file_count': row['file_count'],
+                        'total_size': row['total_size'],
+                        'last_upload': row['last_upload']
+                    }
+            return stats
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du calcul des statistiques des dossiers: {e}")
+            return stats
+    
+    def get_child_counts(self, folder_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """Nombre de sous-dossiers et de fichiers directs pour une liste de dossiers (une requête par lot)"""
+        counts = {folder_id: {'subfolder_count': 0, 'file_count': 0} for folder_id in folder_ids}
+        if not counts:
+            return counts
+        
+        try:
+            ids = list(counts)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join(['?'] * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT fo.id AS folder_id,
+                           (SELECT COUNT(*) FROM folders s WHERE s.parent_id = fo.id) AS subfolder_count,
+                           (SELECT COUNT(*) FROM files f WHERE f.folder_id = fo.id) AS file_count
+                    FROM folders fo
+                    WHERE fo.id IN ({placeholders})
+                """, chunk)
+                for row in self.cursor.fetchall():
+                    counts[row['folder_id']] = {
+                        'subfolder_count': row['subfolder_count'],
+                        'file_count': row['file_count']
+                    }
+            return counts
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du comptage des sous-éléments: {e}")
+            return counts
+    
     def get_files_by_panel(self, panel: str) -> List[Dict[str, Any]]:
         """Récupérer tous les fichiers d'un panel spécifique"""
         try:
@@ -535,8 +1843,57 @@ class Database:
             print(f"❌ Erreur lors de la récupération des fichiers du panel: {e}")
             return []
     
+    def get_files_by_panel_page(self, panel: str, limit: int = 500,
+                                after_key: Optional[tuple] = None) -> Page:
+        """Fichiers d'un panel, du plus récent au plus ancien, une page à la fois"""
+        try:
+            query = """
+                SELECT f.* FROM files f
+                INNER JOIN folders fold ON f.folder_id = fold.id
+                WHERE fold.panel = ?
+            """
+            params = [panel]
+            if after_key is not None:
+                query += " AND (f.uploaded_at, f.id) < (?, ?)"
+                params.extend(after_key)
+            query += " ORDER BY f.uploaded_at DESC, f.id DESC"
+            return self._fetch_page(query, params, limit, ('uploaded_at', 'id'))
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des fichiers du panel: {e}")
+            return Page([], None)
+    
+    def iter_files_by_panel(self, panel: str, batch_size: int = 1000) -> Iterator[Record]:
+        """Parcourir les fichiers d'un panel page par page (exports sans tout charger en mémoire)"""
+        return self._iter_pages(lambda key: self.get_files_by_panel_page(panel, batch_size, key))
+    
+    def _fetch_page(self, query: str, params: List[Any], limit: int,
+                    key_columns: Tuple[str, ...]) -> Page:
+        """Exécuter une requête triée et renvoyer une page (une ligne de plus est lue pour savoir s'il en reste)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = Record
+        try:
+            cursor.execute(f"{query} LIMIT ?", [*params, limit + 1])
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        if len(rows) <= limit:
+            return Page(rows, None)
+        rows = rows[:limit]
+        return Page(rows, tuple(rows[-1][column] for column in key_columns))
+    
+    def _iter_pages(self, fetch_page: Callable[[Optional[tuple]], Page]) -> Iterator[Record]:
+        """Enchaîner les pages d'une requête paginée par clé"""
+        after_key = None
+        while True:
+            page = fetch_page(after_key)
+            yield from page.rows
+            if page.next_key is None:
+                return
+            after_key = page.next_key
+    
     def close(self):
         """Fermer la connexion à la base de données"""
-        if self.conn:
-            self.conn.close()
+        if self.pool:
+            self.pool.close_all()
             print("✅ Connexion à la base de données fermée")
\ No newline at end of file
@@ -30,6 +30,9 @@ except ImportError as e:
 from tkinter import messagebox
 from database import Database
 from utils.file_handler import FileHandler
+from utils.content_indexer import ContentIndexer
+from utils.integrity_checker import IntegrityChecker
+from utils.import_engine import ImportEngine
 try:
     from utils.notifications import NotificationManager
     NOTIFICATIONS_AVAILABLE = True
@@ -60,6 +63,9 @@ class CTkinterDnD(ctk.CTk, TkinterDnD.DnDWrapper):
 class PortalApplication:
     """Application principale du Portail Document avec système de panels"""
     
+    # Attente maximale de chaque tâche d'arrière-plan à la fermeture (secondes)
+    SHUTDOWN_TIMEOUT = 10
+    
     def __init__(self):
         # Créer la fenêtre principale avec support Drag & Drop
         if DRAG_DROP_AVAILABLE:
@@ -71,6 +77,8 @@ class PortalApplication:
         
         self.db = None
         self.file_handler = None
+        self.content_indexer = None
+        self.integrity_checker = None
         self.notification_manager = None
         
         # État de l'application
@@ -86,6 +94,14 @@ class PortalApplication:
         # Initialiser le gestionnaire de fichiers
         self.init_file_handler()
         
+        # Indexation du contenu des documents en arrière-plan
+        self.content_indexer = ContentIndexer(self.db)
+        self.content_indexer.start()
+        
+        # Tailles et hash manquants des fichiers existants, sans bloquer le démarrage
+        self.integrity_checker = IntegrityChecker(self.db)
+        self.integrity_checker.start()
+        
         # Initialiser le gestionnaire de notifications
         if NOTIFICATIONS_AVAILABLE:
             self.notification_manager = NotificationManager(self.root)
@@ -649,6 +665,10 @@ class PortalApplication:
         """Rafraîchir le contenu affiché"""
         print("🔄 Rafraîchissement du contenu")
         
+        # Nouveaux fichiers possibles : indexer leur contenu sans attendre
+        if self.content_indexer:
+            self.content_indexer.wake()
+        
         if self.notification_manager:
             self.notification_manager.show_app_notification(
                 "🔄 Mise à jour",
@@ -670,6 +690,7 @@ class PortalApplication:
         """Démarrer l'application"""
         try:
             self.root.mainloop()
+            self.cleanup()
         except KeyboardInterrupt:
             print("\n⚠️ Interruption par l'utilisateur")
             self.cleanup()
@@ -680,6 +701,15 @@ class PortalApplication:
     
     def cleanup(self):
         """Nettoyer les ressources avant de quitter"""
+        # Signaler l'arrêt à tous les threads, puis attendre qu'ils aient rendu leur connexion
+        workers = [worker for worker in (self.content_indexer, self.integrity_checker) if worker]
+        for worker in workers:
+            worker.stop()
+        stopped = ImportEngine.cancel_all(self.SHUTDOWN_TIMEOUT)
+        for worker in workers:
+            stopped = worker.join(self.SHUTDOWN_TIMEOUT) and stopped
+        if not stopped:
+            print("⚠️ Tâches d'arrière-plan encore actives, fermeture de la base forcée")
         if self.db:
             self.db.close()
         print("👋 Application fermée")
@@ -0,0 +1,154 @@
+import sqlite3
+from typing import Callable, List, NamedTuple
+
+
+class Migration(NamedTuple):
+    """Étape de migration du schéma"""
+    version: int
+    name: str
+    # Exécutée dans une seule transaction, renvoie les fichiers à supprimer après validation
+    apply: Callable
+
+
+def migrate_legacy_columns(db) -> None:
+    """Colonnes ajoutées aux bases créées par les anciennes versions"""
+    db._migrate_legacy_columns()
+
+
+def create_base_tables(db) -> None:
+    """Tables de l'application"""
+    db.create_tables()
+
+
+def build_folder_closure(db) -> None:
+    """Hiérarchie des dossiers pour les bases qui n'en ont pas encore"""
+    db.cursor.execute("SELECT EXISTS (SELECT 1 FROM folders), EXISTS (SELECT 1 FROM folder_closure)")
+    has_folders, has_closure = db.cursor.fetchone()
+    if has_folders and not has_closure:
+        print("🔄 Construction de la hiérarchie des dossiers (folder_closure)...")
+        db._backfill_folder_closure()
+
+
+def create_indexes(db) -> None:
+    """Index de recherche et index composites"""
+    db._create_indexes()
+
+
+def build_blobs(db) -> List[str]:
+    """Stockage dédupliqué : enregistrer les fichiers existants comme blobs"""
+    db.cursor.execute("SELECT EXISTS (SELECT 1 FROM files), EXISTS (SELECT 1 FROM blobs)")
+    has_files, has_blobs = db.cursor.fetchone()
+    if not has_files or has_blobs:
+        return []
+    print("🔄 Déduplication des fichiers existants (blobs)...")
+    return db._backfill_blobs()
+
+
+def create_search_index(db) -> None:
+    """Index plein texte des noms et chemins (si FTS5 est disponible)"""
+    db._create_search_index()
+
+
+def create_content_index(db) -> None:
+    """Index du contenu des documents"""
+    db._create_content_index()
+
+
+def create_integrity_table(db) -> None:
+    """Progression de la vérification d'intégrité en arrière-plan"""
+    db._create_integrity_table()
+
+
+def add_content_attempts(db) -> None:
+    """Tentatives d'extraction : les documents en erreur sont réessayés"""
+    db._add_content_attempts()
+
+
+# Étapes dans l'ordre d'application : ne jamais renuméroter, ajouter à la fin.
+# Versions 5 et 6 (tailles et hash des fichiers) retirées : calculés en arrière-plan
+# par IntegrityChecker. Leurs numéros ne doivent pas être réutilisés.
+RETIRED_VERSIONS = {5, 6}
+
+MIGRATIONS = [
+    Migration(1, "Colonnes des anciennes versions", migrate_legacy_columns),
+    Migration(2, "Tables de base", create_base_tables),
+    Migration(3, "Hiérarchie des dossiers", build_folder_closure),
+    Migration(4, "Index", create_indexes),
+    Migration(7, "Stockage dédupliqué", build_blobs),
+    Migration(8, "Index de recherche FTS5", create_search_index),
+    Migration(9, "Index du contenu des documents", create_content_index),
+    Migration(10, "Progression de la vérification d'intégrité", create_integrity_table),
+    Migration(11, "Nouvel essai des extractions en erreur", add_content_attempts),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """Application des migrations versionnées (table schema_version), reprise possible après interruption"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def current_version(self) -> int:
+        """Version du schéma de la base (0 pour une base antérieure aux migrations versionnées)"""
+        try:
+            self.db.cursor.execute("SELECT MAX(version) FROM schema_version")
+        except sqlite3.OperationalError:
+            return 0
+        return self.db.cursor.fetchone()[0] or 0
+
+    def pending(self) -> List[Migration]:
+        """Migrations restant à appliquer"""
+        version = self.current_version()
+        return [migration for migration in MIGRATIONS if migration.version > version]
+
+    def run(self) -> int:
+        """
+        Appliquer les migrations en attente (aucune requête de schéma si la base est à jour)
+
+        Returns:
+            Nombre de migrations appliquées
+        """
+        pending = self.pending()
+        if not pending:
+            return 0
+
+        self._create_tables()
+        self.db.refresh_schema()
+        for migration in pending:
+            print(f"🔄 Migration {migration.version}: {migration.name}")
+            try:
+                self._apply(migration)
+            except Exception as e:
+                print(f"❌ Migration {migration.version} ({migration.name}) échouée: {e}")
+                raise
+
+        print(f"✅ Base de données en version {SCHEMA_VERSION}")
+        return len(pending)
+
+    def _apply(self, migration: Migration):
+        """Appliquer une étape et l'enregistrer dans schema_version"""
+        with self.db.transaction() as cursor:
+            removed_paths = migration.apply(self.db) or []
+            cursor.execute(
+                "INSERT OR REPLACE INTO schema_version (version, name) VALUES (?, ?)",
+                (migration.version, migration.name)
+            )
+
+        self.db.refresh_schema()
+
+        # Fichiers supprimés seulement une fois l'étape validée
+        for path in removed_paths:
+            self.db._remove_physical_file(path)
+
+    def _create_tables(self):
+        """Table de suivi des migrations"""
+        with self.db.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
@@ -0,0 +1,54 @@
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = Database(str(tmp_path / "portal.db"))
+    if not db.schema.content_index:
+        db.close()
+        pytest.skip("FTS5 indisponible")
+    folder_id = db.create_folder("Contrats", panel="entete")
+    db.add_files_bulk([
+        (folder_id, "ok.pdf", str(tmp_path / "ok.pdf"), 10, "a" * 64),
+        (folder_id, "verrou.pdf", str(tmp_path / "verrou.pdf"), 10, "b" * 64),
+    ])
+    yield db
+    db.close()
+
+
+def age_errors(db):
+    """Faire comme si les dernières tentatives dataient d'avant le délai de nouvel essai"""
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE document_content SET extracted_at = datetime('now', '-1 day')")
+
+
+def pending_hashes(db):
+    return {file_hash for file_hash, _ in db.get_pending_content(10)}
+
+
+def test_failed_extraction_is_retried_with_a_cap(db):
+    assert db.save_document_contents([("a" * 64, 'done', 'budget annuel'), ("b" * 64, 'error', '')]) == 2
+    # Pas de nouvel essai immédiat
+    assert pending_hashes(db) == set()
+
+    for _ in range(Database.CONTENT_MAX_ATTEMPTS - 1):
+        age_errors(db)
+        assert pending_hashes(db) == {"b" * 64}
+        assert db.save_document_contents([("b" * 64, 'error', '')]) == 1
+
+    age_errors(db)
+    assert pending_hashes(db) == set()
+
+
+def test_retry_success_indexes_the_text(db):
+    db.save_document_contents([("b" * 64, 'error', '')])
+    age_errors(db)
+    assert db.save_document_contents([("b" * 64, 'done', 'contrat signé')]) == 1
+    # Document extrait : plus jamais réessayé, ni réécrit
+    assert db.save_document_contents([("b" * 64, 'done', 'autre texte')]) == 0
+    age_errors(db)
+    assert pending_hashes(db) == {"a" * 64}
+    assert [file['filename'] for file in db.search_content('contrat')] == ['verrou.pdf']
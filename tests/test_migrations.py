@@ -0,0 +1,9 @@
+from migrations import MIGRATIONS, RETIRED_VERSIONS, SCHEMA_VERSION
+
+
+def test_versions_keep_their_historic_numbers():
+    versions = [migration.version for migration in MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert not RETIRED_VERSIONS & set(versions)
+    assert {migration.name: migration.version for migration in MIGRATIONS}["Stockage dédupliqué"] == 7
+    assert SCHEMA_VERSION == 11
@@ -0,0 +1,17 @@
+from PIL import Image
+
+from utils.page_cache import PageCache
+
+
+def test_peek_reads_memory_only(tmp_path):
+    key = ("ab" * 32, 0, 100)
+    writer = PageCache(cache_dir=str(tmp_path))
+    writer.put(key, Image.new("RGB", (20, 10), "white"))
+    writer._writer.shutdown(wait=True)
+
+    cache = PageCache(cache_dir=str(tmp_path))
+    assert cache.peek(key) is None
+
+    image = cache.get(key)
+    assert image is not None and image.size == (20, 10)
+    assert cache.peek(key) is image
@@ -0,0 +1,112 @@
+from database import Database
+from ui.panel_view import PanelView
+
+
+class StubList:
+    """Liste virtualisée sans widgets : garde les lignes reçues"""
+
+    def __init__(self):
+        self.items, self.has_more = [], False
+        self.failures = 0
+
+    def set_items(self, items, has_more=False):
+        self.items, self.has_more = list(items), has_more
+
+    def append_items(self, items, has_more=False):
+        self.items.extend(items)
+        self.has_more = has_more
+
+    def load_failed(self):
+        self.failures += 1
+
+
+class StubPanelView(PanelView):
+    """PanelView sans fenêtre : seuls le chargement et la construction des lignes sont exercés"""
+
+    def __init__(self, db, panel, folder_id=None):
+        self.db, self.panel, self.folder_id = db, panel, folder_id
+        self.view_mode = "list"
+        self.content_list = StubList()
+        self.errors = []
+
+    def hide_state(self):
+        pass
+
+    def show_empty_state(self):
+        pass
+
+    def show_error_state(self, message):
+        self.errors.append(message)
+
+    def winfo_exists(self):
+        return True
+
+
+def make_db(tmp_path, monkeypatch, file_count):
+    monkeypatch.chdir(tmp_path)
+    db = Database(str(tmp_path / "portal.db"))
+    root_id = db.create_folder("_root_entete", panel="entete")
+    folder_id = db.create_folder("Contrats", panel="entete")
+    db.add_files_bulk([
+        (root_id, f"doc{i}.pdf", str(tmp_path / f"doc{i}.pdf"), 10, f"{i:064x}")
+        for i in range(file_count)
+    ])
+    return db, folder_id
+
+
+def test_load_content_pages_root_files(tmp_path, monkeypatch):
+    db, folder_id = make_db(tmp_path, monkeypatch, PanelView.PAGE_SIZE + 5)
+    try:
+        view = StubPanelView(db, "entete")
+        view.load_content()
+
+        assert view.errors == []
+        assert [folder['id'] for folder in view.subfolders] == [folder_id]
+        assert len(view.files) == PanelView.PAGE_SIZE
+        assert view.file_count == PanelView.PAGE_SIZE + 5
+        assert view.content_list.has_more
+
+        view.load_more_files()
+        assert len(view.files) == PanelView.PAGE_SIZE + 5
+        assert view.files_key is None
+        assert not view.content_list.has_more
+        assert len({file['id'] for file in view.files}) == PanelView.PAGE_SIZE + 5
+    finally:
+        db.close()
+
+
+def test_load_content_single_page(tmp_path, monkeypatch):
+    db, _ = make_db(tmp_path, monkeypatch, 3)
+    try:
+        view = StubPanelView(db, "entete")
+        view.load_content()
+
+        assert view.errors == []
+        assert len(view.files) == 3
+        assert view.files_key is None
+        assert [kind for kind, _ in view.content_list.items] == ['folder', 'file_list', 'file_list', 'file_list']
+    finally:
+        db.close()
+
+
+def test_load_more_files_failure_keeps_paging(tmp_path, monkeypatch):
+    db, _ = make_db(tmp_path, monkeypatch, PanelView.PAGE_SIZE + 5)
+    try:
+        view = StubPanelView(db, "entete")
+        view.load_content()
+        files_key = view.files_key
+
+        def failing_page(*args):
+            raise RuntimeError("base indisponible")
+
+        monkeypatch.setattr(db, "get_files_in_folder_page", failing_page)
+        view.load_more_files()
+        assert view.content_list.failures == 1
+        assert view.files_key == files_key
+
+        monkeypatch.undo()
+        view.load_more_files()
+        assert len(view.files) == PanelView.PAGE_SIZE + 5
+        assert not view.content_list.has_more
+    finally:
+        db.close()
@@ -0,0 +1,176 @@
+import re
+import sqlite3
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+from database import Database
+
+# Méthodes qui lisent volontairement toute une table (reconstructions, index complets)
+FULL_SCAN_ALLOWED = {
+    'get_all_folders',
+    'get_blob_index',
+    # Tâche de fond : anti-jointure files / document_content, bornée par LIMIT
+    'get_pending_content',
+    'purge_orphan_content',
+    'rebuild_folder_closure',
+    'rebuild_search_index',
+    # Repli LIKE '%...%' (FTS5 absent ou requête FTS invalide) : aucun index ne peut servir
+    'search_files_like',
+    'search_files_page_like',
+}
+
+# "SCAN files" ou "SCAN files USING INDEX idx" (sans SEARCH) = parcours complet de la table ou d'un index
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)( USING (COVERING )?INDEX \w+)?$")
+
+# Instructions analysées. Non couverts : INSERT ... VALUES (aucun plan), DDL et PRAGMA des migrations
+EXPLAINED_STATEMENTS = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+# Clé de pagination au-delà de toutes les lignes
+PAGE_KEY = ('9999-12-31', 1 << 62)
+
+
+def seed_database(db: Database) -> Dict[str, int]:
+    """Créer un jeu de données minimal pour exercer les requêtes"""
+    root = db.create_folder('Racine', None, 'autre')
+    sub = db.create_folder('Sous-dossier', root, 'autre')
+    db.add_files_bulk([
+        (root, f'rapport {i}.pdf', f'/blobs/r{i}.pdf', 1000 + i, f'hash{i:04d}')
+        for i in range(50)
+    ])
+    db.add_files_bulk([
+        (sub, f'note {i}.txt', f'/blobs/n{i}.txt', 10 + i, f'hash{i:04d}')
+        for i in range(50)
+    ])
+    file_id = db.get_files_in_folder(sub)[0]['id']
+
+    # Dossier sacrifié par les vérifications d'écriture (suppressions)
+    trash = db.create_folder('Corbeille', root)
+    trash_sub = db.create_folder('Archives', trash)
+    db.add_files_bulk([
+        (trash_sub, f'ancien {i}.pdf', f'/blobs/a{i}.pdf', 2000 + i, f'old{i:04d}')
+        for i in range(5)
+    ])
+    trash_files = [file['id'] for file in db.get_files_in_folder(trash_sub)]
+    return {'root': root, 'sub': sub, 'file': file_id,
+            'trash': trash, 'trash_sub': trash_sub, 'trash_files': trash_files}
+
+
+# Appels exerçant chaque requête de lecture de Database
+QUERY_CHECKS: List[Tuple[str, Callable[[Database, Dict[str, int]], object]]] = [
+    ('get_folder', lambda db, ids: db.get_folder(ids['sub'])),
+    ('get_all_folders', lambda db, ids: db.get_all_folders()),
+    ('get_all_folders_panel', lambda db, ids: db.get_all_folders(panel='autre')),
+    ('get_all_folders_page', lambda db, ids: db.get_all_folders_page('autre', 10, ('A', 0))),
+    ('get_subfolders_root', lambda db, ids: db.get_subfolders(None, panel='autre')),
+    ('get_subfolders', lambda db, ids: db.get_subfolders(ids['root'])),
+    ('get_subtree_paths', lambda db, ids: db.get_subtree_paths(ids['root'])),
+    ('get_folder_path', lambda db, ids: db.get_folder_path(ids['sub'])),
+    ('get_files_in_subtree', lambda db, ids: db.get_files_in_subtree(ids['root'])),
+    ('get_files_in_folder', lambda db, ids: db.get_files_in_folder(ids['root'])),
+    ('get_files_in_folder_page', lambda db, ids: db.get_files_in_folder_page(ids['root'], 10, PAGE_KEY)),
+    ('get_file', lambda db, ids: db.get_file(ids['file'])),
+    ('get_blob_path', lambda db, ids: db.get_blob_path('hash0001', '.pdf')),
+    ('has_blob_with_size', lambda db, ids: db.has_blob_with_size(1001)),
+    ('get_blob_index', lambda db, ids: db.get_blob_index()),
+    ('count_files_in_folder', lambda db, ids: db.count_files_in_folder(ids['root'])),
+    ('count_files_in_folder_recursive', lambda db, ids: db.count_files_in_folder(ids['root'], recursive=True)),
+    ('get_folder_names', lambda db, ids: db.get_folder_names([ids['root'], ids['sub']])),
+    ('get_folder_stats', lambda db, ids: db.get_folder_stats([ids['root'], ids['sub']])),
+    ('get_child_counts', lambda db, ids: db.get_child_counts([ids['root'], ids['sub']])),
+    ('get_files_by_panel', lambda db, ids: db.get_files_by_panel('autre')),
+    ('get_files_by_panel_page', lambda db, ids: db.get_files_by_panel_page('autre', 10, PAGE_KEY)),
+    ('search_files_fts', lambda db, ids: db.search_files(filename='rapport', panel='autre', limit=20)),
+    ('search_files_trigram', lambda db, ids: db.search_files(filename='appo', match_mode='trigram')),
+    ('search_files_folder', lambda db, ids: db.search_files(extension='pdf', folder_id=ids['root'])),
+    ('search_files_page', lambda db, ids: db.search_files_page(10, filename='note', panel='autre')),
+    ('search_files_like', lambda db, ids: db.search_files(filename='rapport', panel='autre', use_fts=False)),
+    ('search_files_page_like', lambda db, ids: db.search_files_page(10, filename='note', use_fts=False)),
+    ('search_content', lambda db, ids: db.search_content('budget', panel='autre')),
+    ('get_pending_content', lambda db, ids: db.get_pending_content(10)),
+    ('get_integrity_cursor', lambda db, ids: db.get_integrity_cursor()),
+    ('count_files_needing_integrity', lambda db, ids: db.count_files_needing_integrity(ids['file'])),
+    ('get_files_needing_integrity', lambda db, ids: db.get_files_needing_integrity(ids['file'], 10)),
+    ('authenticate_admin', lambda db, ids: db.authenticate_admin('admin', 'admin')),
+]
+
+# Appels exerçant les mises à jour et suppressions de Database (base neuve pour chacun)
+WRITE_CHECKS: List[Tuple[str, Callable[[Database, Dict[str, int]], object]]] = [
+    ('update_folder', lambda db, ids: db.update_folder(ids['sub'], 'Sous-dossier renommé')),
+    ('move_folder', lambda db, ids: db.move_folder(ids['trash_sub'], ids['sub'])),
+    ('update_files_bulk', lambda db, ids: db.update_files_bulk(
+        [(ids['trash_files'][0], '/blobs/b0.pdf', 5, 'new0000', 0.0)])),
+    ('save_document_contents', lambda db, ids: db.save_document_contents([('hash0001', 'ok', 'budget annuel')])),
+    ('save_integrity_results', lambda db, ids: db.save_integrity_results(
+        [(ids['file'], 10, 'hash0002')], ids['file'])),
+    ('delete_file', lambda db, ids: db.delete_file(ids['trash_files'][1])),
+    ('delete_files_bulk', lambda db, ids: db.delete_files_bulk(ids['trash_files'][2:4])),
+    ('delete_folder', lambda db, ids: db.delete_folder(ids['trash'])),
+]
+
+
+def open_seeded(db_path: str) -> Tuple[Database, Dict[str, int]]:
+    """Ouvrir une base neuve et la remplir"""
+    db = Database(db_path)
+    return db, seed_database(db)
+
+
+def full_scans(db: Database, name: str, call: Callable[[Database, Dict[str, int]], object],
+               ids: Dict[str, int]) -> List[str]:
+    """
+    Exécuter un appel et relever les parcours complets de ses requêtes
+
+    Les requêtes réellement envoyées à SQLite sont capturées (trace), puis
+    analysées par EXPLAIN QUERY PLAN sur une connexion séparée.
+    """
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call(db, ids)
+    finally:
+        db.conn.set_trace_callback(None)
+
+    explain_conn = sqlite3.connect(db.db_path)
+    try:
+        scans = []
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+                continue
+            plan = [row[3] for row in explain_conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            scans += [f"{m.group(1)} ({sql.split()[0]})" for m in map(FULL_SCAN_RE.match, plan) if m]
+        return scans
+    finally:
+        explain_conn.close()
+
+
+@pytest.fixture(scope="module")
+def seeded_db(tmp_path_factory):
+    """Base partagée par les vérifications de lecture"""
+    directory = tmp_path_factory.mktemp("plans")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(directory)
+        db, ids = open_seeded(str(directory / "plans.db"))
+        try:
+            yield db, ids
+        finally:
+            db.close()
+
+
+@pytest.mark.parametrize("name, call", QUERY_CHECKS, ids=[name for name, _ in QUERY_CHECKS])
+def test_query_uses_index(seeded_db, name, call):
+    db, ids = seeded_db
+    scans = full_scans(db, name, call, ids)
+    if name not in FULL_SCAN_ALLOWED:
+        assert scans == [], f"{name}: parcours complet de {', '.join(scans)}"
+
+
+@pytest.mark.parametrize("name, call", WRITE_CHECKS, ids=[name for name, _ in WRITE_CHECKS])
+def test_write_uses_index(tmp_path, monkeypatch, name, call):
+    monkeypatch.chdir(tmp_path)
+    db, ids = open_seeded(str(tmp_path / "plans.db"))
+    try:
+        scans = full_scans(db, name, call, ids)
+        if name not in FULL_SCAN_ALLOWED:
+            assert scans == [], f"{name}: parcours complet de {', '.join(scans)}"
+    finally:
+        db.close()
@@ -0,0 +1,15 @@
+import sqlite3
+
+from database import Record
+
+
+def test_record_get_defaults_for_missing_and_null_columns():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = Record
+    row = conn.execute("SELECT 12 AS file_size, NULL AS file_hash").fetchone()
+    conn.close()
+
+    assert row.get("file_size", 0) == 12
+    assert row.get("file_hash") is None
+    assert row.get("file_hash", "") == ""
+    assert row.get("absente", 0) == 0
@@ -4,6 +4,9 @@ from tkinterdnd2 import DND_FILES
 from typing import Callable, Optional
 import os
 import re
+import queue
+from collections import OrderedDict
+from utils.import_engine import ImportEngine
 
 class AdminWindow:
     """Fenêtre d'administration - Import direct sans dossier racine"""
@@ -15,12 +18,19 @@ class AdminWindow:
         'autre': {'name': 'Autre', 'icon': '📦', 'color': '#6c757d'}
     }
    
+    # Nombre maximal de cartes conservées dans les sous-arbres repliés
+    COLLAPSED_CARDS_BUDGET = 500
+   
     def __init__(self, root: ctk.CTkToplevel, db, file_handler, panel: str, on_changes: Callable):
         self.root = root
         self.db = db
         self.file_handler = file_handler
         self.panel = panel
         self.on_changes = on_changes
+        self.folder_stats = {}
+        self.folder_children = {}
+        # Sous-arbres repliés déjà construits, du plus ancien au plus récent
+        self.collapsed_subtrees = OrderedDict()
        
         self.panel_info = self.PANEL_INFO.get(panel, {
             'name': 'Inconnu',
@@ -160,12 +170,18 @@ class AdminWindow:
         """Charger les dossiers du panel (en excluant _root_*)"""
         for widget in self.folders_list.winfo_children():
             widget.destroy()
+        self.collapsed_subtrees.clear()
        
         root_folders = self.db.get_subfolders(None, panel=self.panel)
         
         # ✅ FILTRER les dossiers _root_*
         visible_folders = [f for f in root_folders if not f['name'].startswith('_root_')]
         
+        # Statistiques des dossiers racine uniquement (les autres sont chargés au dépliage)
+        self.folder_stats = {}
+        self.folder_children = {}
+        self.load_folder_info([f['id'] for f in visible_folders])
+        
         # ✅ RÉCUPÉRER les fichiers du dossier _root_* pour affichage
         root_folder = next((f for f in root_folders if f['name'].startswith('_root_')), None)
         root_files = []
@@ -210,7 +226,7 @@ class AdminWindow:
                 self.insert_folder_card(self.folders_list, folder, level=0)
    
     def insert_folder_card(self, parent, folder: dict, level: int):
-        """Insérer une carte de dossier AVEC SES FICHIERS"""
+        """Insérer une carte de dossier (contenu chargé au premier dépliage)"""
         card = ctk.CTkFrame(
             parent,
             fg_color=("#ffffff", "#1e1e1e"),
@@ -219,6 +235,7 @@ class AdminWindow:
             border_color=("gray80", "gray30")
         )
         card.pack(fill="x", padx=(level * 30 + 10, 10), pady=5)
+        card.tree_card = True
        
         inner = ctk.CTkFrame(card, fg_color="transparent")
         inner.pack(fill="x", padx=15, pady=12)
@@ -229,17 +246,14 @@ class AdminWindow:
         name_frame = ctk.CTkFrame(left_frame, fg_color="transparent")
         name_frame.pack(side="left")
        
-        subfolders = self.db.get_subfolders(folder['id'])
-        has_subfolders = len(subfolders) > 0
-        
-        # ✅ RÉCUPÉRER LES FICHIERS DU DOSSIER
-        folder_files = self.db.get_files_in_folder(folder['id'])
+        # Indicateur calculé par une seule requête agrégée pour tous les dossiers affichés
+        counts = self.folder_children.get(folder['id'], {})
        
-        if has_subfolders or folder_files:
-            expanded = ctk.BooleanVar(value=True)
+        if counts.get('subfolder_count') or counts.get('file_count'):
+            state = {'expanded': False, 'loaded': False}
             chevron = ctk.CTkLabel(
                 name_frame,
-                text='▼',
+                text='▶',
                 font=ctk.CTkFont(size=18),
                 cursor="hand2"
             )
@@ -248,27 +262,20 @@ class AdminWindow:
             children_container = ctk.CTkFrame(parent, fg_color="transparent")
            
             def toggle_expand():
-                exp = not expanded.get()
-                expanded.set(exp)
+                exp = not state['expanded']
+                state['expanded'] = exp
                 chevron.configure(text='▼' if exp else '▶')
                 if exp:
+                    self.collapsed_subtrees.pop(folder['id'], None)
+                    if not state['loaded']:
+                        self.load_folder_children(children_container, folder, level + 1)
+                        state['loaded'] = True
                     children_container.pack(fill="x", pady=0, after=card)
                 else:
                     children_container.pack_forget()
+                    self.cache_collapsed_subtree(folder['id'], children_container, state)
             
             chevron.bind("<Button-1>", lambda e: toggle_expand())
-           
-            if expanded.get():
-                children_container.pack(fill="x", pady=0, after=card)
-           
-            # ✅ AFFICHER LES FICHIERS DU DOSSIER EN PREMIER
-            if folder_files:
-                for file in folder_files:
-                    self.insert_file_card(children_container, file, folder['id'], level + 1)
-            
-            # ✅ AFFICHER LES SOUS-DOSSIERS APRÈS
-            for subfolder in subfolders:
-                self.insert_folder_card(children_container, subfolder, level + 1)
        
         ctk.CTkLabel(
             name_frame,
@@ -286,10 +293,12 @@ class AdminWindow:
             anchor="w"
         ).pack(anchor="w")
        
-        file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
+        stats = self.folder_stats.get(folder['id'], {})
+        file_count = stats.get('file_count', 0)
+        total_size = self.format_file_size(stats.get('total_size', 0))
         ctk.CTkLabel(
             info_frame,
-            text=f"{file_count} fichier{'s' if file_count > 1 else ''} • ID: {folder['id']}",
+            text=f"{file_count} fichier{'s' if file_count > 1 else ''} • {total_size} • ID: {folder['id']}",
             font=ctk.CTkFont(size=11),
             text_color=("gray50", "gray60"),
             anchor="w"
@@ -302,6 +311,7 @@ class AdminWindow:
             ("➕", "#28a745", "#1e7e34", lambda f=folder: self.add_subfolder(f['id'])),
             ("✏️", "#ffc107", "#e0a800", lambda f=folder: self.rename_folder(f['id'])),
             ("📄", "#17a2b8", "#138496", lambda f=folder: self.manage_files(f['id'])),
+            ("🔄", "#6f42c1", "#59339d", lambda f=folder: self.sync_folder(f['id'])),
             ("🗑️", "#dc3545", "#b02a37", lambda f=folder: self.delete_folder(f['id']))
         ]
        
@@ -317,6 +327,53 @@ class AdminWindow:
                 command=command
             ).pack(side="left", padx=2)
     
+    def load_folder_info(self, folder_ids: list):
+        """Charger statistiques et indicateurs de sous-éléments des dossiers à afficher"""
+        self.folder_stats.update(self.db.get_folder_stats(folder_ids))
+        self.folder_children.update(self.db.get_child_counts(folder_ids))
+   
+    def load_folder_children(self, container, folder: dict, level: int):
+        """Construire les cartes des fichiers puis des sous-dossiers d'un dossier"""
+        subfolders = self.db.get_subfolders(folder['id'])
+        folder_files = self.db.get_files_in_folder(folder['id'])
+        self.load_folder_info([f['id'] for f in subfolders])
+       
+        # ✅ AFFICHER LES FICHIERS DU DOSSIER EN PREMIER
+        for file in folder_files:
+            self.insert_file_card(container, file, folder['id'], level)
+        
+        # ✅ AFFICHER LES SOUS-DOSSIERS APRÈS
+        for subfolder in subfolders:
+            self.insert_folder_card(container, subfolder, level)
+   
+    def cache_collapsed_subtree(self, folder_id: int, container, state: dict):
+        """Conserver un sous-arbre replié, en détruisant les plus anciens au-delà du budget de cartes"""
+        # Les sous-arbres repliés à l'intérieur sont comptés avec celui-ci
+        prefix = f"{container}."
+        for nested_id in [fid for fid, entry in self.collapsed_subtrees.items()
+                          if str(entry[0]).startswith(prefix)]:
+            del self.collapsed_subtrees[nested_id]
+       
+        self.collapsed_subtrees[folder_id] = (container, self.count_cards(container), state)
+        total = sum(entry[1] for entry in self.collapsed_subtrees.values())
+       
+        while total > self.COLLAPSED_CARDS_BUDGET and self.collapsed_subtrees:
+            _, (old_container, card_count, old_state) = self.collapsed_subtrees.popitem(last=False)
+            for widget in old_container.winfo_children():
+                widget.destroy()
+            old_state['loaded'] = False
+            total -= card_count
+   
+    def count_cards(self, container) -> int:
+        """Nombre de cartes construites dans un sous-arbre (conteneurs imbriqués compris)"""
+        count = 0
+        for widget in container.winfo_children():
+            if getattr(widget, 'tree_card', False):
+                count += 1
+            else:
+                count += self.count_cards(widget)
+        return count
+    
     def insert_file_card(self, parent, file: dict, folder_id: int, level: int = 0):
         """✅ NOUVELLE MÉTHODE : Insérer une carte de fichier dans la liste"""
         extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
@@ -332,6 +389,7 @@ class AdminWindow:
         )
         card.pack(fill="x", padx=(level * 30 + 30, 10), pady=3)
         card.pack_propagate(False)
+        card.tree_card = True
         
         # Icône du fichier
         ctk.CTkLabel(
@@ -569,41 +627,31 @@ class AdminWindow:
                 root_folder_id = root_folder['id']
                 print(f"✅ Dossier virtuel existant: {root_folder_name} (ID: {root_folder_id})")
             
-            success_count = 0
             error_count = 0
+            rows = []
             
             for i, file_path in enumerate(valid_files):
                 filename = os.path.basename(file_path)
                
-                try:
-                    # Copier dans uploads/
-                    dest_path = os.path.join(self.file_handler.upload_dir, filename)
-                    
-                    # Gérer doublons
-                    if os.path.exists(dest_path):
-                        base, ext = os.path.splitext(filename)
-                        counter = 1
-                        while os.path.exists(os.path.join(self.file_handler.upload_dir, f"{base}_{counter}{ext}")):
-                            counter += 1
-                        filename = f"{base}_{counter}{ext}"
-                        dest_path = os.path.join(self.file_handler.upload_dir, filename)
-                    
-                    import shutil
-                    shutil.copy2(file_path, dest_path)
-                    
-                    # Ajouter en BDD avec le dossier virtuel
-                    self.db.add_file(root_folder_id, filename, dest_path)
-                    success_count += 1
-                    print(f"   ✅ {filename}")
+                # Stockage dédupliqué (pas de copie si le contenu existe déjà)
+                success, blob_path, file_size, file_hash = self.file_handler.store_file(
+                    file_path, filename, self.db
+                )
                 
-                except Exception as e:
+                if success:
+                    # Enregistré en BDD par lot après la copie
+                    rows.append((root_folder_id, filename, blob_path, file_size, file_hash))
+                else:
                     error_count += 1
-                    print(f"   ❌ {filename}: {e}")
                
                 progress = (i + 1) / len(valid_files)
                 progress_bar.set(progress)
                 status_label.configure(text=f"Traitement... ({i+1}/{len(valid_files)})")
                 progress_window.update_idletasks()
+            
+            # Ajouter en BDD avec le dossier virtuel (une seule transaction)
+            success_count = self.db.add_files_bulk(rows)
+            error_count += len(rows) - success_count
            
             progress_window.destroy()
            
@@ -680,65 +728,124 @@ class AdminWindow:
                 messagebox.showwarning("Attention", "⚠️ Aucun fichier valide")
                 return
            
-            progress_window = ctk.CTkToplevel(self.root)
-            progress_window.title("Importation...")
-            progress_window.geometry("600x300")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-           
-            progress_window.update_idletasks()
-            x = (progress_window.winfo_screenwidth() // 2) - 300
-            y = (progress_window.winfo_screenheight() // 2) - 150
-            progress_window.geometry(f'600x300+{x}+{y}')
-           
-            ctk.CTkLabel(
-                progress_window,
-                text="⏳ Importation...",
-                font=ctk.CTkFont(size=20, weight="bold"),
-                text_color=("#1f538d", "#00aaff")
-            ).pack(pady=20)
-           
-            self.progress_bar = ctk.CTkProgressBar(progress_window, width=500, height=20, mode="determinate")
-            self.progress_bar.pack(pady=10)
-            self.progress_bar.set(0)
-           
-            self.status_label = ctk.CTkLabel(
-                progress_window,
-                text=f"Préparation... (0/{total_files})",
-                font=ctk.CTkFont(size=14)
-            )
-            self.status_label.pack(pady=10)
-            progress_window.update()
-           
-            def progress_callback(current, total):
-                progress = current / total
-                self.progress_bar.set(progress)
-                self.status_label.configure(text=f"Importation... ({current}/{total})")
-                progress_window.update_idletasks()
-           
-            count = self.file_handler.save_files_from_folder_with_panel(
-                folder_path, self.db, None, self.panel, progress_callback=progress_callback, total=total_files
-            )
-           
-            progress_window.destroy()
+            # Copie + hash en parallèle hors du thread Tk, progression via la file
+            engine = ImportEngine(self.file_handler, self.db)
+            engine.start(folder_path, None, self.panel)
+            
+            def on_done(value):
+                if value > 0:
+                    messagebox.showinfo(
+                        "Succès",
+                        f"✅ Importation réussie!\n\n📊 {value} fichier(s)\n📁 {os.path.basename(folder_path)}"
+                    )
+                else:
+                    messagebox.showwarning("Attention", "⚠️ Aucun fichier importé")
+            
+            self.follow_engine(engine, "⏳ Importation...", f"Préparation... (0/{total_files})", on_done)
            
-            if count > 0:
+        except Exception as e:
+            messagebox.showerror("Erreur", f"❌ Impossible:\n\n{e}")
+            import traceback
+            traceback.print_exc()
+    
+    def sync_folder(self, folder_id: int):
+        """Resynchroniser un dossier avec sa source (seuls les fichiers modifiés sont copiés)"""
+        folder = self.db.get_folder(folder_id)
+        if not folder:
+            messagebox.showerror("Erreur", "❌ Introuvable")
+            return
+        
+        folder_path = filedialog.askdirectory(title=f"Dossier source de '{folder['name']}'")
+        if not folder_path:
+            return
+        
+        remove_missing = messagebox.askyesno(
+            "Synchronisation",
+            "Supprimer les fichiers absents du dossier source ?",
+            icon='warning'
+        )
+        
+        try:
+            engine = ImportEngine(self.file_handler, self.db)
+            engine.start_sync(folder_path, folder_id, remove_missing)
+            
+            def on_done(stats):
                 messagebox.showinfo(
                     "Succès",
-                    f"✅ Importation réussie!\n\n📊 {count} fichier(s)\n📁 {os.path.basename(folder_path)}"
+                    f"✅ Synchronisation terminée\n\n"
+                    f"➕ {stats['added']} ajouté(s)\n"
+                    f"✏️ {stats['updated']} modifié(s)\n"
+                    f"✔️ {stats['unchanged']} inchangé(s)\n"
+                    f"🗑️ {stats['removed']} supprimé(s)"
                 )
+            
+            self.follow_engine(engine, "🔄 Synchronisation...", "Comparaison des fichiers...", on_done)
+        
+        except Exception as e:
+            messagebox.showerror("Erreur", f"❌ Impossible:\n\n{e}")
+    
+    def follow_engine(self, engine: ImportEngine, title: str, initial_status: str, on_done: Callable):
+        """Afficher la progression d'une tâche ImportEngine d'arrière-plan"""
+        progress_window = ctk.CTkToplevel(self.root)
+        progress_window.title(title.split(" ", 1)[-1])
+        progress_window.geometry("600x300")
+        progress_window.transient(self.root)
+        progress_window.grab_set()
+       
+        progress_window.update_idletasks()
+        x = (progress_window.winfo_screenwidth() // 2) - 300
+        y = (progress_window.winfo_screenheight() // 2) - 150
+        progress_window.geometry(f'600x300+{x}+{y}')
+       
+        ctk.CTkLabel(
+            progress_window,
+            text=title,
+            font=ctk.CTkFont(size=20, weight="bold"),
+            text_color=("#1f538d", "#00aaff")
+        ).pack(pady=20)
+       
+        self.progress_bar = ctk.CTkProgressBar(progress_window, width=500, height=20, mode="determinate")
+        self.progress_bar.pack(pady=10)
+        self.progress_bar.set(0)
+       
+        self.status_label = ctk.CTkLabel(
+            progress_window,
+            text=initial_status,
+            font=ctk.CTkFont(size=14)
+        )
+        self.status_label.pack(pady=10)
+        progress_window.update()
+        
+        def poll_progress():
+            result = None
+            while True:
+                try:
+                    kind, value, total = engine.progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'progress' and total:
+                    self.progress_bar.set(value / total)
+                    self.status_label.configure(text=f"Traitement... ({value}/{total})")
+                elif kind in ('done', 'error'):
+                    result = (kind, value)
+            
+            if result is None:
+                progress_window.after(100, poll_progress)
+                return
+            
+            progress_window.destroy()
+            kind, value = result
+            
+            if kind == 'error':
+                messagebox.showerror("Erreur", f"❌ Impossible:\n\n{value}")
             else:
-                messagebox.showwarning("Attention", "⚠️ Aucun fichier importé")
-           
+                on_done(value)
+            
             self.load_folders()
             self.on_changes()
-           
-        except Exception as e:
-            if 'progress_window' in locals():
-                progress_window.destroy()
-            messagebox.showerror("Erreur", f"❌ Impossible:\n\n{e}")
-            import traceback
-            traceback.print_exc()
+        
+        progress_window.protocol("WM_DELETE_WINDOW", engine.cancel)
+        poll_progress()
    
     def create_folder(self):
         """Créer un dossier"""
@@ -997,14 +1104,14 @@ class AdminWindow:
                 filename = os.path.basename(file_path)
                
                 if self.file_handler.is_allowed_file(filename):
-                    success, dest_path = self.file_handler.save_file(
+                    success, blob_path, file_size, file_hash = self.file_handler.store_file(
                         file_path,
                         filename,
-                        folder_name
+                        self.db
                     )
                    
                     if success:
-                        self.db.add_file(folder_id, filename, dest_path)
+                        self.db.add_file(folder_id, filename, blob_path, file_size, file_hash)
                         success_count += 1
                     else:
                         error_count += 1
@@ -1234,14 +1341,14 @@ class FileManagerWindow:
                 filename = os.path.basename(file_path)
                
                 if self.file_handler.is_allowed_file(filename):
-                    success, dest_path = self.file_handler.save_file(
+                    success, blob_path, file_size, file_hash = self.file_handler.store_file(
                         file_path,
                         filename,
-                        self.folder['name']
+                        self.db
                     )
                    
                     if success:
-                        self.db.add_file(self.folder['id'], filename, dest_path)
+                        self.db.add_file(self.folder['id'], filename, blob_path, file_size, file_hash)
                         success_count += 1
                     else:
                         error_count += 1
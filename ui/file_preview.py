@@ -134,15 +134,12 @@ class FilePreviewWindow:
                 fg='#6c757d'
             ).pack(pady=10)
             
+            from PIL import ImageTk
+            from utils.rasterize import render_page
+            
             for page_num in range(max_pages):
-                page = doc[page_num]
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # Zoom x2
-                
-                # Convertir en image PIL puis PhotoImage
-                from PIL import Image, ImageTk
-                import io
-                
-                img = Image.open(io.BytesIO(pix.tobytes()))
+                # Image PIL construite directement sur les pixels rendus, puis PhotoImage
+                img = render_page(doc[page_num], zoom=2)  # Zoom x2
                 photo = ImageTk.PhotoImage(img)
                 
                 # Frame pour chaque page
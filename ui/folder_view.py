@@ -17,6 +17,7 @@ class FolderView(ctk.CTkFrame):
         self.on_folder_open = on_folder_open
         self.notification_manager = notification_manager
         self.panel_type = panel_type
+        self.folder_stats = {}
         
         self.create_widgets()
         self.load_content()
@@ -92,6 +93,7 @@ class FolderView(ctk.CTkFrame):
         try:
             subfolders = self.db.get_subfolders(self.folder_id, self.panel_type)
             files = self.db.get_files_in_folder(self.folder_id) if self.folder_id else []
+            self.folder_stats = self.db.get_folder_stats([f['id'] for f in subfolders])
             
             if not subfolders and not files:
                 self.show_empty_state()
@@ -166,10 +168,7 @@ class FolderView(ctk.CTkFrame):
             wraplength=280
         ).pack(pady=(0, 5))
         
-        try:
-            file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
-        except:
-            file_count = 0
+        file_count = self.folder_stats.get(folder['id'], {}).get('file_count', 0)
             
         ctk.CTkLabel(
             card,
@@ -281,7 +280,7 @@ class FolderView(ctk.CTkFrame):
             try:
                 from ui.pdf_viewer import PDFViewer
                 pdf_window = ctk.CTkToplevel(self.winfo_toplevel())
-                PDFViewer(pdf_window, file['filepath'], file['filename'])
+                PDFViewer(pdf_window, file['filepath'], file['filename'], file.get('file_hash'))
                 print(f"✅ PDF ouvert dans le viewer intégré: {file['filename']}")
             except ImportError:
                 messagebox.showerror(
@@ -0,0 +1,285 @@
+import queue
+import threading
+from collections import deque
+from math import ceil
+from typing import Callable, List, Optional, Tuple
+
+from utils.page_cache import ImageLRU, PageCache, quantize_zoom, zoom_bucket
+from utils.rasterize import render_page
+
+
+class PageRenderer:
+    """
+    Rendu des pages PDF dans un thread dédié, avec préchargement des pages voisines
+
+    Le thread ouvre son propre fitz.Document. Les pages rendues sont placées
+    dans le cache partagé, puis remises au thread Tk via after(). Une nouvelle
+    demande (saut de page, zoom, défilement) remplace tout le travail en attente.
+
+    En défilement continu, seules des tuiles de TILE_SIZE pixels sont rendues
+    (clé (file_hash, page, zoom, colonne, ligne)), dans un cache mémoire séparé.
+
+    Les vignettes (THUMBNAIL_WIDTH pixels de large) sont rendues quand aucune
+    page ni tuile n'attend : elles ne retardent jamais la page affichée.
+    """
+
+    # Intervalle de relève des pages rendues (ms)
+    POLL_INTERVAL = 30
+
+    # Pages préchargées dans le sens de lecture et dans le sens opposé
+    PREFETCH_AHEAD = 2
+    PREFETCH_BEHIND = 1
+
+    # Côté d'une tuile du mode défilement continu (pixels)
+    TILE_SIZE = 512
+
+    # Largeur des vignettes de pages (pixels)
+    THUMBNAIL_WIDTH = 120
+
+    def __init__(self, widget, filepath: str, file_hash: str, total_pages: int,
+                 on_rendered: Callable[[Optional[tuple], object, Optional[Exception]], None],
+                 page_cache: Optional[PageCache] = None,
+                 tile_cache: Optional[ImageLRU] = None,
+                 thumbnail_cache: Optional[PageCache] = None,
+                 on_thumbnail: Optional[Callable[[int, object, Optional[Exception]], None]] = None):
+        """
+        Args:
+            widget: Widget Tk servant à planifier les callbacks (after)
+            filepath: Chemin du document PDF
+            file_hash: Hash du document (clé du cache)
+            total_pages: Nombre de pages du document
+            on_rendered: Appelée dans le thread Tk avec (clé de cache, image, erreur) pour
+                chaque page ou tuile demandée explicitement (clé None si le document est illisible)
+            page_cache: Cache des pages rendues (cache partagé par défaut)
+            tile_cache: Cache des tuiles du défilement continu
+            thumbnail_cache: Cache des vignettes (cache partagé par défaut)
+            on_thumbnail: Appelée dans le thread Tk avec (page, vignette, erreur)
+        """
+        self.widget = widget
+        self.filepath = filepath
+        self.file_hash = file_hash
+        self.total_pages = total_pages
+        self.on_rendered = on_rendered
+        self.page_cache = page_cache or PageCache.default()
+        self.tile_cache = tile_cache or ImageLRU(64 * 1024 * 1024)
+        self.thumbnail_cache = thumbnail_cache or PageCache.thumbnails()
+        self.on_thumbnail = on_thumbnail
+
+        self.generation = 0
+        self._pending = deque()     # (génération, page, zoom, tuile ou None, demandée par l'utilisateur)
+        self._thumbnails = deque()  # pages dont la vignette est demandée, les plus urgentes en premier
+        self._rendering = False
+        self._results = queue.Queue()
+        self._thumbnail_results = queue.Queue()
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._closed = False
+        self._poll_id = None
+
+        self._thread = threading.Thread(target=self._run, name="pdf-renderer", daemon=True)
+        self._thread.start()
+
+    def request(self, page_num: int, zoom: float, direction: int = 1, notify: bool = True):
+        """
+        Demander une page et précharger ses voisines (annule les rendus en attente)
+
+        Args:
+            page_num: Page à afficher
+            zoom: Facteur de zoom
+            direction: Sens de lecture (1 vers la fin, -1 vers le début)
+            notify: False si la page est déjà affichée (préchargement seul)
+        """
+        if self._closed:
+            return
+
+        direction = -1 if direction < 0 else 1
+        plan = [(page_num, notify)]
+        for offset in range(1, self.PREFETCH_AHEAD + 1):
+            plan.append((page_num + direction * offset, False))
+        for offset in range(1, self.PREFETCH_BEHIND + 1):
+            plan.append((page_num - direction * offset, False))
+
+        self._replace_pending([
+            (num, zoom, None, wanted) for num, wanted in plan if 0 <= num < self.total_pages
+        ])
+
+    def request_tiles(self, tiles: List[Tuple[int, int, int]], zoom: float):
+        """
+        Demander des tuiles du défilement continu (annule les rendus en attente)
+
+        Args:
+            tiles: Tuiles (page, colonne, ligne), les plus urgentes en premier
+            zoom: Facteur de zoom
+        """
+        if self._closed:
+            return
+        self._replace_pending([(page_num, zoom, (column, row), True) for page_num, column, row in tiles])
+
+    def request_thumbnails(self, pages: List[int]):
+        """
+        Demander des vignettes (rendues après les pages et tuiles en attente)
+
+        Les demandes s'accumulent : les pages demandées en dernier passent en premier.
+
+        Args:
+            pages: Pages dont la vignette est affichée, dans l'ordre d'affichage
+        """
+        if self._closed:
+            return
+        with self._lock:
+            for page_num in reversed(pages):
+                if page_num in self._thumbnails:
+                    self._thumbnails.remove(page_num)
+                self._thumbnails.appendleft(page_num)
+        self._wake()
+
+    @classmethod
+    def thumbnail_zoom(cls, page_width: float) -> float:
+        """Zoom d'une vignette (largeur fixe quel que soit le format de la page)"""
+        return cls.THUMBNAIL_WIDTH / page_width
+
+    def _replace_pending(self, items: List[tuple]):
+        """Remplacer le travail en attente par une nouvelle génération"""
+        with self._lock:
+            self.generation += 1
+            self._pending.clear()
+            self._pending.extend((self.generation,) + item for item in items)
+        self._wake()
+
+    def _wake(self):
+        """Réveiller le thread de rendu et relever ses résultats"""
+        self._wake_event.set()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    @staticmethod
+    def scaled(length: float, zoom: float) -> int:
+        """Longueur en pixels d'une dimension de page rendue (arrondi de PyMuPDF)"""
+        return ceil(length * zoom - 0.001)
+
+    @classmethod
+    def tile_clip(cls, page_rect, zoom: float, tile: Tuple[int, int]):
+        """Zone d'une tuile en points PDF (les tuiles du bord sont coupées à la page)"""
+        import fitz  # PyMuPDF
+
+        column, row = tile
+        width, height = cls.scaled(page_rect.width, zoom), cls.scaled(page_rect.height, zoom)
+        x0, y0 = column * cls.TILE_SIZE, row * cls.TILE_SIZE
+        x1, y1 = min(x0 + cls.TILE_SIZE, width), min(y0 + cls.TILE_SIZE, height)
+        return fitz.Rect(
+            page_rect.x0 + x0 / zoom, page_rect.y0 + y0 / zoom,
+            page_rect.x0 + x1 / zoom, page_rect.y0 + y1 / zoom
+        )
+
+    def cancel(self):
+        """Abandonner les rendus en attente (le rendu en cours se termine et reste en cache)"""
+        with self._lock:
+            self.generation += 1
+            self._pending.clear()
+
+    def close(self):
+        """Arrêter le thread de rendu (fermeture du viewer)"""
+        self._closed = True
+        self.cancel()
+        self._wake_event.set()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    def _run(self):
+        """Boucle du thread de rendu"""
+        import fitz  # PyMuPDF
+
+        document = None
+        try:
+            document = fitz.open(self.filepath)
+            while True:
+                self._wake_event.wait()
+                with self._lock:
+                    if self._closed:
+                        break
+                    if self._pending:
+                        generation, page_num, zoom, tile, wanted = self._pending.popleft()
+                    elif self._thumbnails:
+                        generation, page_num = None, self._thumbnails.popleft()
+                    else:
+                        self._wake_event.clear()
+                        continue
+                    self._rendering = True
+
+                try:
+                    if generation is None:
+                        self._render_thumbnail(document, page_num)
+                        continue
+
+                    # Rendu au palier de zoom : l'image correspond exactement à sa clé de cache
+                    zoom = quantize_zoom(zoom)
+                    key = (self.file_hash, page_num, zoom_bucket(zoom))
+                    cache = self.page_cache
+                    if tile is not None:
+                        key += tile
+                        cache = self.tile_cache
+
+                    # Cache disque d'abord (le thread Tk ne consulte que la mémoire)
+                    image, error = cache.get(key), None
+                    if image is None:
+                        try:
+                            page = document[page_num]
+                            clip = self.tile_clip(page.rect, zoom, tile) if tile is not None else None
+                            image = render_page(page, zoom, clip=clip)
+                            cache.put(key, image)
+                        except Exception as e:
+                            image, error = None, e
+                    if wanted:
+                        self._results.put((generation, key, image, error))
+                finally:
+                    with self._lock:
+                        self._rendering = False
+        except Exception as e:
+            print(f"❌ Erreur du rendu PDF en arrière-plan: {e}")
+            self._results.put((self.generation, None, None, e))
+        finally:
+            if document is not None:
+                document.close()
+
+    def _render_thumbnail(self, document, page_num: int):
+        """Rendre une vignette à basse résolution (thread de rendu)"""
+        key = (self.file_hash, page_num, self.THUMBNAIL_WIDTH)
+        image, error = self.thumbnail_cache.get(key), None
+        if image is None:
+            try:
+                page = document[page_num]
+                image = render_page(page, self.thumbnail_zoom(page.rect.width))
+                self.thumbnail_cache.put(key, image)
+            except Exception as e:
+                image, error = None, e
+        self._thumbnail_results.put((page_num, image, error))
+
+    def _poll(self):
+        """Relever les pages rendues dans le thread Tk"""
+        self._poll_id = None
+        while True:
+            try:
+                generation, key, image, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Pages d'une demande remplacée entre-temps : gardées en cache, pas affichées
+            if generation == self.generation and not self._closed:
+                self.on_rendered(key, image, error)
+
+        while True:
+            try:
+                page_num, image, error = self._thumbnail_results.get_nowait()
+            except queue.Empty:
+                break
+            if self.on_thumbnail is not None and not self._closed:
+                self.on_thumbnail(page_num, image, error)
+
+        with self._lock:
+            busy = bool(self._pending) or bool(self._thumbnails) or self._rendering
+        pending_results = not self._results.empty() or not self._thumbnail_results.empty()
+        if not self._closed and (busy or pending_results):
+            self._poll_id = self.widget.after(self.POLL_INTERVAL, self._poll)
@@ -2,6 +2,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 from typing import Optional, Callable
 import os
+from .virtual_list import VirtualList
 
 class PanelView(ctk.CTkFrame):
     """Vue d'un panel - Affiche fichiers à la racine SANS dossier _root_"""
@@ -13,6 +14,15 @@ class PanelView(ctk.CTkFrame):
         'autre': {'name': 'Autre', 'icon': '📦', 'color': ('#6c757d', '#5a6268')}
     }
  
+    # Cartes dossier par rangée en vue grille
+    GRID_COLUMNS = 4
+ 
+    # Fichiers chargés par page (la suite au défilement)
+    PAGE_SIZE = 200
+ 
+    # Hauteur de chaque type de ligne (espacement compris)
+    ROW_HEIGHTS = {'section': 60, 'folder_row': 140, 'file': 90, 'folder': 70, 'file_list': 70}
+ 
     def __init__(self, parent, db, file_handler, panel: str,
                  folder_id: Optional[int] = None,
                  on_folder_open: Callable = None,
@@ -33,6 +43,10 @@ class PanelView(ctk.CTkFrame):
         })
      
         self.view_mode = "grid"
+        self.folder_stats = {}
+        self.subfolders = []
+        self.files = []
+        self.state_frame = None
      
         self.create_widgets()
         self.load_content()
@@ -41,12 +55,18 @@ class PanelView(ctk.CTkFrame):
         """Créer widgets"""
         self.create_breadcrumb()
      
-        self.content_scrollable = ctk.CTkScrollableFrame(
+        # Liste virtualisée : seules les lignes visibles existent, recyclées au défilement
+        self.content_list = VirtualList(
             self,
+            row_height=lambda item: self.ROW_HEIGHTS[item[0]],
+            create_row=self.create_row,
+            update_row=self.update_row,
+            on_load_more=lambda: self.after_idle(self.load_more_files),
+            row_kind=lambda item: item[0],
             fg_color=("gray95", "gray15"),
             corner_radius=15
         )
-        self.content_scrollable.pack(fill="both", expand=True, pady=(10, 0))
+        self.content_list.pack(fill="both", expand=True, pady=(10, 0))
  
     def create_breadcrumb(self):
         """Créer fil d'Ariane"""
@@ -125,10 +145,10 @@ class PanelView(ctk.CTkFrame):
         if self.view_mode == "list":
             self.view_switch.select()
     def toggle_view_mode(self):
-        """Toggle vue"""
+        """Toggle vue (données en cache : aucun rechargement BDD)"""
         self.view_mode = "list" if self.view_switch.get() else "grid"
         self.view_switch.configure(text="Vue Liste" if self.view_mode == "list" else "Vue Grille")
-        self.load_content()
+        self.render_content()
     def navigate_to(self, folder_id: Optional[int]):
         """Naviguer"""
         if self.on_folder_open:
@@ -136,21 +156,21 @@ class PanelView(ctk.CTkFrame):
  
     def load_content(self):
         """✅ CORRECTION CRITIQUE : Charger contenu en excluant _root_*"""
-        for widget in self.content_scrollable.winfo_children():
-            widget.destroy()
-     
         try:
             # Charger sous-dossiers (EXCLURE _root_*)
             subfolders = self.db.get_subfolders(self.folder_id, panel=self.panel if self.folder_id is None else None)
           
             # ✅ FILTRER _root_*
             subfolders = [f for f in subfolders if not f['name'].startswith('_root_')]
+            
+            # Statistiques de tous les dossiers en une seule requête
+            self.folder_stats = self.db.get_folder_stats([f['id'] for f in subfolders])
          
-            # Charger fichiers
-            files = []
+            # Charger fichiers (première page seulement)
+            files_folder_id = None
             if self.folder_id is not None:
                 # Fichiers du dossier courant
-                files = self.db.get_files_in_folder(self.folder_id)
+                files_folder_id = self.folder_id
             else:
                 # ✅ IMPORTANT : Fichiers de la racine (dossier _root_* inclus)
                 all_folders = self.db.get_subfolders(None, panel=self.panel)
@@ -158,63 +178,119 @@ class PanelView(ctk.CTkFrame):
                 # Récupérer fichiers du dossier _root_* uniquement
                 root_folder = next((f for f in all_folders if f['name'].startswith('_root_')), None)
                 if root_folder:
-                    files = self.db.get_files_in_folder(root_folder['id'])
-         
-            if not subfolders and not files:
-                self.show_empty_state()
-                return
+                    files_folder_id = root_folder['id']
          
-            if self.view_mode == "grid":
-                self.load_grid_view(subfolders, files)
-            else:
-                self.load_list_view(subfolders, files)
+            files, files_key, file_count = [], None, 0
+            if files_folder_id is not None:
+                page = self.db.get_files_in_folder_page(files_folder_id, self.PAGE_SIZE)
+                files, files_key = list(page.rows), page.next_key
+                file_count = self.db.count_files_in_folder(files_folder_id) if files_key else len(files)
          
         except Exception as e:
             print(f"❌ Erreur chargement: {e}")
+            self.subfolders, self.files, self.files_key = [], [], None
+            self.content_list.set_items([])
             self.show_error_state(str(e))
+            return
+     
+        self.subfolders, self.files = subfolders, files
+        self.files_folder_id, self.files_key, self.file_count = files_folder_id, files_key, file_count
+        self.render_content()
  
-    def load_grid_view(self, subfolders: list, files: list):
-        """Vue grille"""
+    def load_more_files(self):
+        """Charger la page de fichiers suivante (fin de liste atteinte au défilement)"""
+        if self.files_key is None or not self.winfo_exists():
+            return
+     
+        try:
+            page = self.db.get_files_in_folder_page(self.files_folder_id, self.PAGE_SIZE, self.files_key)
+        except Exception as e:
+            print(f"❌ Erreur chargement page de fichiers: {e}")
+            self.content_list.load_failed()
+            return
+     
+        self.files.extend(page.rows)
+        self.files_key = page.next_key
+     
+        kind = 'file' if self.view_mode == "grid" else 'file_list'
+        self.content_list.append_items([(kind, file) for file in page.rows],
+                                       has_more=self.files_key is not None)
+ 
+    def render_content(self):
+        """Afficher le contenu en cache dans le mode courant (seules les lignes visibles sont construites)"""
+        self.hide_state()
+     
+        if not self.subfolders and not self.files:
+            self.content_list.set_items([])
+            self.show_empty_state()
+            return
+     
+        if self.view_mode == "grid":
+            rows = self.build_grid_rows(self.subfolders, self.files)
+        else:
+            rows = self.build_list_rows(self.subfolders, self.files)
+        self.content_list.set_items(rows, has_more=self.files_key is not None)
+ 
+    def build_grid_rows(self, subfolders: list, files: list) -> list:
+        """Lignes de la vue grille : titres de section, rangées de cartes dossier, cartes fichier"""
+        rows = []
         if subfolders:
-            self.create_section_title("📁 Dossiers", len(subfolders))
-         
-            folders_grid = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-            folders_grid.pack(fill="x", pady=(10, 20))
-         
-            for i, folder in enumerate(subfolders):
-                row = i // 4
-                col = i % 4
-                self.create_folder_card(folders_grid, folder, row, col)
+            rows.append(('section', ("📁 Dossiers", len(subfolders))))
+            for start in range(0, len(subfolders), self.GRID_COLUMNS):
+                rows.append(('folder_row', subfolders[start:start + self.GRID_COLUMNS]))
      
         if files:
-            self.create_section_title("📄 Fichiers", len(files))
-         
-            files_frame = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-            files_frame.pack(fill="x", pady=10)
-         
-            for file in files:
-                self.create_file_card(files_frame, file)
-    def load_list_view(self, subfolders: list, files: list):
-        """Vue liste"""
-        list_frame = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-        list_frame.pack(fill="x", pady=10)
-     
-        for folder in subfolders:
-            self.create_folder_list_item(list_frame, folder)
-     
-        for file in files:
-            self.create_file_list_item(list_frame, file)
-    def create_folder_list_item(self, parent, folder: dict):
+            rows.append(('section', ("📄 Fichiers", self.file_count)))
+            rows.extend(('file', file) for file in files)
+        return rows
+    def build_list_rows(self, subfolders: list, files: list) -> list:
+        """Lignes de la vue liste"""
+        return [('folder', folder) for folder in subfolders] + [('file_list', file) for file in files]
+ 
+    def create_row(self, parent, kind: str):
+        """Créer un widget de ligne vide (recyclé par la liste virtuelle)"""
+        row = ctk.CTkFrame(parent, fg_color="transparent")
+     
+        if kind == 'section':
+            self.create_section_title(row)
+        elif kind == 'folder_row':
+            row.cards = [self.create_folder_card(row, col) for col in range(self.GRID_COLUMNS)]
+        elif kind == 'file':
+            self.create_file_card(row)
+        elif kind == 'folder':
+            self.create_folder_list_item(row)
+        else:
+            self.create_file_list_item(row)
+        return row
+    def update_row(self, row, item: tuple):
+        """Afficher un élément dans une ligne recyclée"""
+        kind, data = item
+        if kind == 'section':
+            row.title_label.configure(text=f"{data[0]} ({data[1]})")
+        elif kind == 'folder_row':
+            for col, card in enumerate(row.cards):
+                if col < len(data):
+                    self.update_folder_card(card, data[col])
+                    card.grid()
+                else:
+                    card.grid_remove()
+        elif kind == 'file':
+            self.update_file_card(row, data)
+        elif kind == 'folder':
+            self.update_folder_list_item(row, data)
+        else:
+            self.update_file_list_item(row, data)
+    def create_folder_list_item(self, row):
         """Carte dossier liste"""
         card = ctk.CTkFrame(
-            parent,
+            row,
             height=60,
             fg_color=("white", "gray20"),
             corner_radius=10,
             border_width=1,
             border_color=("gray80", "gray40")
         )
-        card.pack(fill="x", pady=5)
+        card.pack(fill="x", padx=10, pady=5)
         card.pack_propagate(False)
      
         ctk.CTkLabel(
@@ -224,94 +300,106 @@ class PanelView(ctk.CTkFrame):
             width=50
         ).pack(side="left", padx=10)
      
-        ctk.CTkLabel(
+        row.name_label = ctk.CTkLabel(
             card,
-            text=folder['name'],
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             anchor="w"
-        ).pack(side="left", expand=True)
+        )
+        row.name_label.pack(side="left", expand=True)
      
-        file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
-        ctk.CTkLabel(
+        row.count_label = ctk.CTkLabel(
             card,
-            text=f"{file_count} fichiers",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color=("gray50", "gray60")
-        ).pack(side="right", padx=10)
-     
-        card.bind('<Button-1>', lambda e: self.navigate_to(folder['id']))
-    def create_file_list_item(self, parent, file: dict):
+        )
+        row.count_label.pack(side="right", padx=10)
+     
+        card.bind('<Button-1>', lambda e: self.navigate_to(row.folder['id']))
+    def update_folder_list_item(self, row, folder: dict):
+        """Afficher un dossier dans une carte liste"""
+        row.folder = folder
+        row.name_label.configure(text=folder['name'])
+        file_count = self.folder_stats.get(folder['id'], {}).get('file_count', 0)
+        row.count_label.configure(text=f"{file_count} fichiers")
+    def create_file_list_item(self, row):
         """Carte fichier liste"""
-        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
-        icon = self.file_handler.get_file_icon(extension)
-        is_pdf = self.file_handler.is_pdf(file['filename'])
-     
         card = ctk.CTkFrame(
-            parent,
+            row,
             height=60,
             fg_color=("white", "gray20"),
             corner_radius=10,
             border_width=1,
             border_color=("gray80", "gray40")
         )
-        card.pack(fill="x", pady=5)
+        card.pack(fill="x", padx=10, pady=5)
         card.pack_propagate(False)
      
-        ctk.CTkLabel(
+        row.icon_label = ctk.CTkLabel(
             card,
-            text=icon,
+            text="",
             font=ctk.CTkFont(size=24),
             width=50
-        ).pack(side="left", padx=10)
+        )
+        row.icon_label.pack(side="left", padx=10)
      
-        ctk.CTkLabel(
+        row.name_label = ctk.CTkLabel(
             card,
-            text=file['filename'],
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             anchor="w"
-        ).pack(side="left", expand=True)
-     
-        size_formatted = self.format_file_size(file.get('file_size', 0))
-        ctk.CTkLabel(
-            card,
-            text=size_formatted,
-            font=ctk.CTkFont(size=11),
-            text_color=("gray50", "gray60")
-        ).pack(side="right", padx=10)
+        )
+        row.name_label.pack(side="left", expand=True)
      
         # Bouton action
-        action_text = "👁️" if is_pdf else "📥"
-        action_button = ctk.CTkButton(
+        row.action_button = ctk.CTkButton(
             card,
-            text=action_text,
+            text="",
             width=35,
             height=35,
             font=ctk.CTkFont(size=14, weight="bold"),
             fg_color=(self.panel_info['color'][0], self.panel_info['color'][1]),
             hover_color=("gray60", "gray40"),
-            command=lambda f=file: self.open_file_with_viewer(f) if is_pdf else self.download_file(f)
+            command=lambda: self.open_or_download(row.file)
         )
-        action_button.pack(side="right", padx=15)
+        row.action_button.pack(side="right", padx=15)
      
-        card.bind('<Double-Button-1>', lambda e, f=file: self.open_file_with_viewer(f) if is_pdf else self.download_file(f))
+        row.size_label = ctk.CTkLabel(
+            card,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=("gray50", "gray60")
+        )
+        row.size_label.pack(side="right", padx=10)
+     
+        card.bind('<Double-Button-1>', lambda e: self.open_or_download(row.file))
+    def update_file_list_item(self, row, file: dict):
+        """Afficher un fichier dans une carte liste"""
+        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
+        is_pdf = self.file_handler.is_pdf(file['filename'])
+     
+        row.file = file
+        row.icon_label.configure(text=self.file_handler.get_file_icon(extension))
+        row.name_label.configure(text=file['filename'])
+        row.size_label.configure(text=self.format_file_size(file.get('file_size', 0)))
+        row.action_button.configure(text="👁️" if is_pdf else "📥")
  
-    def create_section_title(self, title: str, count: int):
+    def create_section_title(self, row):
         """Titre section"""
-        section_frame = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-        section_frame.pack(fill="x", pady=(20, 10))
-     
-        ctk.CTkLabel(
-            section_frame,
-            text=f"{title} ({count})",
+        row.title_label = ctk.CTkLabel(
+            row,
+            text="",
             font=ctk.CTkFont(size=18, weight="bold"),
             text_color=(self.panel_info['color'][0], self.panel_info['color'][1]),
             anchor="w"
-        ).pack(side="left")
+        )
+        row.title_label.pack(side="left", padx=10, pady=(20, 10))
  
-    def create_folder_card(self, parent, folder: dict, row: int, col: int):
+    def create_folder_card(self, row, col: int):
         """Carte dossier"""
         card = ctk.CTkFrame(
-            parent,
+            row,
             width=300,
             height=120,
             fg_color=("white", "gray20"),
@@ -319,13 +407,9 @@ class PanelView(ctk.CTkFrame):
             border_width=2,
             border_color=("gray80", "gray40")
         )
-        card.grid(row=row, column=col, padx=10, pady=10, sticky="w")
+        card.grid(row=0, column=col, padx=10, pady=10, sticky="w")
         card.pack_propagate(False)
-     
-        try:
-            parent.grid_columnconfigure(col, weight=1)
-        except:
-            pass
+        row.grid_columnconfigure(col, weight=1)
      
         ctk.CTkLabel(
             card,
@@ -333,27 +417,24 @@ class PanelView(ctk.CTkFrame):
             font=ctk.CTkFont(size=40)
         ).pack(pady=(15, 5))
      
-        ctk.CTkLabel(
+        card.name_label = ctk.CTkLabel(
             card,
-            text=folder['name'],
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             wraplength=280
-        ).pack(pady=(0, 5))
+        )
+        card.name_label.pack(pady=(0, 5))
      
-        try:
-            file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
-        except:
-            file_count = 0
-         
-        ctk.CTkLabel(
+        card.count_label = ctk.CTkLabel(
             card,
-            text=f"{file_count} fichier{'s' if file_count != 1 else ''}",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color=("gray50", "gray60")
-        ).pack()
+        )
+        card.count_label.pack()
      
-        def on_click(event, fid=folder['id']):
-            self.navigate_to(fid)
+        def on_click(event):
+            self.navigate_to(card.folder['id'])
      
         def on_enter(event):
             card.configure(border_color=(self.panel_info['color'][0], self.panel_info['color'][1]))
@@ -364,75 +445,93 @@ class PanelView(ctk.CTkFrame):
         card.bind('<Button-1>', on_click)
         card.bind('<Enter>', on_enter)
         card.bind('<Leave>', on_leave)
+        return card
+    def update_folder_card(self, card, folder: dict):
+        """Afficher un dossier dans une carte"""
+        card.folder = folder
+        card.name_label.configure(text=folder['name'])
+        file_count = self.folder_stats.get(folder['id'], {}).get('file_count', 0)
+        card.count_label.configure(text=f"{file_count} fichier{'s' if file_count != 1 else ''}")
  
-    def create_file_card(self, parent, file: dict):
+    def create_file_card(self, row):
         """Carte fichier"""
-        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
-        icon = self.file_handler.get_file_icon(extension)
-        is_pdf = self.file_handler.is_pdf(file['filename'])
-     
         card = ctk.CTkFrame(
-            parent,
+            row,
             height=80,
             fg_color=("white", "gray20"),
             corner_radius=10,
             border_width=1,
             border_color=("gray80", "gray40")
         )
-        card.pack(fill="x", pady=5)
+        card.pack(fill="x", padx=10, pady=5)
         card.pack_propagate(False)
      
-        ctk.CTkLabel(
+        row.icon_label = ctk.CTkLabel(
             card,
-            text=icon,
+            text="",
             font=ctk.CTkFont(size=28),
             width=70
-        ).pack(side="left", padx=15)
+        )
+        row.icon_label.pack(side="left", padx=15)
      
         info_frame = ctk.CTkFrame(card, fg_color="transparent")
         info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=15)
      
-        name_label = ctk.CTkLabel(
+        row.name_label = ctk.CTkLabel(
             info_frame,
-            text=file['filename'],
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             anchor="w"
         )
-        name_label.pack(fill="x")
+        row.name_label.pack(fill="x")
      
-        try:
-            size = file.get('file_size', 0)
-            if size == 0 and os.path.exists(file['filepath']):
-                size = os.path.getsize(file['filepath'])
-            size_formatted = self.format_file_size(size)
-        except:
-            size_formatted = "N/A"
-     
-        type_text = f"{size_formatted} • {'🔒 PDF (Lecture seule)' if is_pdf else '💾 Téléchargeable'}"
-     
-        meta_label = ctk.CTkLabel(
+        row.meta_label = ctk.CTkLabel(
             info_frame,
-            text=type_text,
+            text="",
             font=ctk.CTkFont(size=11),
             text_color=("gray50", "gray60"),
             anchor="w"
         )
-        meta_label.pack(fill="x")
+        row.meta_label.pack(fill="x")
      
-        action_text = "👁️ Visualiser" if is_pdf else "📥 Télécharger"
-        action_button = ctk.CTkButton(
+        row.action_button = ctk.CTkButton(
             card,
-            text=action_text,
+            text="",
             width=130,
             height=45,
             font=ctk.CTkFont(size=12, weight="bold"),
             fg_color=(self.panel_info['color'][0], self.panel_info['color'][1]),
             hover_color=("gray60", "gray40"),
-            command=lambda f=file: self.open_file_with_viewer(f) if is_pdf else self.download_file(f)
+            command=lambda: self.open_or_download(row.file)
         )
-        action_button.pack(side="right", padx=15)
+        row.action_button.pack(side="right", padx=15)
+     
+        card.bind('<Double-Button-1>', lambda e: self.open_or_download(row.file))
+    def update_file_card(self, row, file: dict):
+        """Afficher un fichier dans une carte"""
+        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
+        is_pdf = self.file_handler.is_pdf(file['filename'])
      
-        card.bind('<Double-Button-1>', lambda e, f=file: self.open_file_with_viewer(f) if is_pdf else self.download_file(f))
+        try:
+            size = file.get('file_size', 0)
+            if size == 0 and os.path.exists(file['filepath']):
+                size = os.path.getsize(file['filepath'])
+            size_formatted = self.format_file_size(size)
+        except:
+            size_formatted = "N/A"
+     
+        row.file = file
+        row.icon_label.configure(text=self.file_handler.get_file_icon(extension))
+        row.name_label.configure(text=file['filename'])
+        row.meta_label.configure(text=f"{size_formatted} • {'🔒 PDF (Lecture seule)' if is_pdf else '💾 Téléchargeable'}")
+        row.action_button.configure(text="👁️ Visualiser" if is_pdf else "📥 Télécharger")
+ 
+    def open_or_download(self, file: dict):
+        """Action principale d'un fichier : visualiser un PDF, télécharger les autres"""
+        if self.file_handler.is_pdf(file['filename']):
+            self.open_file_with_viewer(file)
+        else:
+            self.download_file(file)
  
     def download_file(self, file: dict):
         """Télécharger un fichier non-PDF"""
@@ -472,7 +571,7 @@ class PanelView(ctk.CTkFrame):
             try:
                 from .pdf_viewer import PDFViewer
                 pdf_window = ctk.CTkToplevel(self.winfo_toplevel())
-                PDFViewer(pdf_window, file['filepath'], file['filename'])
+                PDFViewer(pdf_window, file['filepath'], file['filename'], file.get('file_hash'))
                 print(f"✅ PDF ouvert dans le viewer intégré: {file['filename']}")
             except ImportError:
                 messagebox.showerror(
@@ -488,14 +587,13 @@ class PanelView(ctk.CTkFrame):
  
     def show_empty_state(self):
         """État vide"""
-        empty_frame = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-        empty_frame.pack(fill="both", expand=True, pady=100)
+        empty_frame = self.create_state_frame()
      
         ctk.CTkLabel(
             empty_frame,
             text=self.panel_info['icon'],
             font=ctk.CTkFont(size=80)
-        ).pack(pady=(50, 20))
+        ).pack(pady=(150, 20))
      
         ctk.CTkLabel(
             empty_frame,
@@ -513,14 +611,13 @@ class PanelView(ctk.CTkFrame):
  
     def show_error_state(self, error_message: str):
         """État erreur"""
-        error_frame = ctk.CTkFrame(self.content_scrollable, fg_color="transparent")
-        error_frame.pack(fill="both", expand=True, pady=100)
+        error_frame = self.create_state_frame()
      
         ctk.CTkLabel(
             error_frame,
             text="❌",
             font=ctk.CTkFont(size=80)
-        ).pack(pady=(50, 20))
+        ).pack(pady=(150, 20))
      
         ctk.CTkLabel(
             error_frame,
@@ -537,6 +634,18 @@ class PanelView(ctk.CTkFrame):
             wraplength=600
         ).pack()
  
+    def create_state_frame(self):
+        """Cadre superposé à la liste pour les états vide/erreur"""
+        self.hide_state()
+        self.state_frame = ctk.CTkFrame(self.content_list, fg_color=("gray95", "gray15"), corner_radius=15)
+        self.state_frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+        return self.state_frame
+    def hide_state(self):
+        """Retirer l'état vide/erreur affiché"""
+        if self.state_frame is not None:
+            self.state_frame.destroy()
+            self.state_frame = None
+ 
     @staticmethod
     def format_file_size(size: int) -> str:
         """Formater taille"""
@@ -1,23 +1,67 @@
 import customtkinter as ctk
+import hashlib
+import os
 from tkinter import messagebox, Canvas
-from PIL import Image
 import fitz  # PyMuPDF
+from PIL import Image, ImageTk
 from customtkinter import CTkImage
-import io
+from bisect import bisect_right
+from math import ceil
+from typing import Optional
+from utils.page_cache import ImageLRU, PageCache, quantize_zoom, zoom_bucket
+from .page_renderer import PageRenderer
+from .virtual_list import VirtualList
 
 class PDFViewer(ctk.CTkToplevel):
     """Viewer PDF modernisé avec CustomTkinter - Lecture seule"""
 
-    def __init__(self, parent, filepath: str, filename: str):
+    # Défilement continu : espace entre les pages (pixels) et mémoire des tuiles rendues
+    PAGE_GAP = 20
+    TILE_CACHE_BYTES = 64 * 1024 * 1024
+
+    # Zooms autorisés et pas des boutons (paliers du cache)
+    MIN_ZOOM = 0.5
+    MAX_ZOOM = 3.0
+    ZOOM_STEP = 0.25
+
+    # Barre des vignettes : marge autour de l'image et hauteur du numéro de page (pixels)
+    THUMBNAIL_PADDING = 16
+    THUMBNAIL_LABEL_HEIGHT = 24
+
+    def __init__(self, parent, filepath: str, filename: str, file_hash: Optional[str] = None):
         super().__init__(parent)
 
         self.filepath = filepath
         self.filename = filename
+        self.file_hash = file_hash
         self.pdf_document = None
         self.current_page = 0
+        self.reading_direction = 1
         self.total_pages = 0
         self.zoom_level = 1.0
-        self.page_images = {}
+        self.renderer = None
+        # Pages rendues partagées entre viewers et conservées sur disque
+        self.page_cache = PageCache.default()
+
+        # Défilement continu : dimensions des pages (points), position de chaque page
+        # sur le canvas et tuiles affichées (clé -> (id du canvas, PhotoImage))
+        self.continuous = False
+        self.page_sizes = []
+        self.page_offsets = []
+        self.page_lefts = []
+        self.layout_canvas_width = 0
+        self.tile_cache = ImageLRU(self.TILE_CACHE_BYTES)
+        self.tile_items = {}
+        self.visible_tiles = set()
+        self.preview_items = []
+        self._tiles_refresh_id = None
+
+        # Barre des vignettes : virtualisée, vignettes rendues à la demande et gardées sur disque
+        self.thumbnail_cache = PageCache.thumbnails()
+        self.thumbnail_list = None
+        self.thumbnail_page = None
+        self._missing_thumbnails = []
+        self._thumbnails_request_id = None
 
         # Configuration de la fenêtre
         self.title(f"🔒 Lecture seule - {filename}")
@@ -39,6 +83,15 @@ class PDFViewer(ctk.CTkToplevel):
         # Créer l'interface
         self.create_widgets()
 
+        # Rendu des pages hors du thread Tk
+        self.renderer = PageRenderer(
+            self, self.filepath, self.file_hash, self.total_pages,
+            self.on_page_rendered, self.page_cache, self.tile_cache,
+            self.thumbnail_cache, self.on_thumbnail_rendered
+        )
+        self.protocol("WM_DELETE_WINDOW", self.close_viewer)
+        self.thumbnail_list.set_items(range(self.total_pages))
+
         # Afficher la première page
         self.display_page(0)
 
@@ -62,6 +115,10 @@ class PDFViewer(ctk.CTkToplevel):
         try:
             self.pdf_document = fitz.open(self.filepath)
             self.total_pages = len(self.pdf_document)
+            # Dimensions lues sans rendu (mise en page du défilement continu)
+            self.page_sizes = [(page.rect.width, page.rect.height) for page in self.pdf_document]
+            if not self.file_hash:
+                self.file_hash = self.compute_cache_id()
             print(f"✅ PDF chargé: {self.total_pages} pages - {self.filename}")
             return True
         except Exception as e:
@@ -73,6 +130,21 @@ class PDFViewer(ctk.CTkToplevel):
             )
             return False
 
+    def compute_cache_id(self) -> str:
+        """
+        Clé du cache disque d'un fichier ouvert hors de la base (sans hash connu)
+
+        Dérivée du chemin, de la taille et de la date de modification : le contenu
+        n'est pas lu, l'ouverture d'un gros document ne bloque pas l'interface.
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except OSError as e:
+            print(f"⚠️ Erreur lecture fichier: {e}")
+            return ""
+        identity = f"{os.path.abspath(self.filepath)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
     def create_widgets(self):
         """Créer l'interface"""
         # ============= EN-TÊTE AVEC AVERTISSEMENT SÉCURISÉ =============
@@ -262,6 +334,19 @@ class PDFViewer(ctk.CTkToplevel):
             command=self.reset_zoom
         ).pack(side="left", padx=8)
 
+        # Mode d'affichage : page par page ou défilement continu
+        self.mode_button = ctk.CTkButton(
+            nav_center,
+            text="📜 Défilement continu",
+            width=170,
+            height=45,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            fg_color=("#6f42c1", "#59359a"),
+            hover_color=("#7d52cc", "#6a40b5"),
+            command=self.toggle_continuous
+        )
+        self.mode_button.pack(side="left", padx=10)
+
         # ============= ZONE D'AFFICHAGE AVEC SCROLLBARS =============
         display_container = ctk.CTkFrame(
             self,
@@ -269,6 +354,19 @@ class PDFViewer(ctk.CTkToplevel):
         )
         display_container.pack(fill="both", expand=True, padx=5, pady=5)
 
+        # Barre des vignettes : un clic affiche la page
+        self.thumbnail_list = VirtualList(
+            display_container,
+            row_height=self.thumbnail_row_height,
+            create_row=self.create_thumbnail_row,
+            update_row=self.update_thumbnail_row,
+            overscan=2,
+            width=PageRenderer.THUMBNAIL_WIDTH + 2 * self.THUMBNAIL_PADDING + 16,
+            fg_color=("#e9ecef", "#232323")
+        )
+        self.thumbnail_list.pack(side="left", fill="y", padx=(0, 5))
+        self.thumbnail_list.pack_propagate(False)
+
         # Canvas avec couleur de fond adaptée au thème
         self.canvas = Canvas(
             display_container,
@@ -291,8 +389,8 @@ class PDFViewer(ctk.CTkToplevel):
 
         # Configuration du canvas
         self.canvas.configure(
-            yscrollcommand=v_scrollbar.set,
-            xscrollcommand=h_scrollbar.set
+            yscrollcommand=lambda first, last: self.on_canvas_scroll(v_scrollbar, first, last),
+            xscrollcommand=lambda first, last: self.on_canvas_scroll(h_scrollbar, first, last)
         )
 
         # Pack avec ordre correct
@@ -316,10 +414,20 @@ class PDFViewer(ctk.CTkToplevel):
         # Événements de scroll et redimensionnement
         self.canvas.bind('<Configure>', self.on_canvas_configure)
         self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        # La barre des vignettes reprend la molette au survol : la rendre à la page
+        self.canvas.bind('<Enter>', lambda e: self.canvas.bind_all("<MouseWheel>", self.on_mousewheel))
         self.bind('<Configure>', self.on_window_configure)
 
     def on_canvas_configure(self, event):
         """Ajuster la taille du canvas"""
+        if self.continuous:
+            # Largeur modifiée : pages recentrées, sinon seules les tuiles visibles changent
+            if event.width != self.layout_canvas_width:
+                self.layout_continuous()
+            else:
+                self.schedule_tiles_refresh()
+            return
+
         # Mettre à jour la région de scroll
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         
@@ -336,125 +444,435 @@ class PDFViewer(ctk.CTkToplevel):
 
     def on_window_configure(self, event):
         """Ajuster lors du redimensionnement de la fenêtre"""
-        if event.widget == self:
+        if event.widget == self and not self.continuous:
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
+    def on_canvas_scroll(self, scrollbar, first, last):
+        """Synchroniser une barre de défilement (et les tuiles en défilement continu)"""
+        scrollbar.set(first, last)
+        if self.continuous:
+            self.schedule_tiles_refresh()
+
     def display_page(self, page_num: int):
-        """Afficher une page du PDF"""
+        """Afficher une page du PDF (rendue en arrière-plan si elle n'est pas en cache)"""
         if page_num < 0 or page_num >= self.total_pages:
             return
 
-        try:
-            self.current_page = page_num
-
-            # Clé de cache avec zoom
-            cache_key = f"{page_num}_{self.zoom_level}"
-            if cache_key in self.page_images:
-                ctk_image = self.page_images[cache_key]
-                print(f"📋 Page {page_num + 1} chargée depuis le cache")
-            else:
-                # Afficher un message de chargement
-                self.image_label.configure(
-                    image=None,
-                    text=f"⏳ Chargement de la page {page_num + 1}...",
-                    text_color=("#6c757d", "#adb5bd")
-                )
-                self.update()
-
-                # Rendre la page avec PyMuPDF
-                page = self.pdf_document[page_num]
-                mat = fitz.Matrix(self.zoom_level, self.zoom_level)
-                pix = page.get_pixmap(matrix=mat)
-
-                # Convertir en image PIL
-                img_data = pix.tobytes("ppm")
-                img = Image.open(io.BytesIO(img_data))
-
-                # Créer CTkImage avec support High DPI
-                ctk_image = CTkImage(
-                    light_image=img, 
-                    dark_image=img, 
-                    size=(img.width, img.height)
-                )
-
-                # Mettre en cache (limiter à 3 pages pour la mémoire)
-                if len(self.page_images) >= 3:
-                    # Supprimer l'entrée la plus ancienne
-                    oldest_key = next(iter(self.page_images))
-                    del self.page_images[oldest_key]
-                
-                self.page_images[cache_key] = ctk_image
-                print(f"✅ Page {page_num + 1} rendue et mise en cache (zoom: {int(self.zoom_level * 100)}%)")
+        if page_num != self.current_page:
+            self.reading_direction = 1 if page_num > self.current_page else -1
+        self.current_page = page_num
+
+        # Mettre à jour l'indicateur de page
+        self.page_label.configure(text=f"📄 Page {page_num + 1} / {self.total_pages}")
+        self.update_thumbnail_selection()
+
+        # Clé de cache : document, page et zoom
+        cache_key = (self.file_hash, page_num, zoom_bucket(self.zoom_level))
+        # Mémoire seulement : le cache disque est relu par le thread de rendu
+        img = self.page_cache.peek(cache_key)
+        preview = self.page_cache.nearest(cache_key) if img is None else None
+        if img is not None:
+            print(f"📋 Page {page_num + 1} chargée depuis le cache")
+            self.show_page_image(img)
+        elif preview is not None:
+            # Aperçu immédiat : la page rendue à un autre zoom, redimensionnée à l'affichage
+            self.show_page_image(preview, self.page_pixel_size(page_num))
+        else:
+            # Afficher un message de chargement (sans attendre le rendu)
+            self.image_label.configure(
+                image=None,
+                text=f"⏳ Chargement de la page {page_num + 1}...",
+                text_color=("#6c757d", "#adb5bd")
+            )
 
-            # Afficher l'image dans le CTkLabel
-            self.image_label.configure(image=ctk_image, text="")
+        # Rendu et préchargement des pages voisines dans le sens de lecture
+        self.renderer.request(page_num, self.zoom_level, self.reading_direction, notify=img is None)
 
-            # Mettre à jour la région de scroll après un court délai
-            self.after(100, self.update_scroll_region)
+    def on_page_rendered(self, key: Optional[tuple], img, error: Optional[Exception]):
+        """Afficher une page rendue par le thread de rendu (ignorée si l'utilisateur est passé à une autre)"""
+        if key is not None and len(key) == 5:
+            self.on_tile_rendered(key, img, error)
+            return
 
-            # Mettre à jour l'indicateur de page
-            self.page_label.configure(text=f"📄 Page {page_num + 1} / {self.total_pages}")
+        page_num, zoom = (key[1], key[2]) if key is not None else (None, None)
+        if self.continuous:
+            return
+        if page_num is not None and (page_num, zoom) != (self.current_page, zoom_bucket(self.zoom_level)):
+            return
 
-        except Exception as e:
-            print(f"❌ Erreur affichage page {page_num + 1}: {e}")
+        if error is not None:
+            print(f"❌ Erreur affichage page {self.current_page + 1}: {error}")
             self.image_label.configure(
                 image=None,
-                text=f"❌ Erreur d'affichage\nPage {page_num + 1}\n\n{str(e)}",
+                text=f"❌ Erreur d'affichage\nPage {self.current_page + 1}\n\n{str(error)}",
                 text_color=("#dc3545", "#e04555")
             )
+            return
+
+        print(f"✅ Page {page_num + 1} rendue et mise en cache (zoom: {zoom}%)")
+        self.show_page_image(img)
+
+    def show_page_image(self, img, size: Optional[tuple] = None):
+        """Afficher l'image d'une page (redimensionnée à size pour un aperçu)"""
+        # Créer CTkImage avec support High DPI
+        ctk_image = CTkImage(
+            light_image=img, 
+            dark_image=img, 
+            size=size or (img.width, img.height)
+        )
+
+        # Afficher l'image dans le CTkLabel
+        self.image_label.configure(image=ctk_image, text="")
+
+        # Mettre à jour la région de scroll après un court délai
+        self.after(100, self.update_scroll_region)
+
+    def page_pixel_size(self, page_num: int) -> tuple:
+        """Dimensions d'une page rendue au zoom courant (pixels)"""
+        width, height = self.page_sizes[page_num]
+        return PageRenderer.scaled(width, self.zoom_level), PageRenderer.scaled(height, self.zoom_level)
 
     def update_scroll_region(self):
         """Mettre à jour la région de scroll"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        if not self.continuous:
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def go_to_page(self, page_num: int):
+        """Afficher une page (défilement jusqu'à la page en mode continu)"""
+        if page_num < 0 or page_num >= self.total_pages:
+            return
+        if self.continuous:
+            self.current_page = page_num
+            self.page_label.configure(text=f"📄 Page {page_num + 1} / {self.total_pages}")
+            self.update_thumbnail_selection()
+            self.scroll_to_page(page_num)
+        else:
+            self.display_page(page_num)
+
+    def set_zoom(self, zoom: float) -> bool:
+        """
+        Changer le zoom : aperçu immédiat redimensionné, puis rendu net en arrière-plan
+
+        Returns:
+            True si le zoom a changé
+        """
+        zoom = quantize_zoom(min(self.MAX_ZOOM, max(self.MIN_ZOOM, zoom)))
+        if zoom == self.zoom_level:
+            return False
+
+        previous_zoom = self.zoom_level
+        self.zoom_level = zoom
+        self.zoom_label.configure(text=f"{zoom_bucket(zoom)}%")
+        if self.continuous:
+            self.layout_continuous(previous_zoom)
+        else:
+            self.display_page(self.current_page)
+        return True
 
     def first_page(self):
         """Aller à la première page"""
         print("⏮️ Première page")
-        self.display_page(0)
+        self.go_to_page(0)
 
     def previous_page(self):
         """Page précédente"""
         if self.current_page > 0:
             print(f"⬅️ Page précédente: {self.current_page}")
-            self.display_page(self.current_page - 1)
+            self.go_to_page(self.current_page - 1)
 
     def next_page(self):
         """Page suivante"""
         if self.current_page < self.total_pages - 1:
             print(f"➡️ Page suivante: {self.current_page + 2}")
-            self.display_page(self.current_page + 1)
+            self.go_to_page(self.current_page + 1)
 
     def last_page(self):
         """Aller à la dernière page"""
         print("⏭️ Dernière page")
-        self.display_page(self.total_pages - 1)
+        self.go_to_page(self.total_pages - 1)
 
     def zoom_in(self):
         """Augmenter le zoom"""
-        if self.zoom_level < 3.0:
-            self.zoom_level = min(3.0, self.zoom_level + 0.25)
-            self.page_images.clear()
-            self.display_page(self.current_page)
-            self.zoom_label.configure(text=f"{int(self.zoom_level * 100)}%")
-            print(f"🔍+ Zoom: {int(self.zoom_level * 100)}%")
+        if self.set_zoom(self.zoom_level + self.ZOOM_STEP):
+            print(f"🔍+ Zoom: {zoom_bucket(self.zoom_level)}%")
 
     def zoom_out(self):
         """Diminuer le zoom"""
-        if self.zoom_level > 0.5:
-            self.zoom_level = max(0.5, self.zoom_level - 0.25)
-            self.page_images.clear()
-            self.display_page(self.current_page)
-            self.zoom_label.configure(text=f"{int(self.zoom_level * 100)}%")
-            print(f"🔍- Zoom: {int(self.zoom_level * 100)}%")
+        if self.set_zoom(self.zoom_level - self.ZOOM_STEP):
+            print(f"🔍- Zoom: {zoom_bucket(self.zoom_level)}%")
 
     def reset_zoom(self):
         """Réinitialiser le zoom à 100%"""
-        self.zoom_level = 1.0
-        self.page_images.clear()
-        self.display_page(self.current_page)
-        self.zoom_label.configure(text="100%")
+        self.set_zoom(1.0)
         print("🎯 Zoom réinitialisé à 100%")
 
+    # ==================== DÉFILEMENT CONTINU ====================
+
+    def toggle_continuous(self):
+        """Basculer entre l'affichage page par page et le défilement continu"""
+        self.continuous = not self.continuous
+        self.renderer.cancel()
+
+        if self.continuous:
+            self.mode_button.configure(text="📄 Page par page")
+            self.canvas.itemconfigure(self.canvas_window, state="hidden")
+            self.layout_continuous()
+            print("📜 Mode défilement continu")
+        else:
+            self.mode_button.configure(text="📜 Défilement continu")
+            self.clear_continuous()
+            self.canvas.itemconfigure(self.canvas_window, state="normal")
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+            self.display_page(self.current_page)
+            print("📄 Mode page par page")
+
+    def clear_continuous(self):
+        """Supprimer les pages et tuiles du défilement continu"""
+        self.canvas.delete("continuous")
+        self.tile_items.clear()
+        self.visible_tiles = set()
+        self.preview_items = []
+
+    def layout_continuous(self, previous_zoom: Optional[float] = None):
+        """
+        Disposer toutes les pages sur le canvas d'après leurs dimensions (sans rendu)
+
+        Args:
+            previous_zoom: Zoom précédent : ses tuiles affichées servent d'aperçu redimensionné
+        """
+        page_num = self.current_page
+        old_tiles = []
+        if previous_zoom is not None:
+            for key in self.tile_items:
+                image = self.tile_cache.get(key)
+                if image is not None:
+                    old_tiles.append((key, image))
+        self.clear_continuous()
+
+        zoom = self.zoom_level
+        self.layout_canvas_width = self.canvas.winfo_width()
+        widest = max((PageRenderer.scaled(width, zoom) for width, _ in self.page_sizes), default=0)
+        layout_width = max(self.layout_canvas_width, widest + 2 * self.PAGE_GAP)
+
+        self.page_offsets = []
+        self.page_lefts = []
+        y = self.PAGE_GAP
+        for width, height in self.page_sizes:
+            page_width, page_height = PageRenderer.scaled(width, zoom), PageRenderer.scaled(height, zoom)
+            x = (layout_width - page_width) // 2
+            self.page_offsets.append(y)
+            self.page_lefts.append(x)
+            # Fond de page visible tant que ses tuiles ne sont pas rendues
+            self.canvas.create_rectangle(
+                x, y, x + page_width, y + page_height,
+                fill="white", outline="#adb5bd", tags=("continuous",)
+            )
+            y += page_height + self.PAGE_GAP
+
+        self.canvas.configure(scrollregion=(0, 0, layout_width, y))
+        self.scroll_to_page(page_num)
+        if old_tiles:
+            self.show_tile_previews(old_tiles, previous_zoom)
+
+    def show_tile_previews(self, tiles: list, previous_zoom: float):
+        """Afficher les tuiles de l'ancien zoom redimensionnées, en attendant les tuiles nettes"""
+        factor = self.zoom_level / previous_zoom
+        tile_size = PageRenderer.TILE_SIZE
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+
+        for (_, page_num, _, column, row), image in tiles:
+            x = self.page_lefts[page_num] + round(column * tile_size * factor)
+            y = self.page_offsets[page_num] + round(row * tile_size * factor)
+            size = (max(1, round(image.width * factor)), max(1, round(image.height * factor)))
+            # Seules les tuiles qui restent dans la vue sont redimensionnées
+            if x >= right or y >= bottom or x + size[0] <= left or y + size[1] <= top:
+                continue
+            photo = ImageTk.PhotoImage(image.resize(size, Image.BILINEAR))
+            item = self.canvas.create_image(x, y, image=photo, anchor="nw", tags=("continuous", "preview"))
+            self.preview_items.append((item, photo))
+
+    def drop_previews(self):
+        """Supprimer les aperçus une fois toutes les tuiles visibles nettes"""
+        if self.preview_items and self.visible_tiles.issubset(self.tile_items):
+            self.canvas.delete("preview")
+            self.preview_items = []
+
+    def scroll_to_page(self, page_num: int):
+        """Faire défiler le canvas jusqu'au haut d'une page"""
+        total_height = float(self.canvas.cget("scrollregion").split()[3])
+        self.canvas.yview_moveto((self.page_offsets[page_num] - self.PAGE_GAP // 2) / total_height)
+        self.schedule_tiles_refresh()
+
+    def schedule_tiles_refresh(self):
+        """Regrouper les rafraîchissements des tuiles (un seul par passage de la boucle Tk)"""
+        if self._tiles_refresh_id is None:
+            self._tiles_refresh_id = self.after_idle(self.refresh_tiles)
+
+    def refresh_tiles(self):
+        """Afficher les tuiles visibles, demander les manquantes et retirer celles sorties de la vue"""
+        self._tiles_refresh_id = None
+        if not self.continuous or not self.page_offsets:
+            return
+
+        zoom = self.zoom_level
+        bucket = zoom_bucket(zoom)
+        tile_size = PageRenderer.TILE_SIZE
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+
+        # Page courante = page au centre de la zone visible
+        self.current_page = max(0, bisect_right(self.page_offsets, (top + bottom) / 2) - 1)
+        self.page_label.configure(text=f"📄 Page {self.current_page + 1} / {self.total_pages}")
+        self.update_thumbnail_selection()
+
+        # Marge d'une demi-tuile : les tuiles sont prêtes avant d'entrer dans la vue
+        top -= tile_size // 2
+        bottom += tile_size // 2
+
+        wanted = []
+        first = max(0, bisect_right(self.page_offsets, top) - 1)
+        for page_num in range(first, self.total_pages):
+            y0 = self.page_offsets[page_num]
+            if y0 >= bottom:
+                break
+            x0 = self.page_lefts[page_num]
+            width, height = self.page_sizes[page_num]
+            page_width, page_height = PageRenderer.scaled(width, zoom), PageRenderer.scaled(height, zoom)
+            if y0 + page_height <= top:
+                continue
+
+            columns = range(max(0, int(left - x0) // tile_size),
+                            min(ceil(page_width / tile_size), int(right - x0) // tile_size + 1))
+            rows = range(max(0, int(top - y0) // tile_size),
+                         min(ceil(page_height / tile_size), int(bottom - y0) // tile_size + 1))
+            wanted.extend((page_num, column, row) for row in rows for column in columns)
+
+        self.visible_tiles = {(self.file_hash, page_num, bucket, column, row) for page_num, column, row in wanted}
+
+        # Tuiles sorties de la vue : retirées du canvas (l'image reste dans le cache des tuiles)
+        for key in [key for key in self.tile_items if key not in self.visible_tiles]:
+            self.canvas.delete(self.tile_items.pop(key)[0])
+
+        missing = []
+        for page_num, column, row in wanted:
+            key = (self.file_hash, page_num, bucket, column, row)
+            if key in self.tile_items:
+                continue
+            image = self.tile_cache.get(key)
+            if image is not None:
+                self.place_tile(key, image)
+            else:
+                missing.append((page_num, column, row))
+
+        if missing:
+            self.renderer.request_tiles(missing, zoom)
+        else:
+            self.drop_previews()
+
+    def place_tile(self, key: tuple, image):
+        """Afficher une tuile rendue à sa position sur le canvas"""
+        _, page_num, _, column, row = key
+        tile_size = PageRenderer.TILE_SIZE
+        photo = ImageTk.PhotoImage(image)
+        item = self.canvas.create_image(
+            self.page_lefts[page_num] + column * tile_size,
+            self.page_offsets[page_num] + row * tile_size,
+            image=photo, anchor="nw", tags=("continuous",)
+        )
+        self.tile_items[key] = (item, photo)
+
+    def on_tile_rendered(self, key: tuple, image, error: Optional[Exception]):
+        """Afficher une tuile rendue si elle est toujours visible"""
+        if error is not None:
+            print(f"❌ Erreur de rendu page {key[1] + 1}: {error}")
+            return
+        if self.continuous and key in self.visible_tiles and key not in self.tile_items:
+            self.place_tile(key, image)
+            self.drop_previews()
+
+    # ==================== VIGNETTES ====================
+
+    def thumbnail_key(self, page_num: int) -> tuple:
+        """Clé du cache des vignettes"""
+        return (self.file_hash, page_num, PageRenderer.THUMBNAIL_WIDTH)
+
+    def thumbnail_size(self, page_num: int) -> tuple:
+        """Dimensions d'une vignette (pixels), connues avant son rendu"""
+        width, height = self.page_sizes[page_num]
+        zoom = PageRenderer.thumbnail_zoom(width)
+        return PageRenderer.scaled(width, zoom), PageRenderer.scaled(height, zoom)
+
+    def thumbnail_row_height(self, page_num: Optional[int]) -> int:
+        """Hauteur d'une ligne de la barre des vignettes"""
+        if page_num is None:
+            return 40
+        return self.thumbnail_size(page_num)[1] + self.THUMBNAIL_PADDING + self.THUMBNAIL_LABEL_HEIGHT
+
+    def create_thumbnail_row(self, parent):
+        """Créer une ligne vide de la barre des vignettes"""
+        return ctk.CTkButton(
+            parent,
+            text="",
+            compound="top",
+            corner_radius=6,
+            font=ctk.CTkFont(size=11, weight="bold"),
+            fg_color="transparent",
+            hover_color=("#dee2e6", "#3a3a3a"),
+            text_color=("#495057", "#ffffff")
+        )
+
+    def update_thumbnail_row(self, button, page_num: int):
+        """Afficher la vignette d'une page (fond blanc en attendant son rendu)"""
+        image = self.thumbnail_cache.peek(self.thumbnail_key(page_num))
+        if image is None:
+            # Image vide plutôt qu'aucune : un bouton recyclé garderait l'ancienne vignette
+            image = Image.new("RGB", self.thumbnail_size(page_num), "white")
+            self.schedule_thumbnail(page_num)
+
+        selected = page_num == self.current_page
+        button.configure(
+            image=CTkImage(light_image=image, dark_image=image, size=(image.width, image.height)),
+            text=f"{page_num + 1}",
+            fg_color=("#cfe2ff", "#3d3563") if selected else "transparent",
+            command=lambda: self.go_to_page(page_num)
+        )
+
+    def schedule_thumbnail(self, page_num: int):
+        """Regrouper les vignettes manquantes en une demande par passage de la boucle Tk"""
+        self._missing_thumbnails.append(page_num)
+        if self._thumbnails_request_id is None:
+            self._thumbnails_request_id = self.after_idle(self.request_missing_thumbnails)
+
+    def request_missing_thumbnails(self):
+        """Demander au thread de rendu les vignettes manquantes"""
+        self._thumbnails_request_id = None
+        pages, self._missing_thumbnails = self._missing_thumbnails, []
+        if self.renderer and pages:
+            self.renderer.request_thumbnails(pages)
+
+    def on_thumbnail_rendered(self, page_num: int, image, error: Optional[Exception]):
+        """Afficher une vignette rendue si sa ligne est construite"""
+        if error is not None:
+            print(f"⚠️ Vignette de la page {page_num + 1} impossible: {error}")
+            return
+        self.thumbnail_list.refresh_item(page_num)
+
+    def update_thumbnail_selection(self):
+        """Mettre en évidence la vignette de la page courante et la garder visible"""
+        if self.thumbnail_list is None or self.thumbnail_page == self.current_page:
+            return
+        previous, self.thumbnail_page = self.thumbnail_page, self.current_page
+        if previous is not None:
+            self.thumbnail_list.refresh_item(previous)
+        self.thumbnail_list.refresh_item(self.current_page)
+        self.thumbnail_list.see(self.current_page)
+
     def on_mousewheel(self, event):
         """Gérer le scroll avec la molette"""
         # Scroll vertical
@@ -513,18 +931,36 @@ class PDFViewer(ctk.CTkToplevel):
         print(f"🚫 Action bloquée: {event}")
         return "break"  # Empêcher la propagation
 
+    def cancel_idle_callbacks(self):
+        """Annuler les rafraîchissements de tuiles et demandes de vignettes en attente"""
+        for after_id in (self._tiles_refresh_id, self._thumbnails_request_id):
+            if after_id is not None:
+                try:
+                    self.after_cancel(after_id)
+                except Exception:
+                    pass
+        self._tiles_refresh_id = self._thumbnails_request_id = None
+
+    def destroy(self):
+        """Détruire la fenêtre (rappels différés annulés : ils viseraient un canvas détruit)"""
+        self.cancel_idle_callbacks()
+        super().destroy()
+
     def close_viewer(self):
         """Fermer le viewer proprement"""
         print("🚪 Fermeture du viewer PDF...")
         try:
             # Libérer les ressources
+            if self.renderer:
+                self.renderer.close()
+                
             if self.pdf_document:
                 self.pdf_document.close()
                 print("✅ Document PDF fermé")
             
-            # Vider le cache d'images
-            self.page_images.clear()
-            print("✅ Cache images vidé")
+            # Le cache des pages est conservé : une réouverture s'affiche sans nouveau rendu
+            self.tile_cache.clear()
+            self.tile_items.clear()
             
             # Fermer la fenêtre
             self.destroy()
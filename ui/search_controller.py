@@ -0,0 +1,144 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class SearchController:
+    """Recherche asynchrone avec temporisation : une seule requête utile à la fois, résultats périmés ignorés"""
+
+    # Intervalle de relève des résultats (ms)
+    POLL_INTERVAL = 50
+
+    def __init__(self, widget, db, search_fn: Callable[[Dict[str, Any]], Any],
+                 on_results: Callable[[Any], None],
+                 on_searching: Optional[Callable[[], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 delay_ms: int = 250):
+        """
+        Args:
+            widget: Widget Tk servant à planifier les callbacks (after)
+            db: Instance de la base de données (connexion libérée par le worker)
+            search_fn: Fonction critères -> résultats, exécutée hors du thread Tk
+            on_results: Appelée dans le thread Tk avec les résultats de la dernière recherche
+            on_searching: Appelée dans le thread Tk quand une recherche démarre
+            on_error: Appelée dans le thread Tk si la recherche échoue
+            delay_ms: Temporisation après la dernière frappe
+        """
+        self.widget = widget
+        self.db = db
+        self.search_fn = search_fn
+        self.on_results = on_results
+        self.on_searching = on_searching
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self.generation = 0
+        self._timer_id = None
+        self._poll_id = None
+        self._results = queue.Queue()
+        self._active_conn = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._closed = False
+
+    def schedule(self, criteria: Dict[str, Any]):
+        """Planifier une recherche (annule la recherche en attente)"""
+        if self._closed:
+            return
+        self._cancel_timer()
+        self._timer_id = self.widget.after(self.delay_ms, lambda: self._launch(criteria))
+
+    def search_now(self, criteria: Dict[str, Any]):
+        """Lancer une recherche immédiatement"""
+        if self._closed:
+            return
+        self._cancel_timer()
+        self._launch(criteria)
+
+    def close(self):
+        """Arrêter le contrôleur (fermeture de la fenêtre)"""
+        self._closed = True
+        self._cancel_timer()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._invalidate()
+        # Les recherches encore en file sont périmées et ignorées, puis la connexion du worker est fermée
+        self._executor.submit(self.db.release_connection)
+        self._executor.shutdown(wait=False)
+
+    def _launch(self, criteria: Dict[str, Any]):
+        """Démarrer une nouvelle génération de recherche"""
+        self._timer_id = None
+        generation = self._invalidate()
+
+        if self.on_searching:
+            self.on_searching()
+
+        self._executor.submit(self._work, generation, criteria)
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def _invalidate(self) -> int:
+        """Rendre périmées les recherches en cours et interrompre la requête SQLite active"""
+        with self._lock:
+            self.generation += 1
+            if self._active_conn is not None:
+                self._active_conn.interrupt()
+            return self.generation
+
+    def _work(self, generation: int, criteria: Dict[str, Any]):
+        """Exécuter la recherche (thread worker, connexion conservée entre deux recherches)"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            # Une base en mémoire partage sa connexion avec le thread Tk : ne pas l'interrompre
+            if self.db.db_path != ':memory:':
+                self._active_conn = self.db.conn
+
+        try:
+            result, error = self.search_fn(criteria), None
+        except Exception as e:
+            result, error = None, e
+        finally:
+            with self._lock:
+                self._active_conn = None
+
+        self._results.put((generation, result, error))
+
+    def _poll(self):
+        """Relever les résultats dans le thread Tk (seule la dernière génération est affichée)"""
+        self._poll_id = None
+        latest = None
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == self.generation:
+                latest = item
+
+        if latest is not None:
+            _, result, error = latest
+            if error is not None:
+                if self.on_error:
+                    self.on_error(error)
+            else:
+                self.on_results(result)
+            return
+
+        if not self._closed:
+            self._poll_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def _cancel_timer(self):
+        """Annuler la recherche temporisée en attente"""
+        if self._timer_id is not None:
+            try:
+                self.widget.after_cancel(self._timer_id)
+            except Exception:
+                pass
+            self._timer_id = None
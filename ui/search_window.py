@@ -2,10 +2,15 @@ import customtkinter as ctk
 from tkinter import messagebox
 from typing import Callable, Optional, List, Dict, Any
 import os
+from .search_controller import SearchController
+from .virtual_list import VirtualList
 
 class SearchWindow:
     """Fenêtre de recherche optimisée avec plus d'espace pour les résultats"""
   
+    # Résultats chargés par page (les suivantes en fin de défilement)
+    PAGE_SIZE = 200
+  
     def __init__(self, root: ctk.CTkToplevel, db, file_handler, on_file_select: Callable):
         self.root = root
         self.db = db
@@ -18,6 +23,17 @@ class SearchWindow:
         self.center_window()
         self.create_widgets()
       
+        # Recherches exécutées hors du thread Tk, seule la dernière saisie compte
+        self.search_controller = SearchController(
+            self.root,
+            self.db,
+            self.run_search,
+            on_results=self.display_results,
+            on_searching=self.show_searching,
+            on_error=self.on_search_error
+        )
+        self.root.bind('<Destroy>', self.on_destroy, add="+")
+      
         # Effectuer une recherche initiale (tous les fichiers)
         self.search_files()
   
@@ -201,6 +217,16 @@ class SearchWindow:
                 command=command
             ).pack(side="left", padx=3)
       
+        # Recherche dans le texte des documents (index de contenu)
+        self.content_search_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            shortcuts_frame,
+            text="📝 Dans le contenu",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            variable=self.content_search_var,
+            command=self.search_files
+        ).pack(side="right", padx=3)
+      
         # ============= RÉSULTATS - ESPACE MAXIMISÉ =============
         results_container = ctk.CTkFrame(
             self.root,
@@ -226,13 +252,18 @@ class SearchWindow:
         )
         self.results_label.pack(pady=12) # ✅ Centré
       
-        # Liste des résultats - ESPACE MAXIMISÉ
-        self.results_list = ctk.CTkScrollableFrame(
+        # Liste des résultats - ESPACE MAXIMISÉ, seules les lignes visibles sont construites
+        self.results_list = VirtualList(
             results_container,
+            row_height=81,
+            create_row=self.create_result_row,
+            update_row=self.update_result_row,
+            on_load_more=self.load_more_results,
             fg_color=("gray95", "gray15"),
             corner_radius=12 # ✅ Réduit
         )
         self.results_list.pack(fill="both", expand=True)
+        self.empty_frame = self.create_empty_state(self.results_list)
       
         # Liaison des événements
         self.filename_entry.bind('<KeyRelease>', lambda e: self.auto_search())
@@ -251,155 +282,205 @@ class SearchWindow:
   
     def auto_search(self):
         """Recherche automatique lors de la saisie"""
-        # Petite temporisation pour éviter trop de recherches
-        self.root.after(300, self.search_files)
+        # Temporisation : chaque frappe annule la recherche en attente
+        self.current_criteria = self.get_criteria()
+        self.search_controller.schedule(self.current_criteria)
   
     def search_files(self):
         """Effectuer la recherche avec les critères actuels"""
-        try:
-            # Récupérer les critères
-            filename = self.filename_entry.get().strip()
-            extension_type = self.extension_combo.get()
-          
-            # Convertir le type en extension
-            extension_map = {
-                "Tous": "",
-                "PDF": "pdf",
-                "Word": "docx",
-                "Excel": "xlsx",
-                "Texte": "txt",
-                "Image": "png"
-            }
-          
-            extension = extension_map.get(extension_type, "")
-          
-            # Effectuer la recherche
-            results = self.db.search_files(
-                filename=filename,
-                extension=extension
+        self.current_criteria = self.get_criteria()
+        self.search_controller.search_now(self.current_criteria)
+  
+    def get_criteria(self) -> Dict[str, Any]:
+        """Lire les critères de recherche (thread Tk)"""
+        extension_type = self.extension_combo.get()
+      
+        # Convertir le type en extension
+        extension_map = {
+            "Tous": "",
+            "PDF": "pdf",
+            "Word": "docx",
+            "Excel": "xlsx",
+            "Texte": "txt",
+            "Image": "png"
+        }
+      
+        return {
+            'filename': self.filename_entry.get().strip(),
+            'extension': extension_map.get(extension_type, ""),
+            'content': self.content_search_var.get(),
+            'offset': 0
+        }
+  
+    def run_search(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
+        """Exécuter la recherche d'une page (thread worker, aucun accès aux widgets)"""
+        # Une ligne de plus pour savoir s'il reste des résultats
+        limit = self.PAGE_SIZE + 1
+        content = bool(criteria['content'] and criteria['filename'])
+      
+        if content:
+            files = self.db.search_content(
+                criteria['filename'], extension=criteria['extension'],
+                limit=limit, offset=criteria['offset']
             )
-          
-            # Afficher les résultats
-            self.display_results(results)
-          
-        except Exception as e:
-            messagebox.showerror("Erreur", f"❌ Erreur lors de la recherche:\n{e}")
-            print(f"Erreur recherche: {e}")
+        else:
+            files = self.db.search_files(
+                filename=criteria['filename'],
+                extension=criteria['extension'],
+                limit=limit,
+                offset=criteria['offset']
+            )
+      
+        has_more = len(files) > self.PAGE_SIZE
+        files = files[:self.PAGE_SIZE]
+      
+        # Noms des dossiers de la page en une requête
+        folder_names = self.db.get_folder_names([file['folder_id'] for file in files])
+        for file in files:
+            file['folder_name'] = folder_names.get(file['folder_id'])
+      
+        return {'offset': criteria['offset'], 'files': files, 'has_more': has_more, 'content': content}
+  
+    def show_searching(self):
+        """Indiquer qu'une recherche est en cours"""
+        self.results_label.configure(text="⏳ Recherche en cours...")
+  
+    def on_search_error(self, error: Exception):
+        """Afficher une erreur de recherche"""
+        # Une page suivante en échec doit pouvoir être redemandée
+        self.results_list.load_failed()
+        messagebox.showerror("Erreur", f"❌ Erreur lors de la recherche:\n{error}")
+        print(f"Erreur recherche: {error}")
+  
+    def on_destroy(self, event):
+        """Arrêter les recherches à la fermeture de la fenêtre"""
+        if event.widget is self.root:
+            self.search_controller.close()
   
-    def display_results(self, files: List[Dict[str, Any]]):
-        """Afficher les résultats de la recherche"""
-        # Nettoyer
-        for widget in self.results_list.winfo_children():
-            widget.destroy()
+    def display_results(self, result: Dict[str, Any]):
+        """Afficher une page de résultats (la première remplace la liste, les suivantes s'ajoutent)"""
+        files = result['files']
+      
+        if result['offset'] == 0:
+            # Lignes plus hautes pour afficher l'extrait du contenu
+            self.results_list.row_height = 101 if result['content'] else 81
+            self.results_list.set_items(files, result['has_more'])
+        else:
+            self.results_list.append_items(files, result['has_more'])
       
         # Mettre à jour le compteur
-        count = len(files)
-        self.results_label.configure(text=f"🔍 Résultats - {count} fichier(s)")
+        count = len(self.results_list.items)
+        more = "+" if result['has_more'] else ""
+        self.results_label.configure(text=f"🔍 Résultats - {count}{more} fichier(s)")
       
         if count == 0:
-            # Message d'état vide compact
-            empty_frame = ctk.CTkFrame(self.results_list, fg_color="transparent")
-            empty_frame.pack(expand=True, pady=50)
-          
-            ctk.CTkLabel(
-                empty_frame,
-                text="📭",
-                font=ctk.CTkFont(size=60) # ✅ Réduit
-            ).pack()
-          
-            ctk.CTkLabel(
-                empty_frame,
-                text="Aucun fichier trouvé",
-                font=ctk.CTkFont(size=16, weight="bold"), # ✅ Réduit
-                text_color=("gray50", "gray60")
-            ).pack(pady=(10, 5))
-          
-            ctk.CTkLabel(
-                empty_frame,
-                text="Modifiez vos critères de recherche",
-                font=ctk.CTkFont(size=12), # ✅ Réduit
-                text_color=("gray50", "gray60")
-            ).pack()
-            return
+            # Message d'état vide compact, par-dessus la liste
+            self.empty_frame.place(relx=0.5, rely=0.4, anchor="center")
+        else:
+            self.empty_frame.place_forget()
+  
+    def load_more_results(self):
+        """Charger la page de résultats suivante (fin de liste atteinte)"""
+        criteria = dict(self.current_criteria, offset=len(self.results_list.items))
+        self.search_controller.search_now(criteria)
+  
+    def create_empty_state(self, parent) -> ctk.CTkFrame:
+        """Créer le message affiché quand aucun fichier ne correspond"""
+        empty_frame = ctk.CTkFrame(parent, fg_color="transparent")
       
-        # Afficher chaque fichier avec hauteur réduite
-        for file in files:
-            self.create_file_result_card(file)
+        ctk.CTkLabel(
+            empty_frame,
+            text="📭",
+            font=ctk.CTkFont(size=60) # ✅ Réduit
+        ).pack()
+      
+        ctk.CTkLabel(
+            empty_frame,
+            text="Aucun fichier trouvé",
+            font=ctk.CTkFont(size=16, weight="bold"), # ✅ Réduit
+            text_color=("gray50", "gray60")
+        ).pack(pady=(10, 5))
+      
+        ctk.CTkLabel(
+            empty_frame,
+            text="Modifiez vos critères de recherche",
+            font=ctk.CTkFont(size=12), # ✅ Réduit
+            text_color=("gray50", "gray60")
+        ).pack()
+        return empty_frame
   
-    def create_file_result_card(self, file: Dict[str, Any]):
-        """Créer une carte de résultat compacte pour un fichier"""
-        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
-        icon = self.file_handler.get_file_icon(extension)
-        is_pdf = self.file_handler.is_pdf(file['filename'])
+    def create_result_row(self, parent) -> ctk.CTkFrame:
+        """Créer une ligne de résultat vide (recyclée par la liste virtualisée)"""
+        row = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0)
+        row.file = None
       
         # Frame de la carte - HAUTEUR RÉDUITE
         card = ctk.CTkFrame(
-            self.results_list,
-            height=75, # ✅ Réduit de 90 à 75
+            row,
             fg_color=("white", "gray20"),
             corner_radius=8, # ✅ Réduit
             border_width=1,
             border_color=("gray80", "gray40")
         )
-        card.pack(fill="x", pady=3, padx=5) # ✅ Padding réduit
-        card.pack_propagate(False)
+        card.pack(fill="both", expand=True, pady=3, padx=5) # ✅ Padding réduit
       
         # Icône compacte
-        icon_label = ctk.CTkLabel(
+        row.icon_label = ctk.CTkLabel(
             card,
-            text=icon,
+            text="",
             font=ctk.CTkFont(size=28), # ✅ Réduit de 32
             width=65 # ✅ Réduit
         )
-        icon_label.pack(side="left", padx=12) # ✅ Padding réduit
+        row.icon_label.pack(side="left", padx=12) # ✅ Padding réduit
       
         # Informations du fichier
         info_frame = ctk.CTkFrame(card, fg_color="transparent")
         info_frame.pack(side="left", fill="both", expand=True, padx=8, pady=10) # ✅ Padding réduit
       
-        # Nom du fichier - une seule ligne avec ellipsis si trop long
-        name_label = ctk.CTkLabel(
+        # Nom du fichier - une seule ligne
+        row.name_label = ctk.CTkLabel(
             info_frame,
-            text=file['filename'],
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"), # ✅ Réduit
             anchor="w"
         )
-        name_label.pack(fill="x")
+        row.name_label.pack(fill="x")
       
         # Dossier parent et type sur la même ligne
-        folder = self.db.get_folder(file['folder_id'])
-        folder_name = folder['name'] if folder else "Dossier supprimé"
-      
-        type_indicator = "🔒 PDF" if is_pdf else "💾 DOCX/XLSX"
-      
-        meta_text = f"📁 {folder_name[:30]}{'...' if len(folder_name) > 30 else ''} • {type_indicator}"
-      
-        meta_label = ctk.CTkLabel(
+        row.meta_label = ctk.CTkLabel(
             info_frame,
-            text=meta_text,
+            text="",
             font=ctk.CTkFont(size=10), # ✅ Réduit
             text_color=("gray50", "gray60"),
             anchor="w"
         )
-        meta_label.pack(fill="x")
+        row.meta_label.pack(fill="x")
+      
+        # Extrait du contenu (termes trouvés entre « »), affiché seulement si présent
+        row.snippet_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=ctk.CTkFont(size=10, slant="italic"),
+            text_color=("#1f538d", "#5aa9ff"),
+            anchor="w"
+        )
       
         # Boutons d'action compacts
         button_frame = ctk.CTkFrame(card, fg_color="transparent")
         button_frame.pack(side="right", padx=10) # ✅ Padding réduit
       
         # Bouton Ouvrir compact
-        action_text = "👁️ Voir" if is_pdf else "📥 Télécharger" # ✅ Texte raccourci
-        open_btn = ctk.CTkButton(
+        row.open_btn = ctk.CTkButton(
             button_frame,
-            text=action_text,
+            text="",
             width=80, # ✅ Réduit de 100
             height=28, # ✅ Réduit de 35
             font=ctk.CTkFont(size=11, weight="bold"), # ✅ Réduit
             fg_color=("#1f538d", "#14375e"),
             hover_color=("#2563a8", "#1a4a7a"),
-            command=lambda f=file: self.open_file(f) if is_pdf else self.download_file(f)
+            command=lambda r=row: self.open_or_download(r.file)
         )
-        open_btn.pack(side="left", padx=3) # ✅ Padding réduit
+        row.open_btn.pack(side="left", padx=3) # ✅ Padding réduit
       
         # Bouton Localiser compact
         locate_btn = ctk.CTkButton(
@@ -410,12 +491,12 @@ class SearchWindow:
             font=ctk.CTkFont(size=13, weight="bold"),
             fg_color=("#28a745", "#1e7e34"),
             hover_color=("#32b349", "#229143"),
-            command=lambda f=file: self.locate_file(f)
+            command=lambda r=row: self.locate_file(r.file)
         )
         locate_btn.pack(side="left", padx=3)
       
         # Double-clic pour ouvrir
-        card.bind('<Double-Button-1>', lambda e, f=file: self.open_file(f) if is_pdf else self.download_file(f))
+        card.bind('<Double-Button-1>', lambda e, r=row: self.open_or_download(r.file))
       
         # Hover effect
         def on_enter(e):
@@ -426,6 +507,40 @@ class SearchWindow:
       
         card.bind('<Enter>', on_enter)
         card.bind('<Leave>', on_leave)
+        return row
+  
+    def update_result_row(self, row: ctk.CTkFrame, file: Dict[str, Any]):
+        """Afficher un fichier dans une ligne recyclée"""
+        row.file = file
+        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
+        is_pdf = self.file_handler.is_pdf(file['filename'])
+      
+        row.icon_label.configure(text=self.file_handler.get_file_icon(extension))
+        row.name_label.configure(text=file['filename'])
+      
+        folder_name = file.get('folder_name') or "Dossier supprimé"
+        type_indicator = "🔒 PDF" if is_pdf else "💾 DOCX/XLSX"
+        row.meta_label.configure(
+            text=f"📁 {folder_name[:30]}{'...' if len(folder_name) > 30 else ''} • {type_indicator}"
+        )
+      
+        snippet = file.get('snippet')
+        if snippet:
+            row.snippet_label.configure(text=" ".join(snippet.split()))
+            row.snippet_label.pack(fill="x")
+        else:
+            row.snippet_label.pack_forget()
+      
+        row.open_btn.configure(text="👁️ Voir" if is_pdf else "📥 Télécharger") # ✅ Texte raccourci
+  
+    def open_or_download(self, file: Optional[Dict[str, Any]]):
+        """Voir un PDF, télécharger les autres fichiers"""
+        if not file:
+            return
+        if self.file_handler.is_pdf(file['filename']):
+            self.open_file(file)
+        else:
+            self.download_file(file)
   
     def open_file(self, file: Dict[str, Any]):
         """Ouvrir un fichier avec le bon viewer"""
@@ -440,7 +555,7 @@ class SearchWindow:
             try:
                 from .pdf_viewer import PDFViewer
                 pdf_window = ctk.CTkToplevel(self.root)
-                PDFViewer(pdf_window, file['filepath'], file['filename'])
+                PDFViewer(pdf_window, file['filepath'], file['filename'], file.get('file_hash'))
             except Exception as e:
                 messagebox.showerror("Erreur", f"❌ Impossible d'ouvrir le PDF:\n{e}")
         else:
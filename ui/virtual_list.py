@@ -0,0 +1,221 @@
+import tkinter as tk
+import customtkinter as ctk
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, List, Optional, Union
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Liste virtualisée : seules les lignes visibles (plus une marge) existent en widgets
+
+    Les lignes sont créées une fois puis recyclées pendant le défilement : le
+    nombre de widgets dépend de la hauteur de la fenêtre, pas du nombre d'éléments.
+    Les hauteurs de ligne peuvent varier (titres, rangées de cartes...) : leurs
+    positions sont précalculées et les widgets sont recyclés par type de ligne.
+    """
+
+    def __init__(self, master, row_height: Union[int, Callable[[Any], int]],
+                 create_row: Callable[..., tk.Misc],
+                 update_row: Callable[[tk.Misc, Any], None],
+                 on_load_more: Optional[Callable[[], None]] = None,
+                 row_kind: Optional[Callable[[Any], str]] = None,
+                 overscan: int = 3,
+                 **kwargs):
+        """
+        Args:
+            master: Widget parent
+            row_height: Hauteur d'une ligne (pixels, espacement compris) ou fonction élément -> hauteur
+            create_row: Fonction parent -> widget de ligne vide (parent, type) si row_kind est fourni
+            update_row: Fonction (widget, élément) affichant un élément dans une ligne recyclée
+            on_load_more: Appelée quand la fin de la liste approche et que d'autres éléments existent
+            row_kind: Fonction élément -> type de ligne (un lot de widgets recyclés par type)
+            overscan: Lignes construites en plus au-dessus et au-dessous de la zone visible
+        """
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.update_row = update_row
+        self.on_load_more = on_load_more
+        self.row_kind = row_kind
+        self.overscan = overscan
+
+        self.items: List[Any] = []
+        self.has_more = False
+        self._loading = False
+        self._offsets = [0]      # position verticale de chaque ligne (+ hauteur totale)
+        self._bound = {}         # index de l'élément -> (widget, id de la fenêtre canvas, type)
+        self._free = {}          # type -> [(widget, id de la fenêtre canvas)] disponibles
+        self._scrollregion = None
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=self._canvas_color(),
+                                yscrollincrement=max(1, self._height_of(None) // 2))
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind('<Configure>', lambda e: self.refresh())
+        self.bind('<Enter>', self._bind_mousewheel)
+        self.bind('<Leave>', self._unbind_mousewheel)
+
+    # ==================== DONNÉES ====================
+
+    def set_items(self, items: List[Any], has_more: bool = False):
+        """Remplacer le contenu de la liste"""
+        self.items = list(items)
+        self.has_more = has_more
+        self._loading = False
+        self._release_all()
+        self._offsets = [0]
+        self._extend_offsets(self.items)
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def append_items(self, items: List[Any], has_more: bool = False):
+        """Ajouter une page d'éléments (chargement progressif)"""
+        self.items.extend(items)
+        self.has_more = has_more
+        self._loading = False
+        self._extend_offsets(items)
+        self.refresh()
+
+    def load_failed(self):
+        """Signaler l'échec du chargement de la page suivante (nouvel essai au prochain défilement)"""
+        self._loading = False
+
+    def refresh_items(self):
+        """Réafficher les lignes visibles (éléments modifiés sur place)"""
+        self._release_all()
+        self.refresh()
+
+    def refresh_item(self, index: int):
+        """Réafficher un seul élément s'il a une ligne construite"""
+        entry = self._bound.get(index)
+        if entry is not None:
+            self.update_row(entry[0], self.items[index])
+
+    def see(self, index: int):
+        """Faire défiler la liste jusqu'à un élément s'il n'est pas entièrement visible"""
+        if not 0 <= index < len(self.items):
+            return
+        height = self.canvas.winfo_height()
+        total = max(self._offsets[-1], height)
+        top = self.canvas.canvasy(0)
+        start, end = self._offsets[index], self._offsets[index + 1]
+        if start < top:
+            self.canvas.yview_moveto(start / total)
+        elif end > top + height:
+            self.canvas.yview_moveto((end - height) / total)
+
+    # ==================== AFFICHAGE ====================
+
+    def refresh(self):
+        """Positionner les lignes recyclées sur les éléments visibles"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+
+        # Ne reconfigurer que si nécessaire (chaque changement relance yscrollcommand)
+        scrollregion = (0, 0, width, max(self._offsets[-1], height))
+        if scrollregion != self._scrollregion:
+            self._scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+
+        # Lignes visibles par recherche dichotomique dans les positions précalculées
+        count = len(self.items)
+        top = int(self.canvas.canvasy(0))
+        first = max(0, bisect_right(self._offsets, top) - 1 - self.overscan)
+        last = min(count, bisect_left(self._offsets, top + height) + self.overscan)
+
+        # Libérer les lignes sorties de la zone visible
+        for index in [i for i in self._bound if i < first or i >= last]:
+            self._release(index)
+
+        for index in range(first, last):
+            item = self.items[index]
+            entry = self._bound.get(index)
+            if entry is None:
+                kind = self.row_kind(item) if self.row_kind else None
+                pool = self._free.setdefault(kind, [])
+                if pool:
+                    widget, window_id = pool.pop()
+                else:
+                    widget = self.create_row(self.canvas, kind) if self.row_kind else self.create_row(self.canvas)
+                    window_id = self.canvas.create_window(0, -10000, window=widget, anchor="nw")
+                self.update_row(widget, item)
+                entry = self._bound[index] = (widget, window_id, kind)
+
+            self.canvas.coords(entry[1], 0, self._offsets[index])
+            self.canvas.itemconfigure(entry[1], width=width, height=self._offsets[index + 1] - self._offsets[index])
+
+        # Fin de liste proche : demander la page suivante
+        if (self.on_load_more and self.has_more and not self._loading
+                and last >= count - self.overscan):
+            self._loading = True
+            self.on_load_more()
+
+    def _height_of(self, item: Any) -> int:
+        """Hauteur d'une ligne"""
+        if callable(self.row_height):
+            return self.row_height(item) if item is not None else 40
+        return self.row_height
+
+    def _extend_offsets(self, items: List[Any]):
+        """Précalculer la position des nouvelles lignes"""
+        position = self._offsets[-1]
+        for item in items:
+            position += self._height_of(item)
+            self._offsets.append(position)
+
+    def _release(self, index: int):
+        """Rendre une ligne disponible pour un autre élément (sortie de la zone visible)"""
+        widget, window_id, kind = self._bound.pop(index)
+        self.canvas.coords(window_id, 0, -10000)
+        self._free.setdefault(kind, []).append((widget, window_id))
+
+    def _release_all(self):
+        """Libérer toutes les lignes affichées"""
+        for index in list(self._bound):
+            self._release(index)
+
+    def _on_scroll(self, first, last):
+        """Synchroniser la barre de défilement et recycler les lignes"""
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _canvas_color(self) -> str:
+        """Couleur de fond du canvas selon le thème"""
+        color = self._fg_color if self._fg_color != "transparent" else self._bg_color
+        return self._apply_appearance_mode(color)
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self.canvas.configure(bg=self._canvas_color())
+
+    # ==================== MOLETTE ====================
+
+    def _bind_mousewheel(self, event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event=None):
+        # <Leave> est aussi reçu en entrant dans une ligne : ignorer tant que le pointeur reste dans la liste
+        widget = self.winfo_containing(*self.winfo_pointerxy())
+        if widget is not None and str(widget).startswith(str(self)):
+            return
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_mousewheel(self, event):
+        """Défiler avec la molette (Windows/macOS : delta, Linux : boutons 4/5)"""
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = int(-1 * (event.delta / 120)) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(step, "units")
@@ -2,6 +2,11 @@
 Package Utils pour l'application Portail Document
 """
 
+from .blob_store import BlobStore
+from .content_indexer import ContentIndexer
 from .file_handler import FileHandler
+from .import_engine import ImportEngine
+from .integrity_checker import IntegrityChecker
+from .page_cache import PageCache
 
-__all__ = ['FileHandler']
\ No newline at end of file
+__all__ = ['BlobStore', 'ContentIndexer', 'FileHandler', 'ImportEngine', 'IntegrityChecker', 'PageCache']
\ No newline at end of file
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+from typing import Callable, Optional, Tuple
+
+from .hashing import hash_file, new_hasher, read_buffer
+
+
+class BlobStore:
+    """
+    Stockage adressé par contenu : un fichier physique par (hash SHA-256, extension)
+
+    L'extension fait partie de la clé : les fichiers sont ouverts par leur blob,
+    un .docx ne doit pas pointer vers le blob .pdf d'un contenu identique.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def extension(filename: str) -> str:
+        """Extension d'un nom de fichier ou d'un blob, en minuscules ('' si aucune)"""
+        return os.path.splitext(filename)[1].lower()
+
+    def blob_path(self, file_hash: str, filename: str) -> str:
+        """Chemin du blob pour un hash (l'extension est conservée pour les applications externes)"""
+        return os.path.join(self.root_dir, file_hash[:2], f"{file_hash}{self.extension(filename)}")
+
+    def store(self, source_path: str, filename: str,
+              find_blob: Callable[[str, str], Optional[str]] = None,
+              size_exists: Callable[[int], bool] = None) -> Tuple[str, int, str, bool]:
+        """
+        Enregistrer un fichier dans le stockage, sans copie si son contenu existe déjà
+
+        Si aucun blob de même taille n'existe, le fichier est copié et hashé en une
+        seule lecture. Sinon il est d'abord hashé pour éviter une copie inutile.
+
+        Args:
+            source_path: Chemin du fichier source
+            filename: Nom du fichier (pour l'extension du blob)
+            find_blob: Fonction (hash, extension) -> chemin du blob existant (ou None)
+            size_exists: Fonction taille -> True si un blob de cette taille existe
+
+        Returns:
+            Tuple (chemin du blob, taille, hash SHA-256, copie effectuée)
+        """
+        file_size = os.path.getsize(source_path)
+
+        if size_exists is not None and size_exists(file_size):
+            file_hash = self.hash_file(source_path)
+            existing = find_blob(file_hash, self.extension(filename)) if find_blob else None
+            if existing and os.path.exists(existing):
+                return existing, file_size, file_hash, False
+
+            blob_path = self.blob_path(file_hash, filename)
+            if os.path.exists(blob_path):
+                return blob_path, file_size, file_hash, False
+
+            temp_path = self._temp_path()
+            self._copy_to_temp(source_path, temp_path)
+            return self._commit_blob(temp_path, blob_path), file_size, file_hash, True
+
+        # Contenu forcément nouveau en base : copie + hash en une passe
+        temp_path = self._temp_path()
+        file_size, file_hash = self._copy_to_temp(source_path, temp_path)
+
+        existing = find_blob(file_hash, self.extension(filename)) if find_blob else None
+        if existing and os.path.exists(existing):
+            os.remove(temp_path)
+            return existing, file_size, file_hash, False
+
+        blob_path = self.blob_path(file_hash, filename)
+        return self._commit_blob(temp_path, blob_path), file_size, file_hash, True
+
+    def _temp_path(self) -> str:
+        """Créer un fichier temporaire dans le stockage (même volume pour un renommage atomique)"""
+        fd, temp_path = tempfile.mkstemp(prefix=".incoming-", dir=self.root_dir)
+        os.close(fd)
+        return temp_path
+
+    def _copy_to_temp(self, source_path: str, temp_path: str) -> Tuple[int, str]:
+        """Copier vers le fichier temporaire, supprimé si la copie échoue (aucun fichier orphelin)"""
+        try:
+            return self.copy_with_hash(source_path, temp_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _commit_blob(self, temp_path: str, blob_path: str) -> str:
+        """Déplacer atomiquement un fichier temporaire vers son blob"""
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            # Même contenu déjà écrit (import concurrent)
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, blob_path)
+        return blob_path
+
+    @classmethod
+    def copy_with_hash(cls, source_path: str, dest_path: str) -> Tuple[int, str]:
+        """
+        Copier un fichier en calculant son SHA-256 au passage (chaque octet lu une seule fois)
+
+        Returns:
+            Tuple (taille en octets, hash SHA-256 hexadécimal)
+        """
+        hash_sha256 = new_hasher()
+        file_size = 0
+        view = read_buffer()
+
+        with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            while True:
+                read = src.readinto(view)
+                if not read:
+                    break
+                chunk = view[:read]
+                hash_sha256.update(chunk)
+                dst.write(chunk)
+                file_size += read
+
+        shutil.copystat(source_path, dest_path)
+        return file_size, hash_sha256.hexdigest()
+
+    @classmethod
+    def hash_file(cls, filepath: str) -> str:
+        """Calculer le SHA-256 d'un fichier"""
+        return hash_file(filepath)
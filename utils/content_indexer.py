@@ -0,0 +1,171 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional, Tuple
+
+# Texte conservé par document (borne la taille de l'index)
+MAX_CONTENT_CHARS = 1_000_000
+
+
+def extract_text(filepath: str) -> Tuple[str, str]:
+    """
+    Extraire le texte d'un document PDF, DOCX ou XLSX (exécuté dans un processus worker)
+
+    Returns:
+        Tuple (statut 'done' | 'empty' | 'unsupported' | 'error', texte)
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    try:
+        if ext == '.pdf':
+            import fitz  # PyMuPDF
+            parts = []
+            with fitz.open(filepath) as doc:
+                for page in doc:
+                    parts.append(page.get_text())
+        elif ext == '.docx':
+            from docx import Document
+            doc = Document(filepath)
+            parts = [para.text for para in doc.paragraphs]
+            for table in doc.tables:
+                for row in table.rows:
+                    parts.extend(cell.text for cell in row.cells)
+        elif ext == '.xlsx':
+            import openpyxl
+            wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+            parts = []
+            try:
+                for sheet in wb.worksheets:
+                    for row in sheet.iter_rows(values_only=True):
+                        parts.extend(str(value) for value in row if value is not None)
+            finally:
+                wb.close()
+        else:
+            return 'unsupported', ''
+    except ImportError:
+        return 'unsupported', ''
+    except Exception as e:
+        print(f"⚠️ Extraction impossible pour {filepath}: {e}")
+        return 'error', ''
+
+    text = "\n".join(part for part in parts if part and part.strip())[:MAX_CONTENT_CHARS]
+    return ('done', text) if text else ('empty', '')
+
+
+class ContentIndexer:
+    """Indexation du contenu des documents en arrière-plan (une extraction par file_hash)"""
+
+    # Intervalle entre deux recherches de documents à indexer (secondes)
+    IDLE_INTERVAL = 60
+
+    def __init__(self, db, max_workers: Optional[int] = None, batch_size: int = 20):
+        self.db = db
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.batch_size = batch_size
+
+        # Événements (type, valeur, total) consommés par l'UI via after()
+        self.progress_queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+
+    def run_once(self, progress_callback: Callable = None) -> int:
+        """
+        Indexer tous les documents en attente (bloquant)
+
+        L'état est enregistré en base après chaque lot : une indexation
+        interrompue reprend là où elle s'était arrêtée.
+
+        Returns:
+            Nombre de documents traités
+        """
+        self.db.purge_orphan_content()
+        processed = 0
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stop_event.is_set():
+                pending = self.db.get_pending_content(limit=self.batch_size * self.max_workers)
+                if not pending:
+                    break
+
+                futures = {executor.submit(extract_text, filepath): file_hash
+                           for file_hash, filepath in pending}
+                rows = []
+
+                for future in as_completed(futures):
+                    file_hash = futures[future]
+                    try:
+                        status, text = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Extraction interrompue ({e})")
+                        status, text = 'error', ''
+                    rows.append((file_hash, status, text))
+
+                    if len(rows) >= self.batch_size:
+                        processed += self.db.save_document_contents(rows)
+                        rows = []
+                        self._report(processed, progress_callback)
+
+                    if self._stop_event.is_set():
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        break
+
+                if rows:
+                    processed += self.db.save_document_contents(rows)
+                    self._report(processed, progress_callback)
+
+        if processed:
+            print(f"✅ Contenu indexé: {processed} document(s)")
+        return processed
+
+    def start(self):
+        """Lancer l'indexation continue dans un thread d'arrière-plan"""
+        if self.is_running():
+            return
+
+        def target():
+            try:
+                while not self._stop_event.is_set():
+                    self.run_once()
+                    self._wake_event.wait(self.IDLE_INTERVAL)
+                    self._wake_event.clear()
+            except Exception as e:
+                print(f"❌ Erreur lors de l'indexation du contenu: {e}")
+                self.progress_queue.put(('error', str(e), None))
+            finally:
+                self.db.release_connection()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=target, name="content-indexer", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Relancer immédiatement une passe d'indexation (après un import par exemple)"""
+        self._wake_event.set()
+
+    def stop(self):
+        """Arrêter l'indexation (le lot en cours est enregistré)"""
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def is_running(self) -> bool:
+        """Vérifier si l'indexation d'arrière-plan est active"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attendre la fin du thread d'arrière-plan (après stop)
+
+        Returns:
+            True si le thread est terminé (ou n'a jamais démarré)
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def _report(self, processed: int, progress_callback: Callable = None):
+        """Publier un événement de progression"""
+        self.progress_queue.put(('progress', processed, None))
+        if progress_callback:
+            progress_callback(processed)
@@ -6,6 +6,8 @@ from typing import Tuple, Optional
 from pathlib import Path
 from tkinter import filedialog
 import tkinter.messagebox as messagebox
+from .blob_store import BlobStore
+from .import_engine import ImportEngine
 
 class FileHandler:
     """Gestionnaire de fichiers avec support complet de l'arborescence et des panels"""
@@ -27,6 +29,7 @@ class FileHandler:
     def __init__(self, upload_dir: str = "uploads"):
         self.upload_dir = upload_dir
         self.ensure_upload_directory()
+        self.blob_store = BlobStore(os.path.join(self.upload_dir, "blobs"))
   
     def ensure_upload_directory(self):
         """S'assurer que le répertoire d'upload existe"""
@@ -79,51 +82,36 @@ class FileHandler:
             print(f"❌ Erreur lors du comptage des fichiers: {e}")
             return 0
   
-    def save_file(self, source_path: str, filename: str, subfolder: str = "") -> Tuple[bool, str]:
+    def store_file(self, source_path: str, filename: str, db) -> Tuple[bool, str, int, str]:
         """
-        Enregistrer un fichier dans le répertoire d'upload
+        Enregistrer un fichier dans le stockage dédupliqué (aucune copie si le contenu existe déjà)
       
         Args:
             source_path: Chemin source du fichier
             filename: Nom du fichier
-            subfolder: Sous-dossier optionnel
+            db: Instance de la base de données (index des blobs)
           
         Returns:
-            Tuple (succès, chemin_destination)
+            Tuple (succès, chemin du blob, taille, hash SHA-256)
         """
         try:
-            # Vérifier que le fichier source existe
             if not os.path.exists(source_path):
                 print(f"❌ Fichier source introuvable: {source_path}")
-                return False, ""
+                return False, "", 0, ""
           
-            # Créer le chemin de destination
-            if subfolder:
-                dest_dir = os.path.join(self.upload_dir, subfolder)
-                os.makedirs(dest_dir, exist_ok=True)
+            blob_path, file_size, file_hash, copied = self.blob_store.store(
+                source_path, filename, db.get_blob_path, db.has_blob_with_size
+            )
+            if copied:
+                print(f"✅ Fichier copié: {filename} -> {blob_path}")
             else:
-                dest_dir = self.upload_dir
-          
-            dest_path = os.path.join(dest_dir, filename)
-          
-            # Gérer les doublons
-            if os.path.exists(dest_path):
-                base, ext = os.path.splitext(filename)
-                counter = 1
-                while os.path.exists(os.path.join(dest_dir, f"{base}_{counter}{ext}")):
-                    counter += 1
-                filename = f"{base}_{counter}{ext}"
-                dest_path = os.path.join(dest_dir, filename)
-          
-            # Copier le fichier
-            shutil.copy2(source_path, dest_path)
-            print(f"✅ Fichier copié: {filename} -> {dest_path}")
+                print(f"♻️ Contenu déjà présent, aucune copie: {filename}")
           
-            return True, dest_path
+            return True, blob_path, file_size, file_hash
           
         except Exception as e:
             print(f"❌ Erreur lors de la copie du fichier {filename}: {e}")
-            return False, ""
+            return False, "", 0, ""
   
     def save_files_from_folder(self, folder_path: str, db, parent_folder_id: Optional[int] = None) -> int:
         """
@@ -144,10 +132,14 @@ class FileHandler:
                                           parent_folder_id: Optional[int] = None,
                                           panel: str = 'interface_emp',
                                           progress_callback=None,
-                                          total: int = 0) -> int:
+                                          total: int = 0,
+                                          batch_size: int = 500) -> int:
         """
         Importer un dossier complet avec TOUS ses fichiers et sous-dossiers dans un panel spécifique
       
+        Délègue à ImportEngine : arborescence créée en une transaction, copie et
+        hash SHA-256 en parallèle, fichiers enregistrés par lots.
+      
         Args:
             folder_path: Chemin du dossier à importer
             db: Instance de la base de données
@@ -155,149 +147,25 @@ class FileHandler:
             panel: Panel cible pour l'import
             progress_callback: Fonction de callback pour la progression (current, total)
             total: Nombre total de fichiers (pour la progression)
+            batch_size: Nombre de fichiers enregistrés par lot en base
           
         Returns:
             Nombre total de fichiers importés
         """
-        total_files = 0
-        current_progress = [0] # Liste mutable pour partager entre fonctions récursives
+        def on_progress(current, scanned_total):
+            # Total inconnu de l'appelant : celui du parcours en cours
+            if progress_callback and (total or scanned_total):
+                progress_callback(current, total or scanned_total)
       
         try:
-            folder_name = os.path.basename(folder_path)
-            print(f"\n📁 Importation du dossier: {folder_name} dans panel {panel}")
-          
-            # Créer le dossier dans la base de données avec le panel
-            current_folder_id = db.create_folder(folder_name, parent_folder_id, panel)
-            print(f" ✅ Dossier créé en BDD (ID: {current_folder_id}, Panel: {panel})")
-          
-            # Lister tous les éléments du dossier
-            items = os.listdir(folder_path)
-          
-            # Traiter les fichiers
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-              
-                if os.path.isfile(item_path):
-                    # C'est un fichier
-                    if self.is_allowed_file(item):
-                        print(f" 📄 Importation du fichier: {item}")
-                      
-                        # Copier le fichier physiquement
-                        success, dest_path = self.save_file(item_path, item, folder_name)
-                      
-                        if success:
-                            # Enregistrer dans la base de données
-                            db.add_file(current_folder_id, item, dest_path)
-                            total_files += 1
-                            current_progress[0] += 1
-                          
-                            # Appeler le callback de progression
-                            if progress_callback and total > 0:
-                                progress_callback(current_progress[0], total)
-                          
-                            print(f" ✅ Fichier importé avec succès ({current_progress[0]}/{total})")
-                        else:
-                            print(f" ❌ Échec de l'importation du fichier")
-                    else:
-                        print(f" ⚠️ Fichier ignoré (extension non autorisée): {item}")
-          
-            # Traiter les sous-dossiers récursivement
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-              
-                if os.path.isdir(item_path):
-                    # C'est un sous-dossier, traiter récursivement
-                    print(f" 📂 Sous-dossier détecté: {item}")
-                    sub_count = self._import_subfolder_recursive(
-                        item_path,
-                        db,
-                        current_folder_id,
-                        panel,
-                        progress_callback,
-                        total,
-                        current_progress
-                    )
-                    total_files += sub_count
-          
-            print(f"✅ Dossier '{folder_name}' importé: {total_files} fichier(s)")
-            return total_files
+            engine = ImportEngine(self, db, batch_size=batch_size)
+            return engine.run(folder_path, parent_folder_id, panel, progress_callback=on_progress)
           
         except Exception as e:
             print(f"❌ Erreur lors de l'importation du dossier: {e}")
             import traceback
             traceback.print_exc()
-            return total_files
-  
-    def _import_subfolder_recursive(self, folder_path: str, db,
-                                   parent_folder_id: int,
-                                   panel: str,
-                                   progress_callback,
-                                   total: int,
-                                   current_progress: list) -> int:
-        """
-        Fonction auxiliaire pour importer récursivement un sous-dossier
-      
-        Args:
-            folder_path: Chemin du dossier
-            db: Instance BDD
-            parent_folder_id: ID du parent
-            panel: Panel
-            progress_callback: Callback de progression
-            total: Total de fichiers
-            current_progress: Liste mutable [count] pour partager la progression
-          
-        Returns:
-            Nombre de fichiers importés
-        """
-        total_files = 0
-      
-        try:
-            folder_name = os.path.basename(folder_path)
-          
-            # Créer le sous-dossier
-            current_folder_id = db.create_folder(folder_name, parent_folder_id, panel)
-          
-            # Lister les éléments
-            items = os.listdir(folder_path)
-          
-            # Traiter les fichiers
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-              
-                if os.path.isfile(item_path):
-                    if self.is_allowed_file(item):
-                        success, dest_path = self.save_file(item_path, item, folder_name)
-                      
-                        if success:
-                            db.add_file(current_folder_id, item, dest_path)
-                            total_files += 1
-                            current_progress[0] += 1
-                          
-                            # Callback de progression
-                            if progress_callback and total > 0:
-                                progress_callback(current_progress[0], total)
-          
-            # Traiter les sous-dossiers récursivement
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-              
-                if os.path.isdir(item_path):
-                    sub_count = self._import_subfolder_recursive(
-                        item_path,
-                        db,
-                        current_folder_id,
-                        panel,
-                        progress_callback,
-                        total,
-                        current_progress
-                    )
-                    total_files += sub_count
-          
-            return total_files
-          
-        except Exception as e:
-            print(f"❌ Erreur import sous-dossier: {e}")
-            return total_files
+            return 0
   
     def open_file(self, filepath: str) -> bool:
         """
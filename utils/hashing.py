@@ -0,0 +1,96 @@
+import hashlib
+import mmap
+import os
+import threading
+from typing import BinaryIO
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Algorithme des hash enregistrés en base (files.file_hash, blobs)
+DEFAULT_ALGORITHM = 'sha256'
+
+# Taille du tampon de lecture (réutilisé par thread)
+CHUNK_SIZE = 1024 * 1024
+
+# Au-delà, le fichier est projeté en mémoire et hashé en un seul appel, sans copie
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+_local = threading.local()
+
+
+def new_hasher(algorithm: str = DEFAULT_ALGORITHM):
+    """
+    Créer un objet de hash
+
+    Args:
+        algorithm: 'sha256', 'blake2b' (256 bits), tout algorithme hashlib,
+            ou 'xxh3_128' / 'xxh64' si le module xxhash est installé
+            (clés de déduplication rapides, non cryptographiques)
+    """
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(digest_size=32)
+    if algorithm.startswith('xxh'):
+        if not XXHASH_AVAILABLE:
+            raise ValueError(f"Algorithme {algorithm} indisponible : module xxhash non installé")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def read_buffer() -> memoryview:
+    """Tampon de lecture du thread courant (alloué une seule fois par thread)"""
+    view = getattr(_local, 'view', None)
+    if view is None:
+        view = _local.view = memoryview(bytearray(CHUNK_SIZE))
+    return view
+
+
+def update_from_file(hasher, f: BinaryIO) -> int:
+    """
+    Ajouter le contenu restant d'un fichier à un hash (readinto, sans allocation par bloc)
+
+    Returns:
+        Nombre d'octets lus
+    """
+    view = read_buffer()
+    total = 0
+    while True:
+        read = f.readinto(view)
+        if not read:
+            break
+        hasher.update(view[:read])
+        total += read
+    return total
+
+
+def hash_file(filepath: str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """
+    Calculer le hash d'un fichier
+
+    Les gros fichiers sont projetés en mémoire (mmap) : le hash lit directement
+    les pages du fichier, en un seul appel qui libère le GIL. Les autres passent
+    par hashlib.file_digest (Python 3.11+) ou par readinto dans un tampon réutilisé.
+
+    Returns:
+        Hash hexadécimal
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher = new_hasher(algorithm)
+                    hasher.update(mapped)
+                    return hasher.hexdigest()
+            except (OSError, ValueError):
+                # Système de fichiers sans projection mémoire : lecture classique
+                f.seek(0)
+
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, lambda: new_hasher(algorithm)).hexdigest()
+
+        hasher = new_hasher(algorithm)
+        update_from_file(hasher, f)
+        return hasher.hexdigest()
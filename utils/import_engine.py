@@ -0,0 +1,351 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ImportEngine:
+    """Moteur d'import parallèle : copie + SHA-256 en une seule lecture, écriture BDD par un seul écrivain"""
+
+    # Moteurs dont le thread d'arrière-plan tourne (arrêtés avant la fermeture de la base)
+    _running = set()
+    _running_lock = threading.Lock()
+
+    def __init__(self, file_handler, db, max_workers: Optional[int] = None, batch_size: int = 500):
+        self.file_handler = file_handler
+        self.db = db
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.batch_size = batch_size
+
+        # Événements (type, valeur, total) consommés par l'UI via after()
+        self.progress_queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def scan(self, folder_path: str) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """
+        Parcourir l'arborescence à importer
+
+        Args:
+            folder_path: Chemin du dossier à importer
+
+        Returns:
+            Tuple (chemins relatifs des dossiers, fichiers (dossier relatif, nom, chemin source))
+        """
+        base_dir = os.path.dirname(folder_path)
+        folder_paths = []
+        pending_files = []
+
+        for root, dirs, files in os.walk(folder_path):
+            rel_folder = os.path.relpath(root, base_dir)
+            folder_paths.append(rel_folder)
+
+            for item in files:
+                if self.file_handler.is_allowed_file(item):
+                    pending_files.append((rel_folder, item, os.path.join(root, item)))
+                else:
+                    print(f" ⚠️ Fichier ignoré (extension non autorisée): {item}")
+
+        return folder_paths, pending_files
+
+    def run(self, folder_path: str, parent_folder_id: Optional[int] = None,
+            panel: str = 'interface_emp', progress_callback: Callable = None) -> int:
+        """
+        Importer un dossier complet (bloquant)
+
+        Args:
+            folder_path: Chemin du dossier à importer
+            parent_folder_id: ID du dossier parent dans la BDD
+            panel: Panel cible pour l'import
+            progress_callback: Fonction appelée avec (current, total) depuis ce thread
+
+        Returns:
+            Nombre de fichiers importés
+        """
+        self._cancel_event.clear()
+        folder_name = os.path.basename(folder_path)
+        print(f"\n📁 Importation parallèle du dossier: {folder_name} dans panel {panel}")
+
+        folder_paths, pending_files = self.scan(folder_path)
+        total = len(pending_files)
+
+        folder_ids = self.db.create_folders_bulk(folder_paths, parent_folder_id, panel)
+        print(f" ✅ {len(folder_ids)} dossier(s) créé(s) en BDD (Panel: {panel})")
+
+        # Index des blobs chargé une fois : les workers ne touchent pas à la BDD
+        known_blobs, known_sizes = self.db.get_blob_index()
+
+        imported = 0
+        done = 0
+        deduplicated = 0
+        rows = []
+        handled = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import") as executor:
+            futures = {
+                executor.submit(self._store_source, source_path, item,
+                                known_blobs, known_sizes): (folder_ids[rel_folder], item)
+                for rel_folder, item, source_path in pending_files
+            }
+
+            for future in as_completed(futures):
+                folder_id, item = futures[future]
+                handled.add(future)
+                done += 1
+
+                try:
+                    blob_path, file_size, file_hash, copied, source_mtime = future.result()
+                    rows.append((folder_id, item, blob_path, file_size, file_hash, source_mtime))
+                    if not copied:
+                        deduplicated += 1
+                except Exception as e:
+                    print(f" ❌ Échec de la copie de {item}: {e}")
+
+                self._report('progress', done, total, progress_callback)
+
+                # Un seul écrivain : ce thread enregistre les lots terminés
+                if len(rows) >= self.batch_size:
+                    imported += self.db.add_files_bulk(rows, batch_size=self.batch_size)
+                    rows = []
+
+                if self._cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    print("⚠️ Import annulé")
+                    break
+
+        for (folder_id, item), result in self._finished_after_cancel(futures, handled):
+            blob_path, file_size, file_hash, _, source_mtime = result
+            rows.append((folder_id, item, blob_path, file_size, file_hash, source_mtime))
+
+        if rows:
+            imported += self.db.add_files_bulk(rows, batch_size=self.batch_size)
+
+        if deduplicated:
+            print(f" ♻️ {deduplicated} fichier(s) déjà présent(s), aucune copie")
+        print(f"✅ Dossier '{folder_name}' importé: {imported} fichier(s)")
+        return imported
+
+    def sync(self, folder_path: str, folder_id: int, remove_missing: bool = False,
+             progress_callback: Callable = None) -> Dict[str, int]:
+        """
+        Resynchroniser un dossier source avec un dossier existant de la BDD (bloquant)
+
+        Les fichiers sont comparés sur (chemin relatif, taille, date de modification) :
+        seuls les fichiers nouveaux ou modifiés sont hashés, et copiés si leur contenu
+        n'existe pas déjà dans le stockage.
+
+        Args:
+            folder_path: Chemin du dossier source
+            folder_id: ID du dossier de la BDD correspondant à la racine de la source
+            remove_missing: Supprimer les fichiers absents de la source
+            progress_callback: Fonction appelée avec (current, total) depuis ce thread
+
+        Returns:
+            Compteurs {'added', 'updated', 'unchanged', 'removed'}
+        """
+        self._cancel_event.clear()
+        print(f"\n🔄 Synchronisation du dossier: {folder_path} -> dossier {folder_id}")
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+
+        folder_paths, source_files = self.scan(folder_path)
+        root_name = os.path.basename(folder_path)
+        rel_paths = {path: os.path.relpath(path, root_name) for path in folder_paths}
+
+        # Dossiers de la BDD indexés par chemin relatif ('.' = racine), création des manquants
+        folder_ids = self.db.get_subtree_paths(folder_id)
+        missing_folders = [rel for rel in rel_paths.values() if rel not in folder_ids]
+        if missing_folders:
+            folder_ids = self.db.create_folders_bulk(missing_folders, folder_id, existing=folder_ids)
+            print(f" ✅ {len(missing_folders)} dossier(s) créé(s) en BDD")
+
+        known_files = {(row['folder_id'], row['filename']): row
+                       for row in self.db.get_files_in_subtree(folder_id)}
+
+        # Comparaison sur les métadonnées uniquement (aucune lecture de contenu)
+        pending = []
+        seen_ids = set()
+        for rel_folder, item, source_path in source_files:
+            target_id = folder_ids[rel_paths[rel_folder]]
+            existing = known_files.get((target_id, item))
+            if existing is not None:
+                seen_ids.add(existing['id'])
+                try:
+                    stat = os.stat(source_path)
+                except OSError as e:
+                    print(f" ❌ Fichier illisible {item}: {e}")
+                    continue
+                if existing['file_size'] == stat.st_size and existing['source_mtime'] == stat.st_mtime:
+                    stats['unchanged'] += 1
+                    continue
+            pending.append((target_id, item, source_path, existing))
+
+        total = len(pending)
+        print(f" 📊 {stats['unchanged']} inchangé(s), {total} à traiter")
+
+        known_blobs, known_sizes = self.db.get_blob_index()
+        new_rows = []
+        updated_rows = []
+        done = 0
+        handled = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sync") as executor:
+            futures = {
+                executor.submit(self._store_source, source_path, item,
+                                known_blobs, known_sizes): (target_id, item, existing)
+                for target_id, item, source_path, existing in pending
+            }
+
+            for future in as_completed(futures):
+                target_id, item, existing = futures[future]
+                handled.add(future)
+                done += 1
+
+                try:
+                    blob_path, file_size, file_hash, copied, source_mtime = future.result()
+                    if existing is None:
+                        new_rows.append((target_id, item, blob_path, file_size, file_hash, source_mtime))
+                    else:
+                        updated_rows.append((existing['id'], blob_path, file_size, file_hash, source_mtime))
+                        if file_hash == existing['file_hash'] and blob_path == existing['filepath']:
+                            stats['unchanged'] += 1
+                        else:
+                            stats['updated'] += 1
+                except Exception as e:
+                    print(f" ❌ Échec de la copie de {item}: {e}")
+
+                self._report('progress', done, total, progress_callback)
+
+                if len(new_rows) >= self.batch_size:
+                    stats['added'] += self.db.add_files_bulk(new_rows, batch_size=self.batch_size)
+                    new_rows = []
+                if len(updated_rows) >= self.batch_size:
+                    self.db.update_files_bulk(updated_rows)
+                    updated_rows = []
+
+                if self._cancel_event.is_set():
+                    for future_pending in futures:
+                        future_pending.cancel()
+                    print("⚠️ Synchronisation annulée")
+                    break
+
+        for (target_id, item, existing), result in self._finished_after_cancel(futures, handled):
+            blob_path, file_size, file_hash, _, source_mtime = result
+            if existing is None:
+                new_rows.append((target_id, item, blob_path, file_size, file_hash, source_mtime))
+                continue
+            updated_rows.append((existing['id'], blob_path, file_size, file_hash, source_mtime))
+            if file_hash == existing['file_hash'] and blob_path == existing['filepath']:
+                stats['unchanged'] += 1
+            else:
+                stats['updated'] += 1
+
+        if new_rows:
+            stats['added'] += self.db.add_files_bulk(new_rows, batch_size=self.batch_size)
+        if updated_rows:
+            self.db.update_files_bulk(updated_rows)
+
+        if remove_missing and not self._cancel_event.is_set():
+            missing_ids = [row['id'] for row in known_files.values() if row['id'] not in seen_ids]
+            if missing_ids:
+                stats['removed'] = self.db.delete_files_bulk(missing_ids)
+
+        print(f"✅ Synchronisation terminée: {stats['added']} ajouté(s), {stats['updated']} modifié(s), "
+              f"{stats['unchanged']} inchangé(s), {stats['removed']} supprimé(s)")
+        return stats
+
+    def start(self, folder_path: str, parent_folder_id: Optional[int] = None,
+              panel: str = 'interface_emp'):
+        """Lancer l'import dans un thread d'arrière-plan (progression via progress_queue)"""
+        self._start_background(lambda: self.run(folder_path, parent_folder_id, panel))
+
+    def start_sync(self, folder_path: str, folder_id: int, remove_missing: bool = False):
+        """Lancer la synchronisation dans un thread d'arrière-plan (résultat : dictionnaire de compteurs)"""
+        self._start_background(lambda: self.sync(folder_path, folder_id, remove_missing))
+
+    def _start_background(self, job: Callable):
+        """Exécuter une tâche dans un thread et publier ('done', résultat) ou ('error', message)"""
+        def target():
+            try:
+                result = job()
+                self.progress_queue.put(('done', result, None))
+            except Exception as e:
+                print(f"❌ Erreur lors de l'importation du dossier: {e}")
+                self.progress_queue.put(('error', str(e), None))
+            finally:
+                self.db.release_connection()
+                with ImportEngine._running_lock:
+                    ImportEngine._running.discard(self)
+
+        with ImportEngine._running_lock:
+            ImportEngine._running.add(self)
+        self._thread = threading.Thread(target=target, name="import-engine", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Demander l'arrêt de l'import (les copies en cours se terminent)"""
+        self._cancel_event.set()
+
+    def is_running(self) -> bool:
+        """Vérifier si un import d'arrière-plan est en cours"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attendre la fin du thread d'arrière-plan (après cancel)
+
+        Returns:
+            True si le thread est terminé (ou n'a jamais démarré)
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    @classmethod
+    def cancel_all(cls, timeout: Optional[float] = None) -> bool:
+        """
+        Annuler les imports en cours et attendre leur fin (fermeture de l'application)
+
+        Returns:
+            True si tous les threads d'import sont terminés
+        """
+        with cls._running_lock:
+            engines = list(cls._running)
+        for engine in engines:
+            engine.cancel()
+        return all([engine.join(timeout) for engine in engines])
+
+    @staticmethod
+    def _finished_after_cancel(futures: dict, handled: set) -> List[tuple]:
+        """
+        Copies terminées après l'annulation (en cours au moment du cancel)
+
+        Leur blob est déjà écrit : elles sont enregistrées comme les autres,
+        sinon il resterait sur disque sans ligne files ni référence.
+
+        Returns:
+            Liste de (informations de la tâche, résultat de _store_source)
+        """
+        finished = []
+        for future, info in futures.items():
+            if future in handled or future.cancelled() or future.exception() is not None:
+                continue
+            finished.append((info, future.result()))
+        return finished
+
+    def _report(self, kind: str, current: int, total: int, progress_callback: Callable = None):
+        """Publier un événement de progression"""
+        self.progress_queue.put((kind, current, total))
+        if progress_callback:
+            progress_callback(current, total)
+
+    def _store_source(self, source_path: str, filename: str, known_blobs: dict,
+                      known_sizes: set) -> Tuple[str, int, str, bool, float]:
+        """Stocker un fichier source (thread worker) et relever sa date de modification"""
+        source_mtime = os.stat(source_path).st_mtime
+        blob_path, file_size, file_hash, copied = self.file_handler.blob_store.store(
+            source_path, filename, lambda file_hash, ext: known_blobs.get((file_hash, ext)),
+            known_sizes.__contains__
+        )
+        return blob_path, file_size, file_hash, copied, source_mtime
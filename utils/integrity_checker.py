@@ -0,0 +1,161 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .hashing import hash_file
+
+
+def inspect_file(row: Dict[str, Any]) -> Tuple[int, Optional[int], Optional[str]]:
+    """
+    Calculer la taille et le hash manquants d'un fichier (exécuté dans un thread worker)
+
+    Returns:
+        Tuple (file_id, taille, hash), None pour une valeur non calculable
+    """
+    try:
+        file_size = os.path.getsize(row['filepath'])
+    except OSError:
+        return row['id'], None, None
+
+    file_hash = row['file_hash'] or None
+    if not file_hash:
+        try:
+            file_hash = hash_file(row['filepath'])
+        except OSError as e:
+            print(f"⚠️ Erreur calcul hash: {e}")
+    return row['id'], file_size, file_hash
+
+
+class IntegrityChecker:
+    """Calcul en arrière-plan des tailles et hash manquants (bases antérieures au stockage dédupliqué)"""
+
+    # Intervalle entre deux recherches de fichiers à vérifier (secondes)
+    IDLE_INTERVAL = 300
+
+    def __init__(self, db, max_workers: Optional[int] = None, batch_size: int = 200,
+                 throttle: float = 0.2):
+        """
+        Args:
+            db: Instance de la base de données
+            max_workers: Threads de lecture (le hash libère le GIL)
+            batch_size: Fichiers enregistrés par transaction
+            throttle: Pause entre deux lots (secondes) pour ne pas saturer le disque
+        """
+        self.db = db
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.throttle = throttle
+
+        # Événements (type, valeur, total) consommés par l'UI via after()
+        self.progress_queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._thread = None
+
+    def run_once(self, progress_callback: Callable = None) -> int:
+        """
+        Vérifier tous les fichiers en attente (bloquant)
+
+        La progression est enregistrée en base avec chaque lot : une
+        vérification interrompue reprend après le dernier lot validé.
+
+        Returns:
+            Nombre de fichiers traités
+        """
+        last_id = self.db.get_integrity_cursor()
+        total = self.db.count_files_needing_integrity(last_id)
+        if not total:
+            return 0
+
+        print(f"🔄 Vérification d'intégrité: {total} fichier(s) sans hash ou sans taille")
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="integrity") as executor:
+            while not self._stop_event.is_set():
+                self._resume_event.wait()
+                if self._stop_event.is_set():
+                    break
+
+                rows = self.db.get_files_needing_integrity(last_id, self.batch_size)
+                if not rows:
+                    break
+
+                results = list(executor.map(inspect_file, rows))
+                last_id = rows[-1]['id']
+                self.db.save_integrity_results(results, last_id)
+                processed += len(rows)
+                self._report(processed, total, progress_callback)
+
+                self._stop_event.wait(self.throttle)
+
+        if processed:
+            print(f"✅ Intégrité vérifiée: {processed}/{total} fichier(s)")
+        return processed
+
+    def start(self):
+        """Lancer la vérification continue dans un thread d'arrière-plan"""
+        if self.is_running():
+            return
+
+        def target():
+            try:
+                while not self._stop_event.is_set():
+                    self.run_once()
+                    self._wake_event.wait(self.IDLE_INTERVAL)
+                    self._wake_event.clear()
+            except Exception as e:
+                print(f"❌ Erreur lors de la vérification d'intégrité: {e}")
+                self.progress_queue.put(('error', str(e), None))
+            finally:
+                self.db.release_connection()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=target, name="integrity-checker", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Relancer immédiatement une passe de vérification"""
+        self._wake_event.set()
+
+    def pause(self):
+        """Suspendre la vérification après le lot en cours"""
+        self._resume_event.clear()
+
+    def resume(self):
+        """Reprendre une vérification suspendue"""
+        self._resume_event.set()
+
+    def is_paused(self) -> bool:
+        """Vérifier si la vérification est suspendue"""
+        return not self._resume_event.is_set()
+
+    def stop(self):
+        """Arrêter la vérification (le lot en cours est enregistré)"""
+        self._stop_event.set()
+        self._wake_event.set()
+        self._resume_event.set()
+
+    def is_running(self) -> bool:
+        """Vérifier si la vérification d'arrière-plan est active"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attendre la fin du thread d'arrière-plan (après stop)
+
+        Returns:
+            True si le thread est terminé (ou n'a jamais démarré)
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def _report(self, processed: int, total: int, progress_callback: Callable = None):
+        """Publier un événement de progression"""
+        self.progress_queue.put(('progress', processed, total))
+        if progress_callback:
+            progress_callback(processed, total)
@@ -0,0 +1,245 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# (file_hash, numéro de page, zoom en pourcentage ou largeur des vignettes en pixels)
+PageKey = Tuple[str, int, int]
+
+
+# Pas des zooms mis en cache (pourcentage) : tout zoom est rendu au palier le plus proche
+ZOOM_STEP = 25
+
+
+def zoom_bucket(zoom: float) -> int:
+    """Palier de zoom en pourcentage (clé de cache stable malgré les flottants)"""
+    return max(1, int(round(zoom * 100 / ZOOM_STEP))) * ZOOM_STEP
+
+
+def quantize_zoom(zoom: float) -> float:
+    """Facteur de zoom ramené à son palier"""
+    return zoom_bucket(zoom) / 100
+
+
+def image_bytes(image) -> int:
+    """Taille des pixels d'une image PIL en mémoire"""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageLRU:
+    """Images PIL en mémoire, les moins récemment utilisées évincées au-delà d'une taille de pixels"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()   # clé -> image, de la moins à la plus récemment utilisée
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Image associée à une clé (None si absente ou évincée)"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        """Ajouter une image et évincer les plus anciennes"""
+        size = image_bytes(image)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= image_bytes(previous)
+            self._images[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= image_bytes(evicted)
+
+    def items(self):
+        """Copie des entrées (clé, image), sans modifier l'ordre d'éviction"""
+        with self._lock:
+            return list(self._images.items())
+
+    def clear(self):
+        """Vider le cache"""
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+
+class PageCache:
+    """
+    Cache des pages PDF rendues, à deux niveaux
+
+    En mémoire : LRU borné par la taille des pixels, partagé par les viewers.
+    Sur disque : pages enregistrées par (file_hash, page, zoom), les moins
+    récemment lues sont supprimées au-delà de la taille maximale.
+    """
+
+    _default = None
+    _thumbnails = None
+
+    def __init__(self, cache_dir: str = os.path.join("cache", "pages"),
+                 max_memory_bytes: int = 256 * 1024 * 1024,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Répertoire du cache disque
+            max_memory_bytes: Taille maximale des pixels gardés en mémoire
+            max_disk_bytes: Taille maximale du cache disque
+        """
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = ImageLRU(max_memory_bytes)
+        self._disk_bytes = None        # calculé au premier enregistrement
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-cache")
+
+    @classmethod
+    def default(cls) -> 'PageCache':
+        """Cache partagé par tous les viewers de l'application"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def thumbnails(cls) -> 'PageCache':
+        """Cache partagé des vignettes de pages (clé : largeur des vignettes au lieu du zoom)"""
+        if cls._thumbnails is None:
+            cls._thumbnails = cls(
+                cache_dir=os.path.join("cache", "thumbnails"),
+                max_memory_bytes=32 * 1024 * 1024,
+                max_disk_bytes=256 * 1024 * 1024
+            )
+        return cls._thumbnails
+
+    # ==================== LECTURE / ÉCRITURE ====================
+
+    def get(self, key: PageKey):
+        """Image d'une page (mémoire puis disque), None si elle n'a jamais été rendue"""
+        image = self._memory.get(key)
+        if image is not None:
+            return image
+
+        image = self._load(key)
+        if image is not None:
+            self._memory.put(key, image)
+        return image
+
+    def peek(self, key: PageKey):
+        """Image d'une page en mémoire seulement (thread Tk : aucune lecture disque), None sinon"""
+        return self._memory.get(key)
+
+    def put(self, key: PageKey, image):
+        """Enregistrer une page rendue (mémoire immédiatement, disque en arrière-plan)"""
+        self._memory.put(key, image)
+        if key[0]:
+            self._writer.submit(self._store, key, image)
+
+    def nearest(self, key: PageKey):
+        """
+        Même page déjà rendue à un autre zoom (mémoire seulement), pour un aperçu immédiat
+
+        Le zoom supérieur le plus proche est préféré : une image réduite reste nette.
+
+        Returns:
+            Image PIL ou None
+        """
+        file_hash, page_num, bucket = key
+        candidates = [(other[2], image) for other, image in self._memory.items()
+                      if other[:2] == (file_hash, page_num) and other[2] != bucket]
+        if not candidates:
+            return None
+        above = [candidate for candidate in candidates if candidate[0] > bucket]
+        if above:
+            return min(above, key=lambda candidate: candidate[0])[1]
+        return max(candidates, key=lambda candidate: candidate[0])[1]
+
+    def clear_memory(self):
+        """Vider le cache mémoire (le cache disque est conservé)"""
+        self._memory.clear()
+
+    # ==================== DISQUE ====================
+
+    def path_for(self, key: PageKey) -> str:
+        """Fichier du cache disque d'une page"""
+        file_hash, page_num, zoom = key
+        return os.path.join(self.cache_dir, file_hash[:2], f"{file_hash}_{page_num}_{zoom}.png")
+
+    def _load(self, key: PageKey):
+        """Lire une page du cache disque"""
+        if not key[0]:
+            return None
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            from PIL import Image
+            with Image.open(path) as image:
+                image.load()
+                loaded = image.copy()
+            # Date de modification = dernière lecture (éviction LRU)
+            os.utime(path)
+            return loaded
+        except Exception as e:
+            print(f"⚠️ Page en cache illisible {path}: {e}")
+            self._remove(path)
+            return None
+
+    def _store(self, key: PageKey, image):
+        """Écrire une page dans le cache disque (thread d'écriture)"""
+        path = self.path_for(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            # Compression minimale : la relecture doit rester plus rapide qu'un nouveau rendu
+            image.save(temp_path, format="PNG", compress_level=1)
+            os.replace(temp_path, path)
+            self._add_disk_bytes(os.path.getsize(path))
+        except Exception as e:
+            print(f"⚠️ Impossible d'enregistrer la page en cache: {e}")
+
+    def _add_disk_bytes(self, size: int):
+        """Comptabiliser une écriture et évincer les pages les moins récemment lues"""
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._scan())
+        else:
+            self._disk_bytes += size
+
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # Redescendre sous 90 % de la limite pour ne pas évincer à chaque écriture
+        target = self.max_disk_bytes * 0.9
+        for path, size, _ in sorted(self._scan(), key=lambda entry: entry[2]):
+            if self._disk_bytes <= target:
+                break
+            if self._remove(path):
+                self._disk_bytes -= size
+
+    def _scan(self):
+        """Fichiers du cache disque (chemin, taille, date de dernière lecture)"""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _remove(self, path: str) -> bool:
+        """Supprimer un fichier du cache disque"""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,41 @@
+# Modes PIL selon le nombre de composantes de couleur (sans, avec transparence)
+PIL_MODES = {
+    1: ("L", "LA"),
+    3: ("RGB", "RGBA"),
+}
+
+
+def pixmap_to_image(pix):
+    """
+    Construire une image PIL directement sur les pixels d'un pixmap PyMuPDF
+
+    Aucun encodage intermédiaire (PPM, PNG) : les octets de pix.samples sont
+    lus tels quels avec le pas de ligne du pixmap. Les espaces de couleur
+    autres que gris et RGB (CMYK...) sont d'abord convertis en RGB.
+    """
+    import fitz  # PyMuPDF
+    from PIL import Image
+
+    color_count = pix.colorspace.n if pix.colorspace else 1
+    if color_count not in PIL_MODES:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+        color_count = 3
+
+    mode = PIL_MODES[color_count][1 if pix.alpha else 0]
+    return Image.frombuffer(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride, 1)
+
+
+def render_page(page, zoom: float = 1.0, clip=None, alpha: bool = False):
+    """
+    Rendre une page PDF (ou une zone de la page) en image PIL
+
+    Args:
+        page: Page PyMuPDF
+        zoom: Facteur de zoom (1.0 = 72 dpi)
+        clip: Zone de la page à rendre (fitz.Rect en points), toute la page par défaut
+        alpha: Conserver la transparence du fond
+    """
+    import fitz  # PyMuPDF
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, alpha=alpha)
+    return pixmap_to_image(pix)